@@ -0,0 +1,125 @@
+"""
+BI Scraper Benchmark
+Offline parse throughput and allocation benchmark for BIPriceScraper
+
+Halaman diambil dari fixture hasil `replay.py record`, atau di-generate
+oleh fake_bi_server jika tidak ada fixture, lalu disajikan lewat
+ReplayAdapter. Tidak ada akses jaringan sama sekali.
+
+Usage:
+    python bench_scraper.py                       # halaman sintetis
+    python bench_scraper.py --fixtures fixtures   # halaman BI hasil rekaman
+    python bench_scraper.py --iterations 200 --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+import tracemalloc
+from typing import Dict, List
+
+from fake_bi_server import render_commodity_page
+from replay import ReplayAdapter, use_adapter
+from scraper import BIPriceScraper
+from tracing import InMemoryExporter, Tracer
+
+
+def load_pages(fixtures_dir: str = None) -> Dict[str, bytes]:
+    """Fixture *.html dari direktori, atau satu halaman sintetis"""
+    if fixtures_dir:
+        pages = {}
+        for name in sorted(os.listdir(fixtures_dir)):
+            if name.endswith(".html"):
+                with open(os.path.join(fixtures_dir, name), 'rb') as f:
+                    pages[name[:-len(".html")]] = f.read()
+        if not pages:
+            raise SystemExit(f"No *.html fixtures in {fixtures_dir}")
+        return pages
+    return {"synthetic": render_commodity_page(2025).encode("utf-8")}
+
+
+def _scrape_page(scraper: BIPriceScraper, commodity: str) -> int:
+    # Reset state conditional agar setiap iterasi benar-benar parse
+    scraper._conditional_state.clear()
+    result = scraper.scrape_rice_prices(commodity)
+    return len(result["data"])
+
+
+def bench_page(key: str, body: bytes, commodity: str, iterations: int, warmup: int) -> Dict:
+    if iterations < 1:
+        raise ValueError(f"iterations must be >= 1 (got {iterations})")
+    exporter = InMemoryExporter()
+    scraper = BIPriceScraper(base_url="http://bench.local/hargapangan", tracer=Tracer())
+    use_adapter(scraper, ReplayAdapter(pages={key: body}, default_key=key))
+
+    for _ in range(warmup):
+        _scrape_page(scraper, commodity)
+    fallback_before = scraper.stats["fallback"]
+
+    # Throughput (tanpa tracemalloc, supaya overhead-nya tidak ikut terukur);
+    # span fase hanya dikumpulkan dari iterasi ini, bukan warm-up
+    rows = 0
+    scraper.tracer.add_exporter(exporter)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        rows += _scrape_page(scraper, commodity)
+    elapsed = time.perf_counter() - start
+    scraper.tracer.exporters.remove(exporter)
+
+    # Alokasi per halaman
+    peaks: List[int] = []
+    tracemalloc.start()
+    for _ in range(min(iterations, 10)):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _scrape_page(scraper, commodity)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    phases = exporter.snapshot(recent=0)["phases"]
+    return {
+        "page": key,
+        "page_bytes": len(body),
+        "iterations": iterations,
+        "pages_per_sec": round(iterations / elapsed, 2),
+        "rows_per_sec": round(rows / elapsed, 1),
+        "rows_per_page": rows // iterations,
+        "fallback_pages": scraper.stats["fallback"] - fallback_before,
+        "peak_alloc_kib_per_page": round(sum(peaks) / len(peaks) / 1024, 1) if peaks else 0,
+        "avg_phase_ms": {name: agg["avg_ms"] for name, agg in phases.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline BIPriceScraper benchmark")
+    parser.add_argument("--fixtures", default=None, help="Directory of recorded *.html fixtures")
+    parser.add_argument("--commodity", default="Beras Premium")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+    if args.iterations < 1:
+        parser.error("--iterations must be >= 1")
+
+    logging.disable(logging.WARNING)
+    results = [
+        bench_page(key, body, args.commodity, args.iterations, args.warmup)
+        for key, body in load_pages(args.fixtures).items()
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for r in results:
+        print(f"{r['page']} ({r['page_bytes'] / 1024:.1f} KiB)")
+        print(f"  {r['pages_per_sec']:.1f} pages/s, {r['rows_per_sec']:.0f} rows/s "
+              f"({r['rows_per_page']} rows/page, {r['fallback_pages']} fallback)")
+        print(f"  peak alloc: {r['peak_alloc_kib_per_page']:.1f} KiB/page")
+        print("  phases: " + ", ".join(f"{k}={v:.2f}ms" for k, v in r["avg_phase_ms"].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Bounded LRU Cache
+In-memory TTL cache with entry-count and byte limits for scraped price data
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Cache LRU dengan batas jumlah entry dan total byte
+
+    Ukuran entry dihitung dari panjang serialisasi JSON-nya, cukup akurat
+    untuk data harga (dict/list/angka/string). Entry kedaluwarsa dibuang
+    saat diakses dan oleh purge_expired() yang dijalankan berkala.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 16 * 1024 * 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "rejected": 0,  # entry lebih besar dari max_bytes
+        }
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, age_seconds) atau None jika tidak ada/kedaluwarsa"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            value, stored_at, _ = entry
+            age = time.time() - stored_at
+            if age >= self.ttl:
+                self._remove(key)
+                self.counters["expirations"] += 1
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return value, age
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Ambil value tanpa memengaruhi urutan LRU, TTL, atau counter"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value: Any) -> bool:
+        """Simpan value; evict entry paling lama dipakai sampai batas terpenuhi"""
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                self.counters["rejected"] += 1
+                return False
+            self._entries[key] = (value, time.time(), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.counters["evictions"] += 1
+            return True
+
+    def touch(self, key: str) -> bool:
+        """Reset umur entry tanpa menulis ulang value-nya"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            value, _, size = entry
+            self._entries[key] = (value, time.time(), size)
+            self._entries.move_to_end(key)
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def purge_expired(self) -> int:
+        """Buang semua entry kedaluwarsa, return jumlah yang dibuang"""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, stored_at, _) in self._entries.items() if now - stored_at >= self.ttl]
+            for key in expired:
+                self._remove(key)
+            self.counters["expirations"] += len(expired)
+            return len(expired)
+
+    def items_info(self) -> Dict[str, Dict]:
+        """Info umur dan ukuran per entry (untuk endpoint status)"""
+        now = time.time()
+        with self._lock:
+            return {
+                key: {"value": value, "age": now - stored_at, "bytes": size}
+                for key, (value, stored_at, size) in self._entries.items()
+            }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                **self.counters,
+            }
@@ -0,0 +1,304 @@
+"""
+BI Backfill Crawler
+Resumable, rate-limited crawl of historical BI prices
+
+Rentang (komoditas, provinsi, periode) dipecah menjadi unit kerja, dijalankan
+paralel di belakang token bucket, progress di-checkpoint ke disk, dan hasil
+ditulis massal ke PriceStore.
+
+Usage:
+    python crawler.py --commodities "Beras Premium,Beras Medium" \
+        --start 2020-01 --end 2025-12 --base-url http://localhost:8765/hargapangan
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from scraper import BIPriceScraper
+from price_store import PriceStore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Rate limiter token bucket yang aman dipakai banyak thread"""
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        if not rate > 0:
+            raise ValueError(f"rate must be > 0 (got {rate})")
+        self.rate = rate  # token per detik
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blok sampai satu token tersedia"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass(frozen=True)
+class CrawlUnit:
+    """Satu unit kerja: satu komoditas, satu provinsi, satu rentang periode"""
+    commodity: str
+    province: str
+    start_period: str
+    end_period: str
+
+    @property
+    def unit_id(self) -> str:
+        return f"{self.commodity}|{self.province}|{self.start_period}|{self.end_period}"
+
+
+@dataclass
+class CrawlSpec:
+    """Definisi job backfill"""
+    commodities: List[str]
+    start_period: str
+    end_period: str
+    provinces: List[str] = field(default_factory=lambda: list(BIPriceScraper.PROVINCE_MAPPING))
+    chunk_months: int = 12
+
+    @property
+    def job_id(self) -> str:
+        """ID stabil dari isi spec, sehingga spec yang sama melanjutkan checkpoint yang sama"""
+        payload = json.dumps(asdict(self), sort_keys=True).encode("utf-8")
+        return hashlib.sha1(payload).hexdigest()[:12]
+
+
+def parse_period(period: str):
+    """"YYYY-MM" -> (tahun, bulan); ValueError jika formatnya salah"""
+    match = re.fullmatch(r"(\d{4})-(\d{2})", period or "")
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        raise ValueError(f"Invalid period {period!r} (expected YYYY-MM)")
+    return int(match.group(1)), int(match.group(2))
+
+
+def _format_period(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def expand_units(spec: CrawlSpec) -> List[CrawlUnit]:
+    """Pecah spec menjadi unit kerja per komoditas × provinsi × potongan periode"""
+    if spec.chunk_months < 1:
+        raise ValueError(f"chunk_months must be >= 1 (got {spec.chunk_months})")
+    start_year, start_month = parse_period(spec.start_period)
+    end_year, end_month = parse_period(spec.end_period)
+    start_index = start_year * 12 + start_month - 1
+    end_index = end_year * 12 + end_month - 1
+    if end_index < start_index:
+        raise ValueError(f"end_period {spec.end_period} is before start_period {spec.start_period}")
+
+    ranges = []
+    for chunk_start in range(start_index, end_index + 1, spec.chunk_months):
+        chunk_end = min(chunk_start + spec.chunk_months - 1, end_index)
+        ranges.append((
+            _format_period(chunk_start // 12, chunk_start % 12 + 1),
+            _format_period(chunk_end // 12, chunk_end % 12 + 1),
+        ))
+
+    return [
+        CrawlUnit(commodity, province, start, end)
+        for commodity in spec.commodities
+        for province in spec.provinces
+        for start, end in ranges
+    ]
+
+
+class CrawlCheckpoint:
+    """Progress job di disk (JSON, ditulis atomik via rename)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed = set()
+        self.failed: Dict[str, str] = {}
+        self.records_written = 0
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.completed = set(state.get("completed", []))
+            self.failed = state.get("failed", {})
+            self.records_written = state.get("records_written", 0)
+
+    def save(self, spec: CrawlSpec):
+        state = {
+            "spec": asdict(spec),
+            "completed": sorted(self.completed),
+            "failed": self.failed,
+            "records_written": self.records_written,
+            "updated_at": datetime.now().isoformat(),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class CrawlJob:
+    """
+    Jalankan backfill secara konkuren dan bisa dilanjutkan
+
+    Hasil unit ditampung lalu ditulis ke store per batch; checkpoint baru
+    ditandai selesai setelah batch tersebut tersimpan, sehingga job yang
+    terputus tidak kehilangan data dan hanya mengulang unit yang belum
+    di-flush.
+    """
+
+    def __init__(self, spec: CrawlSpec, store: PriceStore, checkpoint_dir: str = "crawl_checkpoints",
+                 base_url: Optional[str] = None, concurrency: int = 4, rate: float = 2.0,
+                 batch_size: int = 50, max_retries: int = 3,
+                 fetch: Optional[Callable[[CrawlUnit], List[Dict]]] = None):
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be >= 1 (got {concurrency})")
+        self.spec = spec
+        self.store = store
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate)
+        self.base_url = base_url
+        self._fetch = fetch or self._fetch_with_scraper
+        self._local = threading.local()
+
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self.checkpoint = CrawlCheckpoint(os.path.join(checkpoint_dir, f"{spec.job_id}.json"))
+        self.units = expand_units(spec)
+        self.status = "pending"
+        self.started_at = None
+        self.finished_at = None
+        self.error: Optional[str] = None
+
+    @property
+    def job_id(self) -> str:
+        return self.spec.job_id
+
+    def _fetch_with_scraper(self, unit: CrawlUnit) -> List[Dict]:
+        # requests.Session tidak thread-safe: satu scraper per worker thread
+        scraper = getattr(self._local, "scraper", None)
+        if scraper is None:
+            scraper = BIPriceScraper(base_url=self.base_url)
+            self._local.scraper = scraper
+        return scraper.scrape_price_range(unit.commodity, unit.province, unit.start_period, unit.end_period)
+
+    def _run_unit(self, unit: CrawlUnit) -> List[Dict]:
+        for attempt in range(1, self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                return self._fetch(unit)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                backoff = 2 ** (attempt - 1)
+                logger.warning(f"⚠️ {unit.unit_id} failed ({e}), retry {attempt}/{self.max_retries} in {backoff}s")
+                time.sleep(backoff)
+        return []
+
+    def _flush(self, records: List[Dict], unit_ids: List[str]):
+        self.checkpoint.records_written += self.store.bulk_upsert(records)
+        self.checkpoint.completed.update(unit_ids)
+        for unit_id in unit_ids:
+            self.checkpoint.failed.pop(unit_id, None)
+        self.checkpoint.save(self.spec)
+
+    def progress(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total_units": len(self.units),
+            "completed_units": len(self.checkpoint.completed),
+            "failed_units": len(self.checkpoint.failed),
+            "records_written": self.checkpoint.records_written,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+    def run(self) -> Dict:
+        """Jalankan semua unit yang belum selesai di checkpoint"""
+        self.status = "running"
+        self.started_at = datetime.now().isoformat()
+        self.error = None
+        try:
+            pending = [u for u in self.units if u.unit_id not in self.checkpoint.completed]
+            logger.info(f"🔍 Crawl {self.job_id}: {len(pending)}/{len(self.units)} units pending")
+
+            buffer: List[Dict] = []
+            buffer_ids: List[str] = []
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = {executor.submit(self._run_unit, unit): unit for unit in pending}
+                for future in as_completed(futures):
+                    unit = futures[future]
+                    try:
+                        buffer.extend(future.result())
+                        buffer_ids.append(unit.unit_id)
+                    except Exception as e:
+                        logger.error(f"✗ {unit.unit_id} failed: {e}")
+                        self.checkpoint.failed[unit.unit_id] = str(e)
+
+                    if len(buffer_ids) >= self.batch_size:
+                        self._flush(buffer, buffer_ids)
+                        buffer, buffer_ids = [], []
+
+            self._flush(buffer, buffer_ids)
+            self.status = "failed" if self.checkpoint.failed else "completed"
+        except Exception as e:
+            # Job tidak boleh tertinggal "running" (mis. store/checkpoint gagal ditulis)
+            logger.error(f"✗ Crawl {self.job_id} aborted: {e}")
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.finished_at = datetime.now().isoformat()
+        logger.info(f"✓ Crawl {self.job_id} {self.status}: {self.checkpoint.records_written} records")
+        return self.progress()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable BI price backfill")
+    parser.add_argument("--commodities", required=True, help="Comma-separated BI commodity names")
+    parser.add_argument("--start", required=True, help="Start period YYYY-MM")
+    parser.add_argument("--end", required=True, help="End period YYYY-MM")
+    parser.add_argument("--provinces", help="Comma-separated BI province names (default: all)")
+    parser.add_argument("--chunk-months", type=int, default=12)
+    parser.add_argument("--base-url", default=None, help="Override BI URL (e.g. fake_bi_server.py)")
+    parser.add_argument("--store", default=os.getenv("PRICE_STORE_PATH", "prices.db"))
+    parser.add_argument("--checkpoint-dir", default=os.getenv("CRAWL_CHECKPOINT_DIR", "crawl_checkpoints"))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second")
+    args = parser.parse_args()
+
+    spec = CrawlSpec(
+        commodities=[c.strip() for c in args.commodities.split(",") if c.strip()],
+        start_period=args.start,
+        end_period=args.end,
+        chunk_months=args.chunk_months,
+    )
+    if args.provinces:
+        spec.provinces = [p.strip() for p in args.provinces.split(",") if p.strip()]
+
+    job = CrawlJob(spec, PriceStore(args.store), checkpoint_dir=args.checkpoint_dir,
+                   base_url=args.base_url, concurrency=args.concurrency, rate=args.rate)
+    print(json.dumps(job.run(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
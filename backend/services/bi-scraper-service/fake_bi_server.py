@@ -0,0 +1,151 @@
+"""
+Fake BI Harga Pangan Server
+Local stand-in for bi.go.id, for crawler and scraper testing without network
+
+- Tanpa query: halaman komoditas dengan satu tabel per komoditas (kolom jan..dec),
+  lengkap dengan ETag/Last-Modified dan balasan 304.
+- Dengan query komoditas/provinsi/tanggal_awal/tanggal_akhir: tabel periode
+  "MM/YYYY" seperti yang dipakai BIPriceScraper.scrape_price_range.
+
+Harga deterministik (hash dari komoditas, provinsi, periode), jadi hasil
+crawl bisa dibandingkan antar run.
+
+Usage:
+    python fake_bi_server.py --port 8765 [--fail-rate 0.1] [--latency 0.05]
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from email.utils import formatdate
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from scraper import BIPriceScraper
+
+COMMODITIES = [
+    "Beras Premium", "Beras Medium", "Cabai Merah", "Cabai Rawit", "Bawang Merah",
+    "Bawang Putih", "Daging Ayam", "Daging Sapi", "Telur Ayam", "Minyak Goreng",
+]
+
+
+def fake_price(commodity: str, province: str, period: str) -> int:
+    """Harga deterministik 10.000–60.000 dari hash (komoditas, provinsi, periode)"""
+    digest = hashlib.md5(f"{commodity}|{province}|{period}".encode("utf-8")).digest()
+    return 10000 + int.from_bytes(digest[:4], "big") % 50000
+
+
+def _iter_periods(start: str, end: str):
+    year, month = map(int, start.split("-"))
+    end_year, end_month = map(int, end.split("-"))
+    while (year, month) <= (end_year, end_month):
+        yield f"{year:04d}-{month:02d}"
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+
+def render_period_table(commodity: str, provinces, start: str, end: str) -> str:
+    periods = list(_iter_periods(start, end))
+    header = "".join(f"<th>{p[5:]}/{p[:4]}</th>" for p in periods)
+    rows = []
+    for i, province in enumerate(provinces, 1):
+        cells = "".join(f"<td>{fake_price(commodity, province, p):,}</td>" for p in periods)
+        rows.append(f"<tr><td>{i}</td><td>{escape(province)}</td>{cells}</tr>")
+    return (f"<table><tr><th>No</th><th>Komoditas (Rp)</th>{header}</tr>"
+            + "".join(rows) + "</table>")
+
+
+def render_commodity_page(year: int) -> str:
+    months = [f"{year:04d}-{m:02d}" for m in range(1, 13)]
+    sections = []
+    for commodity in COMMODITIES:
+        rows = []
+        for province in BIPriceScraper.PROVINCE_MAPPING:
+            cells = "".join(f"<td>{fake_price(commodity, province, p):,}</td>" for p in months)
+            rows.append(f"<tr><td>{escape(province)}</td>{cells}</tr>")
+        header = "".join(f"<th>{m}</th>" for m in ["Provinsi", "Jan", "Feb", "Mar", "Apr", "Mei", "Jun",
+                                                   "Jul", "Agu", "Sep", "Okt", "Nov", "Des"])
+        sections.append(f"<h3>{commodity}</h3><table><caption>{commodity}</caption>"
+                        f"<tr>{header}</tr>{''.join(rows)}</table>")
+    return "<html><body>" + "".join(sections) + "</body></html>"
+
+
+class FakeBIHandler(BaseHTTPRequestHandler):
+    fail_rate = 0.0
+    latency = 0.0
+    page_year = 2025
+    last_modified = formatdate(usegmt=True)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            self.send_error(503, "Simulated upstream failure")
+            return
+
+        query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        if "komoditas" in query:
+            provinces = [query["provinsi"]] if query.get("provinsi") else list(BIPriceScraper.PROVINCE_MAPPING)
+            body = render_period_table(query["komoditas"], provinces,
+                                       query.get("tanggal_awal", f"{self.page_year}-01"),
+                                       query.get("tanggal_akhir", f"{self.page_year}-12"))
+            self._send_html(body.encode("utf-8"))
+            return
+
+        body = render_commodity_page(self.page_year).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._send_html(body, {"ETag": etag, "Last-Modified": self.last_modified})
+
+    def _send_html(self, body: bytes, headers: Optional[dict] = None):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_fake_server(port: int = 0, fail_rate: float = 0.0,
+                      latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Jalankan fake server di background thread; port=0 memilih port bebas"""
+    handler = type("ConfiguredFakeBIHandler", (FakeBIHandler,),
+                   {"fail_rate": fail_rate, "latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/hargapangan/TabelHarga/PasarTradisionalKomoditas"
+    return server, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake BI Harga Pangan server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_fake_server(args.port, args.fail_rate, args.latency)
+    print(f"✓ Fake BI server running at {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Price Store
+SQLite-backed store for historical BI prices collected by the crawler
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+class PriceStore:
+    """Penyimpanan harga bulanan per (komoditas, provinsi, periode)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS prices (
+            commodity TEXT NOT NULL,
+            kode_prov TEXT NOT NULL,
+            provinsi TEXT NOT NULL,
+            period TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            PRIMARY KEY (commodity, kode_prov, period)
+        )
+    """
+
+    def __init__(self, path: str = "prices.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self.SCHEMA)
+        self._conn.commit()
+
+    def bulk_upsert(self, records: Iterable[Dict]) -> int:
+        """
+        Tulis banyak baris dalam satu transaksi.
+        Baris yang sudah ada (key sama) ditimpa, jadi unit crawl yang
+        diulang setelah resume tidak menghasilkan duplikat.
+        """
+        rows = [
+            (r["commodity"], r["kode_prov"], r["provinsi"], r["period"], int(r["price"]))
+            for r in records
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO prices (commodity, kode_prov, provinsi, period, price) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def query(self, commodity: str, start_period: Optional[str] = None,
+              end_period: Optional[str] = None) -> List[Dict]:
+        """Ambil harga satu komoditas, opsional dibatasi rentang periode"""
+        sql = "SELECT commodity, kode_prov, provinsi, period, price FROM prices WHERE commodity = ?"
+        params = [commodity]
+        if start_period:
+            sql += " AND period >= ?"
+            params.append(start_period)
+        if end_period:
+            sql += " AND period <= ?"
+            params.append(end_period)
+        sql += " ORDER BY kode_prov, period"
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,192 @@
+"""
+BI Response Record & Replay
+Snapshot real BI responses as fixtures and replay them offline
+
+Recording dan replay dilakukan di level transport requests (adapter yang
+di-mount ke session scraper), jadi BIPriceScraper berjalan persis seperti
+produksi, termasuk header conditional dan tracing, tanpa akses jaringan.
+
+Usage:
+    # Rekam halaman BI live ke fixtures/
+    python replay.py record --out fixtures
+
+    # Scrape ulang dari fixture (offline)
+    python replay.py replay --fixtures fixtures --commodity "Beras Premium"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from http import HTTPStatus
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from scraper import BIPriceScraper
+
+
+def fixture_key(method: str, url: str) -> str:
+    """Nama file fixture: slug path yang bisa dibaca + hash URL lengkap"""
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', url.split('://', 1)[-1].split('?', 1)[0]).strip('-')[-60:]
+    digest = hashlib.sha1(f"{method.upper()} {url}".encode("utf-8")).hexdigest()[:12]
+    return f"{slug}-{digest}"
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Adapter yang meneruskan request ke jaringan dan menyimpan response-nya"""
+
+    def __init__(self, fixtures_dir: str, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures_dir = fixtures_dir
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # 304 tidak punya body; saat replay dijawab dari ETag/Last-Modified fixture 200
+        if response.status_code != 304:
+            key = fixture_key(request.method, request.url)
+            with open(os.path.join(self.fixtures_dir, f"{key}.html"), 'wb') as f:
+                f.write(response.content)
+            meta = {
+                "method": request.method,
+                "url": request.url,
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": dict(response.headers),
+            }
+            with open(os.path.join(self.fixtures_dir, f"{key}.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adapter yang menjawab request dari fixture di disk
+
+    Request dicocokkan dengan method + URL lengkap. Jika `default_key`
+    diisi, request tanpa fixture yang cocok memakai fixture tersebut
+    (berguna untuk benchmark yang mengarahkan scraper ke URL apa pun).
+
+    Status dan header hasil rekaman ikut di-replay (halaman error tetap
+    error). Request conditional yang If-None-Match / If-Modified-Since-nya
+    cocok dengan ETag / Last-Modified rekaman dijawab 304 seperti server
+    aslinya. Halaman dari `pages` dianggap 200 tanpa validator.
+    """
+
+    def __init__(self, fixtures_dir: Optional[str] = None, pages: Optional[Dict[str, bytes]] = None,
+                 default_key: Optional[str] = None):
+        super().__init__()
+        self.fixtures_dir = fixtures_dir
+        self.pages: Dict[str, bytes] = dict(pages or {})
+        self.meta: Dict[str, Dict] = {}
+        self.default_key = default_key
+        self.served = 0
+
+    def _load(self, key: str) -> Optional[bytes]:
+        if key in self.pages:
+            return self.pages[key]
+        if self.fixtures_dir:
+            path = os.path.join(self.fixtures_dir, f"{key}.html")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    self.pages[key] = f.read()
+                meta_path = os.path.join(self.fixtures_dir, f"{key}.json")
+                if os.path.exists(meta_path):
+                    with open(meta_path, 'r', encoding='utf-8') as f:
+                        self.meta[key] = json.load(f)
+                return self.pages[key]
+        return None
+
+    def _recorded_headers(self, key: str, body: bytes) -> CaseInsensitiveDict:
+        headers = CaseInsensitiveDict(self.meta.get(key, {}).get("headers") or {})
+        # Body fixture sudah di-decode oleh requests, jadi encoding transfer tidak berlaku lagi
+        for name in ("Content-Encoding", "Transfer-Encoding"):
+            headers.pop(name, None)
+        headers.setdefault("Content-Type", "text/html; charset=utf-8")
+        headers["Content-Length"] = str(len(body))
+        return headers
+
+    def _not_modified(self, request, headers: CaseInsensitiveDict) -> bool:
+        etag = headers.get("ETag")
+        if etag and request.headers.get("If-None-Match"):
+            return request.headers["If-None-Match"] == etag
+        last_modified = headers.get("Last-Modified")
+        return bool(last_modified) and request.headers.get("If-Modified-Since") == last_modified
+
+    def send(self, request, **kwargs):
+        key = fixture_key(request.method, request.url)
+        body = self._load(key)
+        if body is None and self.default_key:
+            key = self.default_key
+            body = self._load(key)
+        if body is None:
+            raise requests.ConnectionError(f"No fixture recorded for {request.method} {request.url}")
+
+        status = self.meta.get(key, {}).get("status", 200)
+        headers = self._recorded_headers(key, body)
+        if status == 200 and self._not_modified(request, headers):
+            status, body = 304, b""
+            headers = CaseInsensitiveDict({k: v for k, v in headers.items()
+                                           if k.lower() in ("etag", "last-modified")})
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = self.meta.get(key, {}).get("reason") if status != 304 else None
+        if not response.reason:
+            try:
+                response.reason = HTTPStatus(status).phrase
+            except ValueError:
+                response.reason = ""
+        response.url = request.url
+        response.request = request
+        response.headers = headers
+        response._content = body
+        response.encoding = "utf-8"
+        self.served += 1
+        return response
+
+    def close(self):
+        pass
+
+
+def use_adapter(scraper: BIPriceScraper, adapter: BaseAdapter) -> BIPriceScraper:
+    """Pasang adapter ke session scraper untuk http dan https"""
+    scraper.session.mount("http://", adapter)
+    scraper.session.mount("https://", adapter)
+    return scraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay BI responses")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Scrape live BI and save responses as fixtures")
+    record.add_argument("--out", default="fixtures")
+    record.add_argument("--base-url", default=None)
+    record.add_argument("--commodity", default="Beras Premium")
+
+    replay = sub.add_parser("replay", help="Scrape from recorded fixtures (offline)")
+    replay.add_argument("--fixtures", default="fixtures")
+    replay.add_argument("--base-url", default=None)
+    replay.add_argument("--commodity", default="Beras Premium")
+
+    args = parser.parse_args()
+    scraper = BIPriceScraper(base_url=args.base_url)
+
+    if args.command == "record":
+        use_adapter(scraper, RecordingAdapter(args.out))
+    else:
+        use_adapter(scraper, ReplayAdapter(args.fixtures))
+
+    result = scraper.scrape_rice_prices(args.commodity)
+    print(f"Source: {result['source']}")
+    print(f"Provinces: {len(result['data'])}")
+    print(f"Trace: {json.dumps(result['trace'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,19 @@ https://www.bi.go.id/hargapangan/TabelHarga/PasarTradisionalKomoditas
 
 import requests
 from bs4 import BeautifulSoup
+import hashlib
 import json
 import re
 from datetime import datetime
 from typing import Dict, List, Optional
 import logging
+import os
+import sys
+
+# Modul bersama antar service (backend/shared)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+from synthetic import SyntheticGenerator, MONTHS
+from tracing import Tracer, summarize
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -59,6 +67,22 @@ class BIPriceScraper:
         "Papua": "92",
     }
     
+    # Harga dasar nasional untuk fallback data (realistic 2024-2026)
+    BASE_PRICES = {
+        "Beras Premium": 14000,
+        "Beras Medium": 12000,
+        "Cabai Merah": 45000,
+        "Cabai Rawit": 55000,
+        "Bawang Merah": 35000,
+        "Bawang Putih": 28000,
+        "Daging Ayam": 38000,
+        "Daging Sapi": 130000,
+        "Telur Ayam": 28000,
+        "Minyak Goreng": 16000,
+    }
+    
+    _synthetic = SyntheticGenerator()
+    
     MONTH_MAPPING = {
         "Januari": "jan", "Februari": "feb", "Maret": "mar",
         "April": "apr", "Mei": "may", "Juni": "jun",
@@ -66,13 +90,28 @@ class BIPriceScraper:
         "Oktober": "oct", "November": "nov", "Desember": "dec"
     }
     
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, tracer: Optional[Tracer] = None):
+        # base_url bisa diarahkan ke server lain (mis. fake_bi_server.py)
+        if base_url:
+            self.BASE_URL = base_url
+        # Span per fase scrape (connect, transfer, parse, extract, transform, fallback)
+        self.tracer = tracer or Tracer()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7',
         })
+        # State conditional request per komoditas: ETag, Last-Modified,
+        # hash tabel terakhir, dan hasil parse terakhir
+        self._conditional_state: Dict[str, Dict] = {}
+        self.stats = {
+            "requests": 0,
+            "not_modified": 0,       # Server membalas 304
+            "unchanged_content": 0,  # 200, tapi byte tabel identik
+            "parsed": 0,
+            "fallback": 0,
+        }
     
     def scrape_rice_prices(self, commodity_type: str = "Beras Premium") -> Dict:
         """
@@ -82,47 +121,290 @@ class BIPriceScraper:
             commodity_type: Jenis beras (Beras Premium, Beras Medium, dll)
             
         Returns:
-            Dict dengan data harga per provinsi dan bulan
+            Dict dengan data harga per provinsi dan bulan, plus ringkasan
+            timing per fase di key "trace"
         """
-        try:
-            logger.info(f"🔍 Scraping {commodity_type} prices from BI...")
-            
-            # Request ke halaman BI
-            response = self.session.get(self.BASE_URL, timeout=30)
-            response.raise_for_status()
+        with self.tracer.collect() as spans:
+            result = self._scrape_rice_prices(commodity_type)
+        result["trace"] = summarize(spans)
+        return result
+    
+    def _scrape_rice_prices(self, commodity_type: str) -> Dict:
+        return self._scrape_prices_bulk([commodity_type])[commodity_type]
+    
+    def scrape_prices_bulk(self, commodity_types: List[str]) -> Dict[str, Dict]:
+        """
+        Scrape beberapa komoditas sekaligus dengan satu request ke BI
+        
+        Halaman BI di-download dan di-parse sekali, lalu tabel tiap komoditas
+        dicari berdasarkan caption/heading. Komoditas yang tabelnya tidak
+        ditemukan memakai fallback data.
+        
+        Args:
+            commodity_types: Daftar nama komoditas BI (Beras Premium, Cabai Merah, dll)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        Returns:
+            Dict nama komoditas -> hasil scrape (format sama dengan scrape_rice_prices)
+        """
+        with self.tracer.collect() as spans:
+            results = self._scrape_prices_bulk(commodity_types)
+        trace = summarize(spans)
+        for result in results.values():
+            result["trace"] = trace
+        return results
+    
+    def _scrape_prices_bulk(self, commodity_types: List[str]) -> Dict[str, Dict]:
+        """
+        Satu request (conditional) untuk semua komoditas
+        
+        Validator dan hash halaman disimpan per komoditas; If-None-Match /
+        If-Modified-Since hanya dikirim jika semua komoditas yang diminta
+        sudah punya data dari versi halaman yang sama. Komoditas yang hash
+        halamannya tidak berubah tidak di-parse ulang.
+        """
+        try:
+            logger.info(f"🔍 Scraping {', '.join(commodity_types)} prices from BI...")
             
-            # Cari tabel data harga
-            # BI website structure might vary, need to inspect actual HTML
-            tables = soup.find_all('table')
+            states = {c: self._conditional_state.get(c, {}) for c in commodity_types}
+            versions = {(s.get("etag"), s.get("last_modified"), s.get("content_hash"))
+                        for s in states.values()}
+            all_cached = all(s.get("data") for s in states.values())
+            shared_state = next(iter(states.values())) if all_cached and len(versions) == 1 else {}
             
-            if not tables:
-                logger.warning("⚠️ No tables found on page")
-                return self._generate_fallback_data(commodity_type)
+            # Request ke halaman BI (conditional jika sudah pernah parse)
+            response = self._fetch(headers=self._conditional_headers(shared_state))
             
-            # Parse tabel harga
-            price_data = self._parse_price_table(tables[0], commodity_type)
+            if response.status_code == 304 and shared_state:
+                self.stats["not_modified"] += 1
+                logger.info("✓ BI page not modified (304), reusing parsed data")
+                return {c: self._unchanged_result(c, states[c], "not_modified") for c in commodity_types}
             
-            if not price_data:
-                logger.warning("⚠️ No price data parsed, using fallback")
-                return self._generate_fallback_data(commodity_type)
+            response.raise_for_status()
             
-            logger.info(f"✓ Successfully scraped {len(price_data)} provinces")
-            return {
-                "success": True,
-                "source": "bi_scraping",
-                "scraped_at": datetime.now().isoformat(),
-                "commodity": commodity_type,
-                "data": price_data
-            }
+            # Bandingkan hash tabel sebelum parsing HTML
+            content_hash = self._content_hash(response.content)
+            results = {}
+            for commodity_type, state in states.items():
+                if state.get("data") and state.get("content_hash") == content_hash:
+                    self._store_validators(state, response)
+                    results[commodity_type] = self._unchanged_result(commodity_type, state, "hash_match")
+            if len(results) == len(commodity_types):
+                self.stats["unchanged_content"] += 1
+                logger.info("✓ BI table unchanged (hash match), skipping parse")
+                return results
             
+            with self.tracer.span("parse", bytes=len(response.content)) as span:
+                soup = BeautifulSoup(response.content, 'html.parser')
+                tables = soup.find_all('table')
+                span.attributes["tables"] = len(tables)
+            self.stats["parsed"] += 1
         except requests.RequestException as e:
             logger.error(f"✗ Network error: {e}")
-            return self._generate_fallback_data(commodity_type)
+            return {c: self._generate_fallback_data(c) for c in commodity_types}
         except Exception as e:
             logger.error(f"✗ Scraping error: {e}")
-            return self._generate_fallback_data(commodity_type)
+            return {c: self._generate_fallback_data(c) for c in commodity_types}
+        
+        scraped_at = datetime.now().isoformat()
+        for commodity_type in commodity_types:
+            if commodity_type in results:
+                continue
+            # Error parsing satu komoditas hanya membuat komoditas itu fallback
+            try:
+                with self.tracer.span("extract", commodity=commodity_type) as span:
+                    table = self._find_commodity_table(tables, commodity_type,
+                                                       allow_single=len(commodity_types) == 1)
+                    price_data = self._parse_price_table(table, commodity_type) if table is not None else []
+                    span.attributes["rows"] = len(price_data)
+            except Exception as e:
+                logger.error(f"✗ Parse error for {commodity_type}: {e}")
+                results[commodity_type] = self._generate_fallback_data(commodity_type)
+                continue
+            
+            if not price_data:
+                logger.warning(f"⚠️ No table for {commodity_type}, using fallback")
+                results[commodity_type] = self._generate_fallback_data(commodity_type)
+                continue
+            
+            with self.tracer.span("transform", rows=len(price_data)):
+                state = states[commodity_type]
+                self._store_validators(state, response)
+                state["content_hash"] = content_hash
+                state["data"] = price_data
+                self._conditional_state[commodity_type] = state
+                
+                results[commodity_type] = {
+                    "success": True,
+                    "source": "bi_scraping",
+                    "scraped_at": scraped_at,
+                    "commodity": commodity_type,
+                    "content_unchanged": False,
+                    "data": price_data
+                }
+            logger.info(f"✓ Successfully scraped {len(price_data)} provinces of {commodity_type}")
+        
+        return {c: results[c] for c in commodity_types}
+    
+    def scrape_price_range(self, commodity_type: str, province_name: str,
+                           start_period: str, end_period: str) -> List[Dict]:
+        """
+        Ambil harga bulanan satu komoditas & provinsi untuk rentang periode
+        
+        Dipakai oleh crawler backfill. Berbeda dengan scrape_rice_prices,
+        error jaringan tidak diganti fallback data, tapi di-raise agar unit
+        kerja bisa di-retry.
+        
+        Args:
+            commodity_type: Nama komoditas BI (Beras Premium, dll)
+            province_name: Nama provinsi BI (Aceh, Jawa Barat, dll)
+            start_period: Periode awal "YYYY-MM"
+            end_period: Periode akhir "YYYY-MM"
+            
+        Returns:
+            List baris {kode_prov, provinsi, commodity, period, price}
+        """
+        response = self._fetch(params={
+            "komoditas": commodity_type,
+            "provinsi": province_name,
+            "tanggal_awal": start_period,
+            "tanggal_akhir": end_period,
+        })
+        response.raise_for_status()
+        
+        with self.tracer.span("parse", bytes=len(response.content)):
+            soup = BeautifulSoup(response.content, 'html.parser')
+            table = soup.find('table')
+        self.stats["parsed"] += 1
+        if table is None:
+            return []
+        with self.tracer.span("extract") as span:
+            records = self._parse_period_table(table, commodity_type)
+            span.attributes["rows"] = len(records)
+        return records
+    
+    def _fetch(self, headers: Optional[Dict] = None, params: Optional[Dict] = None):
+        """
+        GET halaman BI dengan span terpisah untuk connect dan transfer
+        
+        "connect" mencakup DNS, TCP/TLS, dan menunggu header response
+        (stream=True); "transfer" adalah download body.
+        """
+        with self.tracer.span("connect", url=self.BASE_URL) as span:
+            response = self.session.get(self.BASE_URL, headers=headers, params=params,
+                                        timeout=30, stream=True)
+            span.attributes["status"] = response.status_code
+        self.stats["requests"] += 1
+        
+        with self.tracer.span("transfer") as span:
+            content = response.content
+            span.attributes["bytes"] = len(content)
+        return response
+    
+    def _parse_period_table(self, table, commodity_type: str) -> List[Dict]:
+        """Parse tabel dengan header kolom "MM/YYYY" menjadi baris per periode"""
+        rows = table.find_all('tr')
+        if not rows:
+            return []
+        
+        # Header: No/Provinsi lalu kolom periode "MM/YYYY"
+        periods = []
+        for th in rows[0].find_all(['th', 'td']):
+            match = re.match(r'^(\d{1,2})/(\d{4})$', th.get_text(strip=True))
+            periods.append(f"{match.group(2)}-{int(match.group(1)):02d}" if match else None)
+        
+        records = []
+        for row in rows[1:]:
+            cols = row.find_all(['td', 'th'])
+            province_code = None
+            province_name = None
+            for col in cols:
+                name = col.get_text(strip=True)
+                if name in self.PROVINCE_MAPPING:
+                    province_name = name
+                    province_code = self.PROVINCE_MAPPING[name]
+                    break
+            if not province_code:
+                continue
+            
+            for period, col in zip(periods, cols):
+                if period is None:
+                    continue
+                price = self._parse_price(col.get_text(strip=True))
+                if price > 0:
+                    records.append({
+                        "kode_prov": province_code,
+                        "provinsi": province_name,
+                        "commodity": commodity_type,
+                        "period": period,
+                        "price": price
+                    })
+        
+        return records
+    
+    def _find_commodity_table(self, tables, commodity_type: str, allow_single: bool = False):
+        """
+        Cari tabel yang caption atau heading sebelumnya menyebut komoditas
+        
+        allow_single: jika hanya satu komoditas yang diminta dan halaman
+        hanya punya satu tabel (halaman BI per komoditas, tanpa caption),
+        tabel itu dipakai. Halaman multi-tabel tanpa label tetap ditolak
+        karena ambigu.
+        """
+        if allow_single and len(tables) == 1:
+            return tables[0]
+        needle = commodity_type.lower()
+        for table in tables:
+            caption = table.find('caption')
+            label = caption.get_text(" ", strip=True) if caption else ""
+            heading = table.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+            if heading:
+                label += " " + heading.get_text(" ", strip=True)
+            if needle in label.lower():
+                return table
+        return None
+    
+    def _conditional_headers(self, state: Dict) -> Dict[str, str]:
+        """Header If-None-Match / If-Modified-Since dari validator tersimpan"""
+        headers = {}
+        if not state.get("data"):
+            return headers
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+    
+    def _store_validators(self, state: Dict, response) -> None:
+        """Simpan ETag dan Last-Modified dari response terakhir"""
+        state["etag"] = response.headers.get("ETag")
+        state["last_modified"] = response.headers.get("Last-Modified")
+    
+    def _content_hash(self, content: bytes) -> str:
+        """
+        Hash byte tabel harga pada halaman (dari <table> pertama sampai
+        </table> terakhir, termasuk caption/heading di antaranya).
+        Bagian lain halaman (token, timestamp, banner) sering berubah tiap
+        request, jadi yang dibandingkan hanya tabelnya; jika tabel tidak
+        ditemukan, seluruh body yang di-hash.
+        """
+        lowered = content.lower()
+        start = lowered.find(b"<table")
+        end = lowered.rfind(b"</table>") if start != -1 else -1
+        if start != -1 and end != -1:
+            content = content[start:end + len(b"</table>")]
+        return hashlib.sha256(content).hexdigest()
+    
+    def _unchanged_result(self, commodity_type: str, state: Dict, reason: str) -> Dict:
+        """Hasil scrape dari data parse terakhir saat konten BI tidak berubah"""
+        return {
+            "success": True,
+            "source": "bi_scraping",
+            "scraped_at": datetime.now().isoformat(),
+            "commodity": commodity_type,
+            "content_unchanged": True,
+            "change_check": reason,
+            "data": state["data"]
+        }
     
     def _parse_price_table(self, table, commodity_type: str) -> List[Dict]:
         """Parse HTML table menjadi structured data"""
@@ -188,47 +470,33 @@ class BIPriceScraper:
         Generate realistic fallback data based on actual market prices
         Used when scraping fails
         """
+        with self.tracer.span("fallback", commodity=commodity_type) as span:
+            result = self._build_fallback_data(commodity_type)
+            span.attributes["rows"] = len(result["data"])
+        return result
+    
+    def _build_fallback_data(self, commodity_type: str) -> Dict:
         logger.info("📦 Generating realistic fallback data...")
+        self.stats["fallback"] += 1
         
-        # Base prices untuk Beras Premium (realistic 2024-2026)
-        base_prices = {
-            "Beras Premium": 14000,
-            "Beras Medium": 12000,
-        }
+        base_price = self.BASE_PRICES.get(commodity_type, 13000)
+        province_names = list(self.PROVINCE_MAPPING)
+        province_codes = list(self.PROVINCE_MAPPING.values())
         
-        base_price = base_prices.get(commodity_type, 13000)
-        price_data = []
+        # Faktor lokasi, musiman, dan variasi ±3% dihitung sekaligus (provinsi × bulan)
+        prices = self._synthetic.price_series(
+            {commodity_type: base_price}, province_codes, [datetime.now().year]
+        )[0, 0].tolist()
         
-        # Generate untuk semua provinsi
-        for province_name, province_code in self.PROVINCE_MAPPING.items():
-            # Variasi harga berdasarkan lokasi (pulau)
-            location_factor = self._get_location_factor(province_code)
-            
-            # Generate harga per bulan dengan variasi musiman
-            monthly_prices = {}
-            for month_idx, month_key in enumerate(["jan", "feb", "mar", "apr", "may", "jun",
-                                                     "jul", "aug", "sep", "oct", "nov", "dec"], 1):
-                # Seasonal variation (panen raya: Mar-Apr & Sep-Oct harga turun)
-                seasonal_factor = 1.0
-                if month_idx in [3, 4, 9, 10]:  # Panen raya
-                    seasonal_factor = 0.95
-                elif month_idx in [1, 2, 7, 8]:  # Paceklik
-                    seasonal_factor = 1.05
-                
-                # Random variation ±3%
-                import random
-                random.seed(int(province_code) * month_idx)
-                random_factor = random.uniform(0.97, 1.03)
-                
-                final_price = int(base_price * location_factor * seasonal_factor * random_factor)
-                monthly_prices[month_key] = final_price
-            
-            price_data.append({
+        price_data = [
+            {
                 "kode_prov": province_code,
                 "provinsi": province_name,
-                "prices": monthly_prices,
+                "prices": dict(zip(MONTHS, monthly_prices)),
                 "commodity": commodity_type
-            })
+            }
+            for province_name, province_code, monthly_prices in zip(province_names, province_codes, prices)
+        ]
         
         return {
             "success": True,
@@ -237,30 +505,6 @@ class BIPriceScraper:
             "commodity": commodity_type,
             "data": price_data
         }
-    
-    def _get_location_factor(self, province_code: str) -> float:
-        """
-        Adjustment factor based on location (logistics cost)
-        Papua & Maluku: higher prices (remote areas)
-        Java: lower prices (production centers)
-        """
-        code_int = int(province_code)
-        
-        if code_int >= 91:  # Papua
-            return 1.20  # +20%
-        elif code_int >= 81:  # Maluku
-            return 1.12  # +12%
-        elif code_int >= 71:  # Sulawesi
-            return 1.05  # +5%
-        elif code_int >= 61:  # Kalimantan
-            return 1.02  # +2%
-        elif code_int >= 51:  # Bali & Nusa Tenggara
-            return 1.00  # baseline
-        elif code_int >= 31:  # Java
-            return 0.95  # -5% (production center)
-        else:  # Sumatera
-            return 0.98  # -2%
-
 
 def main():
     """Test scraper"""
@@ -5,11 +5,17 @@ FastAPI service that exposes web scraping functionality
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import Dict, List, Optional
+import asyncio
 import logging
+import os
 from datetime import datetime
 from scraper import BIPriceScraper
+from cache import LRUCache
+from tracing import Tracer, InMemoryExporter
+from crawler import CrawlJob, CrawlSpec, parse_period
+from price_store import PriceStore
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -30,10 +36,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory cache
-price_cache = {}
-cache_timestamp = {}
+# In-memory cache (LRU, dibatasi jumlah entry dan byte)
 CACHE_DURATION = 3600  # 1 hour in seconds
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 64))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 16 * 1024 * 1024))
+CACHE_PURGE_INTERVAL = int(os.getenv("CACHE_PURGE_INTERVAL", 300))
+price_cache = LRUCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_DURATION)
+
+# Mapping slug komoditas (dipakai frontend) ke nama komoditas BI
+COMMODITY_MAP = {
+    "beras_premium": "Beras Premium",
+    "beras_medium": "Beras Medium",
+    "cabai_merah": "Cabai Merah",
+    "cabai_rawit": "Cabai Rawit",
+    "bawang_merah": "Bawang Merah",
+    "bawang_putih": "Bawang Putih",
+    "daging_ayam": "Daging Ayam",
+    "daging_sapi": "Daging Sapi",
+    "telur_ayam": "Telur Ayam",
+    "minyak_goreng": "Minyak Goreng",
+}
+
+# Slug lama yang masih dipakai client (frontend/app.js memanggil /api/bi/prices/beras)
+SLUG_ALIASES = {
+    "beras": "beras_premium",
+}
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun",
+          "jul", "aug", "sep", "oct", "nov", "dec"]
+
+# Override URL BI (mis. fake_bi_server.py untuk testing lokal)
+BI_BASE_URL = os.getenv("BI_BASE_URL")
+
+# Satu instance scraper untuk seluruh request, agar validator (ETag,
+# Last-Modified) dan hash konten tetap tersimpan antar scrape
+# Timing per fase scrape dikumpulkan in-process untuk /api/metrics
+trace_exporter = InMemoryExporter()
+scraper = BIPriceScraper(base_url=BI_BASE_URL, tracer=Tracer([trace_exporter]))
+
+
+# Backfill crawl
+PRICE_STORE_PATH = os.getenv("PRICE_STORE_PATH", "prices.db")
+CRAWL_CHECKPOINT_DIR = os.getenv("CRAWL_CHECKPOINT_DIR", "crawl_checkpoints")
+crawl_jobs: Dict[str, CrawlJob] = {}
+price_store: Optional[PriceStore] = None
+
+
+class CrawlRequest(BaseModel):
+    commodities: List[str] = Field(min_length=1)
+    start_period: str
+    end_period: str
+    provinces: Optional[List[str]] = None
+    chunk_months: int = Field(12, ge=1)
+    concurrency: int = Field(4, ge=1, le=32)
+    rate: float = Field(2.0, gt=0)
+
+    @field_validator("start_period", "end_period")
+    @classmethod
+    def check_period(cls, value: str) -> str:
+        """Periode harus "YYYY-MM" dengan bulan 01-12"""
+        parse_period(value)
+        return value
 
 
 class ScrapeResponse(BaseModel):
@@ -57,7 +120,10 @@ def root():
             "health": "/health",
             "scrape": "/api/scrape/rice/{commodity_type}",
             "prices": "/api/prices/{commodity_type}",
-            "refresh": "/api/refresh/{commodity_type}"
+            "prices_bulk": "/api/prices/bulk?commodities=&months=",
+            "refresh": "/api/refresh/{commodity_type}",
+            "crawl": "/api/crawl/jobs",
+            "metrics": "/api/metrics"
         }
     }
 
@@ -72,6 +138,78 @@ def health_check():
     }
 
 
+@app.on_event("startup")
+async def start_cache_purger():
+    """Buang entry cache kedaluwarsa secara berkala di background"""
+    async def purge_loop():
+        while True:
+            await asyncio.sleep(CACHE_PURGE_INTERVAL)
+            purged = price_cache.purge_expired()
+            if purged:
+                logger.info(f"🧹 Purged {purged} expired cache entries")
+    
+    asyncio.create_task(purge_loop())
+
+
+def _resolve_slug(commodity_type: str) -> str:
+    """Slug komoditas yang dikenal (alias -> slug kanonik); 404 untuk slug lain"""
+    slug = commodity_type.lower()
+    slug = SLUG_ALIASES.get(slug, slug)
+    if slug not in COMMODITY_MAP:
+        raise HTTPException(status_code=404,
+                            detail=f"Unknown commodity: {commodity_type} (use {', '.join(COMMODITY_MAP)})")
+    return slug
+
+
+def _cache_key(slug: str) -> str:
+    """
+    Cache key dari slug komoditas yang sudah di-resolve (_resolve_slug),
+    bukan string mentah dari path, supaya jumlah key tetap terbatas apa
+    pun input client
+    """
+    return f"rice_{slug}"
+
+
+def _get_cached(cache_key: str) -> Optional[Dict]:
+    """Ambil hasil scrape dari cache jika belum kedaluwarsa"""
+    entry = price_cache.get(cache_key)
+    if entry is None:
+        return None
+    value, cache_age = entry
+    cached_data = value.copy()
+    cached_data['cached'] = True
+    cached_data['cache_age_seconds'] = int(cache_age)
+    return cached_data
+
+
+def _store_scrape_result(cache_key: str, result: Dict) -> Dict:
+    """Simpan hasil scrape ke cache, kecuali konten BI tidak berubah"""
+    if result.get('content_unchanged') and cache_key in price_cache:
+        # Konten BI sama dengan yang di-cache: cukup perpanjang umur cache
+        price_cache.touch(cache_key)
+        cached_result = price_cache.peek(cache_key).copy()
+        cached_result['content_unchanged'] = True
+        cached_result['trace'] = result.get('trace')
+        return cached_result
+    
+    price_cache.set(cache_key, result)
+    # Salinan: metadata respons (cached, provinces_count) tidak boleh mengubah
+    # value yang ukurannya sudah dihitung cache
+    return result.copy()
+
+
+def _calculate_ipe(price: float, national_avg: float):
+    """Hitung IPE dan kategorinya (rendah/normal/tinggi)"""
+    ipe = round(price / national_avg, 2)
+    if ipe < 0.90:
+        kategori = "rendah"
+    elif ipe > 1.10:
+        kategori = "tinggi"
+    else:
+        kategori = "normal"
+    return ipe, kategori
+
+
 @app.get("/api/scrape/rice/{commodity_type}")
 async def scrape_rice_prices(commodity_type: str, force_refresh: bool = False):
     """
@@ -84,34 +222,22 @@ async def scrape_rice_prices(commodity_type: str, force_refresh: bool = False):
     Returns:
         Scraped or cached price data
     """
+    slug = _resolve_slug(commodity_type)
+    bi_commodity_name = COMMODITY_MAP[slug]
+    cache_key = _cache_key(slug)
     try:
-        # Map commodity type
-        commodity_map = {
-            "beras_premium": "Beras Premium",
-            "beras_medium": "Beras Medium",
-        }
-        
-        bi_commodity_name = commodity_map.get(commodity_type.lower(), "Beras Premium")
-        cache_key = f"rice_{commodity_type.lower()}"
-        
         # Check cache
-        if not force_refresh and cache_key in price_cache:
-            cache_age = datetime.now().timestamp() - cache_timestamp.get(cache_key, 0)
-            if cache_age < CACHE_DURATION:
-                logger.info(f"✓ Returning cached data for {commodity_type} (age: {int(cache_age)}s)")
-                cached_data = price_cache[cache_key].copy()
-                cached_data['cached'] = True
-                cached_data['cache_age_seconds'] = int(cache_age)
+        if not force_refresh:
+            cached_data = _get_cached(cache_key)
+            if cached_data is not None:
+                logger.info(f"✓ Returning cached data for {commodity_type} (age: {cached_data['cache_age_seconds']}s)")
                 return cached_data
         
         # Perform scraping
         logger.info(f"🔍 Starting scrape for {bi_commodity_name}...")
-        scraper = BIPriceScraper()
         result = scraper.scrape_rice_prices(bi_commodity_name)
         
-        # Cache the result
-        price_cache[cache_key] = result
-        cache_timestamp[cache_key] = datetime.now().timestamp()
+        result = _store_scrape_result(cache_key, result)
         
         # Add metadata
         result['cached'] = False
@@ -124,6 +250,108 @@ async def scrape_rice_prices(commodity_type: str, force_refresh: bool = False):
         raise HTTPException(status_code=500, detail=f"Scraping failed: {str(e)}")
 
 
+@app.get("/api/prices/bulk")
+async def get_bulk_prices(commodities: Optional[str] = None, months: Optional[str] = None):
+    """
+    Get price and IPE matrices for many commodities in one response
+    
+    Komoditas yang belum ada di cache di-scrape bersama dalam satu request
+    ke BI. Hasil disusun kolumnar: untuk tiap komoditas dan bulan, list
+    harga/IPE sejajar dengan urutan `provinces.codes`.
+    
+    Args:
+        commodities: Comma-separated slugs (default: semua komoditas)
+        months: Comma-separated months (jan,feb,...; default: semua bulan)
+    
+    Returns:
+        Columnar price and IPE matrices per commodity
+    """
+    slugs = [c.strip().lower() for c in commodities.split(",") if c.strip()] if commodities else list(COMMODITY_MAP)
+    slugs = list(dict.fromkeys(SLUG_ALIASES.get(c, c) for c in slugs))
+    month_keys = [m.strip().lower() for m in months.split(",") if m.strip()] if months else MONTHS
+    
+    unknown = [c for c in slugs if c not in COMMODITY_MAP]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown commodities: {', '.join(unknown)}")
+    invalid_months = [m for m in month_keys if m not in MONTHS]
+    if invalid_months:
+        raise HTTPException(status_code=400, detail=f"Invalid months: {', '.join(invalid_months)}")
+    
+    try:
+        # Ambil dari cache, sisanya di-scrape dalam satu pass
+        results = {}
+        missing = []
+        for slug in slugs:
+            cached_data = _get_cached(_cache_key(slug))
+            if cached_data is not None:
+                results[slug] = cached_data
+            else:
+                missing.append(slug)
+        
+        if missing:
+            logger.info(f"🔍 Bulk scrape for {', '.join(missing)}...")
+            scraped = scraper.scrape_prices_bulk([COMMODITY_MAP[slug] for slug in missing])
+            for slug in missing:
+                result = _store_scrape_result(_cache_key(slug), scraped[COMMODITY_MAP[slug]])
+                result['cached'] = False
+                results[slug] = result
+        
+        province_codes = list(BIPriceScraper.PROVINCE_MAPPING.values())
+        province_names = list(BIPriceScraper.PROVINCE_MAPPING.keys())
+        province_index = {code: i for i, code in enumerate(province_codes)}
+        
+        data = {}
+        for slug in slugs:
+            result = results[slug]
+            price_matrix = [[None] * len(province_codes) for _ in month_keys]
+            for province in result.get('data', []):
+                idx = province_index.get(province.get('kode_prov'))
+                if idx is None:
+                    continue
+                monthly_prices = province.get('prices', {})
+                for m, month in enumerate(month_keys):
+                    price = monthly_prices.get(month, 0)
+                    if price > 0:
+                        price_matrix[m][idx] = price
+            
+            national_average = []
+            ipe_matrix = []
+            for row in price_matrix:
+                month_prices = [p for p in row if p is not None]
+                national_avg = sum(month_prices) / len(month_prices) if month_prices else 0
+                national_average.append(int(national_avg) if national_avg else None)
+                ipe_matrix.append([
+                    _calculate_ipe(p, national_avg)[0] if p is not None else None
+                    for p in row
+                ])
+            
+            data[slug] = {
+                "commodity": COMMODITY_MAP[slug],
+                "source": result.get('source', 'unknown'),
+                "cached": result.get('cached', False),
+                "national_average": national_average,
+                "price": price_matrix,
+                "ipe": ipe_matrix
+            }
+        
+        return {
+            "success": True,
+            "months": month_keys,
+            "provinces": {
+                "codes": province_codes,
+                "names": province_names
+            },
+            "commodities": slugs,
+            "data": data
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"✗ Bulk price calculation failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Bulk price calculation failed: {str(e)}")
+
+
 @app.get("/api/prices/{commodity_type}")
 async def get_prices_with_ipe(commodity_type: str, year: Optional[int] = None, month: Optional[str] = None):
     """
@@ -169,15 +397,7 @@ async def get_prices_with_ipe(commodity_type: str, year: Optional[int] = None, m
             province_price = monthly_prices.get(month, 0)
             
             if province_price > 0:
-                ipe = round(province_price / national_avg, 2)
-                
-                # Categorize
-                if ipe < 0.90:
-                    kategori = "rendah"
-                elif ipe > 1.10:
-                    kategori = "tinggi"
-                else:
-                    kategori = "normal"
+                ipe, kategori = _calculate_ipe(province_price, national_avg)
                 
                 result_data.append({
                     "commodity": commodity_type,
@@ -212,12 +432,10 @@ async def get_prices_with_ipe(commodity_type: str, year: Optional[int] = None, m
 @app.post("/api/refresh/{commodity_type}")
 async def refresh_cache(commodity_type: str, background_tasks: BackgroundTasks):
     """Force refresh cached data in background"""
-    cache_key = f"rice_{commodity_type.lower()}"
+    cache_key = _cache_key(_resolve_slug(commodity_type))
     
     # Delete cache
-    if cache_key in price_cache:
-        del price_cache[cache_key]
-        del cache_timestamp[cache_key]
+    price_cache.delete(cache_key)
     
     # Trigger background scraping
     background_tasks.add_task(scrape_rice_prices, commodity_type, True)
@@ -229,22 +447,85 @@ async def refresh_cache(commodity_type: str, background_tasks: BackgroundTasks):
     }
 
 
+@app.post("/api/crawl/jobs")
+async def start_crawl_job(request: CrawlRequest, background_tasks: BackgroundTasks):
+    """
+    Start (or resume) a historical backfill crawl
+    
+    Job ID diturunkan dari spec, jadi mengirim spec yang sama setelah
+    service restart akan melanjutkan dari checkpoint.
+    """
+    global price_store
+    
+    spec = CrawlSpec(
+        commodities=request.commodities,
+        start_period=request.start_period,
+        end_period=request.end_period,
+        chunk_months=request.chunk_months,
+    )
+    if request.provinces:
+        spec.provinces = request.provinces
+    
+    existing = crawl_jobs.get(spec.job_id)
+    # "pending": job sudah didaftarkan tapi BackgroundTasks belum mulai (jalan setelah response)
+    if existing and existing.status in ("pending", "running"):
+        return existing.progress()
+    
+    try:
+        if price_store is None:
+            price_store = PriceStore(PRICE_STORE_PATH)
+        job = CrawlJob(spec, price_store, checkpoint_dir=CRAWL_CHECKPOINT_DIR,
+                       base_url=BI_BASE_URL, concurrency=request.concurrency, rate=request.rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    crawl_jobs[job.job_id] = job
+    background_tasks.add_task(job.run)
+    
+    progress = job.progress()
+    progress["status"] = "processing"
+    return progress
+
+
+@app.get("/api/crawl/jobs/{job_id}")
+def get_crawl_job(job_id: str):
+    """Get progress of a backfill crawl"""
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Crawl job not found: {job_id}")
+    return job.progress()
+
+
+@app.get("/api/metrics")
+def metrics(recent: int = 20):
+    """Scrape phase timings (connect, transfer, parse, extract, transform, fallback) and counters"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "scrape_stats": scraper.stats,
+        "cache": price_cache.stats(),
+        "tracing": trace_exporter.snapshot(recent=recent)
+    }
+
+
 @app.get("/api/cache/status")
 def cache_status():
     """Get cache status for all commodities"""
     status = {}
-    for key, timestamp in cache_timestamp.items():
-        age = datetime.now().timestamp() - timestamp
+    for key, info in price_cache.items_info().items():
+        age = info["age"]
         status[key] = {
             "cached": True,
             "age_seconds": int(age),
             "age_readable": f"{int(age / 60)} minutes",
-            "provinces": len(price_cache.get(key, {}).get('data', [])),
+            "provinces": len(info["value"].get('data', [])),
+            "bytes": info["bytes"],
             "expires_in": int(CACHE_DURATION - age) if age < CACHE_DURATION else 0
         }
     return {
         "cache_duration": CACHE_DURATION,
-        "items": status
+        "items": status,
+        "occupancy": price_cache.stats(),
+        "scrape_stats": scraper.stats
     }
 
 
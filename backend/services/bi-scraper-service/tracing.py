@@ -0,0 +1,132 @@
+"""
+Scrape Tracing
+Lightweight span timing for BIPriceScraper phases (no external exporter needed)
+
+Setiap fase scrape (connect, transfer, parse, extract, transform, fallback)
+dibungkus span. Span yang selesai dikirim ke exporter, yaitu callable apa
+pun yang menerima Span, sehingga bisa diganti dengan exporter lain
+(log, OpenTelemetry, dll) tanpa mengubah scraper.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class Span:
+    """Satu fase yang diukur: nama, durasi, dan atribut (bytes, rows, dll)"""
+
+    __slots__ = ("name", "attributes", "started_at", "duration_ms")
+
+    def __init__(self, name: str, attributes: Optional[Dict] = None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            **self.attributes,
+        }
+
+
+class Tracer:
+    """Buat span dan teruskan ke exporter"""
+
+    def __init__(self, exporters: Optional[Iterable[Callable[[Span], None]]] = None):
+        self.exporters: List[Callable[[Span], None]] = list(exporters or [])
+        self._local = threading.local()
+
+    def add_exporter(self, exporter: Callable[[Span], None]):
+        self.exporters.append(exporter)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        span = Span(name, attributes)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            for collected in getattr(self._local, "collectors", []):
+                collected.append(span)
+            for exporter in self.exporters:
+                exporter(span)
+
+    @contextmanager
+    def collect(self):
+        """Kumpulkan span yang selesai di thread ini selama blok berjalan"""
+        collectors = getattr(self._local, "collectors", None)
+        if collectors is None:
+            collectors = self._local.collectors = []
+        spans: List[Span] = []
+        collectors.append(spans)
+        try:
+            yield spans
+        finally:
+            collectors.remove(spans)
+
+
+def summarize(spans: Iterable[Span]) -> Dict:
+    """
+    Ringkas span satu scrape: durasi per fase (ms), byte yang di-download
+    (fase transfer) dan baris yang dihasilkan (fase extract/fallback)
+    """
+    phases: Dict[str, float] = {}
+    total_bytes = 0
+    total_rows = 0
+    for span in spans:
+        phases[span.name] = round(phases.get(span.name, 0.0) + span.duration_ms, 3)
+        if span.name == "transfer":
+            total_bytes += span.attributes.get("bytes", 0)
+        elif span.name in ("extract", "fallback"):
+            total_rows += span.attributes.get("rows", 0)
+    return {"phases_ms": phases, "bytes": total_bytes, "rows": total_rows}
+
+
+class InMemoryExporter:
+    """
+    Exporter in-process: agregat per fase + ring buffer span terakhir
+    Dipakai endpoint /api/metrics, jalan tanpa koneksi ke collector luar.
+    """
+
+    def __init__(self, max_recent: int = 200):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=max_recent)
+        self._aggregates: Dict[str, Dict] = {}
+
+    def __call__(self, span: Span):
+        with self._lock:
+            self._recent.append(span.to_dict())
+            agg = self._aggregates.setdefault(span.name, {
+                "count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0, "rows": 0,
+            })
+            agg["count"] += 1
+            agg["total_ms"] += span.duration_ms
+            agg["max_ms"] = max(agg["max_ms"], span.duration_ms)
+            agg["bytes"] += span.attributes.get("bytes", 0)
+            agg["rows"] += span.attributes.get("rows", 0)
+            if "error" in span.attributes:
+                agg["errors"] += 1
+
+    def snapshot(self, recent: int = 20) -> Dict:
+        with self._lock:
+            phases = {
+                name: {
+                    **agg,
+                    "total_ms": round(agg["total_ms"], 3),
+                    "max_ms": round(agg["max_ms"], 3),
+                    "avg_ms": round(agg["total_ms"] / agg["count"], 3) if agg["count"] else 0.0,
+                }
+                for name, agg in self._aggregates.items()
+            }
+            # [-0:] akan mengembalikan semua span
+            return {"phases": phases, "recent": list(self._recent)[-recent:] if recent > 0 else []}
@@ -0,0 +1,135 @@
+"""
+Geo Service Benchmark
+Single-point latency and batch throughput for ReverseGeocoder
+
+Index dibangun dari data yang sama dengan server.py (GeoParquet store /
+shapefile + provinsi.json). Titik acak diambil di dalam bbox data, lalu
+diukur langsung in-process. Dengan --url request juga dikirim ke service
+yang sedang jalan (mis. http://localhost:3004) untuk mengukur end-to-end.
+
+Usage:
+    python bench_geo.py
+    python bench_geo.py --single 5000 --batch 100000
+    python bench_geo.py --url http://localhost:3004 --json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+import urllib.request
+from typing import Dict
+
+import numpy as np
+import shapely
+
+from geo_index import ReverseGeocoder, load_province_index, load_village_index
+from server import PROVINCES_PATH, SHAPEFILE_PATH, STORE_DIR
+
+
+def random_points(geocoder: ReverseGeocoder, count: int, seed: int = 0):
+    """(lon, lat) acak di dalam bbox polygon yang dimuat"""
+    index = geocoder.villages if geocoder.villages is not None else geocoder.provinces
+    minx, miny, maxx, maxy = shapely.total_bounds(index.geoms)
+    rng = np.random.default_rng(seed)
+    return rng.uniform(minx, maxx, count), rng.uniform(miny, maxy, count)
+
+
+def _percentiles(samples_ms) -> Dict:
+    samples = sorted(samples_ms)
+    return {
+        "p50_ms": round(statistics.median(samples), 4),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def bench_single(geocoder: ReverseGeocoder, lon, lat) -> Dict:
+    timings = []
+    for x, y in zip(lon.tolist(), lat.tolist()):
+        start = time.perf_counter()
+        geocoder.locate(x, y)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"points": len(timings), **_percentiles(timings)}
+
+
+def bench_batch(geocoder: ReverseGeocoder, lon, lat) -> Dict:
+    start = time.perf_counter()
+    result = geocoder.locate_many(lon, lat)
+    elapsed = time.perf_counter() - start
+    found = sum(level is not None for level in result["level"])
+    return {
+        "points": len(lon),
+        "found": found,
+        "seconds": round(elapsed, 3),
+        "points_per_second": round(len(lon) / elapsed),
+    }
+
+
+def bench_http(url: str, lon, lat, single: int) -> Dict:
+    timings = []
+    for x, y in zip(lon[:single].tolist(), lat[:single].tolist()):
+        start = time.perf_counter()
+        with urllib.request.urlopen(f"{url}/api/locate?lat={y}&lon={x}") as response:
+            response.read()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    body = json.dumps({"lat": lat.tolist(), "lon": lon.tolist()}).encode("utf-8")
+    request = urllib.request.Request(f"{url}/api/locate/batch", data=body,
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        payload = json.load(response)
+    return {
+        "single": {"points": len(timings), **_percentiles(timings)},
+        "batch": {
+            "points": payload["count"],
+            "found": payload["found"],
+            "seconds": round(time.perf_counter() - start, 3),
+            "server_ms": payload["elapsed_ms"],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reverse geocoding")
+    parser.add_argument("--single", type=int, default=2000, help="Jumlah lookup satu titik")
+    parser.add_argument("--batch", type=int, default=100_000, help="Jumlah titik per batch")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="Base URL service untuk benchmark HTTP")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    geocoder = ReverseGeocoder(load_village_index(STORE_DIR, SHAPEFILE_PATH), load_province_index(PROVINCES_PATH))
+    if not geocoder.ready:
+        raise SystemExit("No polygon data found")
+    report = {"load_seconds": round(time.perf_counter() - start, 2)}
+
+    lon, lat = random_points(geocoder, max(args.single, args.batch), args.seed)
+    report["single"] = bench_single(geocoder, lon[:args.single], lat[:args.single])
+    report["batch"] = bench_batch(geocoder, lon[:args.batch], lat[:args.batch])
+    if args.url:
+        report["http"] = bench_http(args.url.rstrip("/"), lon[:args.batch], lat[:args.batch], args.single)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Index load: {report['load_seconds']}s")
+    s = report["single"]
+    print(f"Single: {s['points']} lookups, p50 {s['p50_ms']} ms, p99 {s['p99_ms']} ms")
+    b = report["batch"]
+    print(f"Batch:  {b['points']:,} points in {b['seconds']}s "
+          f"({b['points_per_second']:,} points/s, {b['found']:,} found)")
+    if "http" in report:
+        h = report["http"]
+        print(f"HTTP single: p50 {h['single']['p50_ms']} ms, p99 {h['single']['p99_ms']} ms")
+        print(f"HTTP batch:  {h['batch']['points']:,} points in {h['batch']['seconds']}s "
+              f"(server {h['batch']['server_ms']} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Admin boundary store
+Pre-dissolved kecamatan/kabupaten/provinsi boundaries from the GeoParquet cache
+
+Batas wilayah dibangun batch oleh scripts/admin_boundaries.py
+(data/cache/admin-boundaries/<level>.lod<N>.parquet). Service ini hanya
+membaca file level x LOD yang diminta sekali, menyimpan string Feature
+GeoJSON-nya di memori, dan memfilter per provinsi saat request.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+from lod import ADMIN_LEVELS, lod_for_zoom  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class BoundaryStore:
+    """Cache lazy (level, lod) -> (kolom provinsi, string Feature)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._layers: Dict[Tuple[str, int], Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return os.path.exists(os.path.join(self.directory, "manifest.json"))
+
+    def manifest(self) -> Optional[Dict]:
+        path = os.path.join(self.directory, "manifest.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load(self, level: str, lod: int) -> Tuple[np.ndarray, List[str]]:
+        import geopandas as gpd
+
+        start = time.time()
+        gdf = gpd.read_parquet(os.path.join(self.directory, f"{level}.lod{lod}.parquet"))
+        columns = [c for c in gdf.columns if c != "geometry"]
+        geometries = shapely.to_geojson(np.asarray(gdf.geometry.values))
+        features = []
+        for values, geometry in zip(gdf[columns].itertuples(index=False), geometries):
+            properties = {c: (v.item() if hasattr(v, "item") else v) for c, v in zip(columns, values)}
+            features.append('{"type":"Feature","properties":'
+                            + json.dumps(properties, ensure_ascii=False, separators=(",", ":"))
+                            + ',"geometry":' + geometry + '}')
+        logger.info(f"✓ Batas {level} lod{lod}: {len(features):,} wilayah ({time.time() - start:.2f}s)")
+        return gdf["provinsi"].to_numpy(dtype=object), features
+
+    def query(self, level: str, zoom: int, provinces: Optional[Sequence[str]] = None) -> Tuple[List[str], Dict]:
+        """String Feature untuk satu level pada LOD zoom, opsional difilter provinsi (case-insensitive)"""
+        lod = lod_for_zoom(zoom)
+        key = (level, lod["level"])
+        with self._lock:
+            if key not in self._layers:
+                self._layers[key] = self._load(level, lod["level"])
+        names, features = self._layers[key]
+
+        if provinces:
+            wanted = {p.strip().upper() for p in provinces}
+            positions = [i for i, name in enumerate(names) if str(name).upper() in wanted]
+            features = [features[i] for i in positions]
+        return features, {"level": level, "lod": lod["level"], "min_zoom": lod["min_zoom"], "max_zoom": lod["max_zoom"]}
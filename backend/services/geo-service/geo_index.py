@@ -0,0 +1,182 @@
+"""
+Reverse geocoding index
+Point-in-polygon lookup over BIG villages and provinces with shapely STRtree
+
+Polygon desa dan provinsi dimuat sekali ke memori lalu di-index dengan
+STRtree. Titik (lon, lat) dicari secara vektor: satu kali
+`STRtree.query(points, predicate="intersects")` untuk seluruh batch, jadi
+biaya per titik hanya traversal tree + satu test point-in-polygon, tanpa
+loop Python per titik.
+
+Titik di luar polygon desa (laut, celah antar polygon) jatuh ke index
+provinsi sehingga minimal nama provinsi tetap terisi.
+
+Sumber desa (urutan prioritas):
+- GeoParquet store hasil scripts/village_store.py (manifest.json +
+  satu file per provinsi), dibaca langsung tanpa import dari scripts/
+- shapefile BIG Batas_Wilayah_KelurahanDesa_10K_AR.shp
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import shapely
+
+logger = logging.getLogger(__name__)
+
+VILLAGE_COLUMNS = ["KDEPUM", "NAMOBJ", "WADMKC", "WADMKK", "WADMPR"]
+
+# Nama field output -> kolom shapefile
+VILLAGE_FIELDS = {
+    "kdepum": "KDEPUM",
+    "desa": "NAMOBJ",
+    "kecamatan": "WADMKC",
+    "kabupaten": "WADMKK",
+    "provinsi": "WADMPR",
+}
+RESULT_FIELDS = list(VILLAGE_FIELDS)
+
+
+def _clean(values) -> np.ndarray:
+    """Array object string dengan None untuk NaN/kosong"""
+    result = np.asarray(values, dtype=object).copy()
+    for i, value in enumerate(result):
+        if value is None or (isinstance(value, float) and value != value) or str(value).strip() == "":
+            result[i] = None
+        else:
+            result[i] = str(value)
+    return result
+
+
+class PolygonIndex:
+    """STRtree atas satu array polygon + kolom atribut paralel"""
+
+    def __init__(self, geoms, attributes: Dict[str, Sequence]):
+        self.geoms = np.asarray(geoms)
+        # Polygon invalid (self-intersection) memberi hasil predicate yang salah
+        invalid = ~shapely.is_valid(self.geoms)
+        if invalid.any():
+            self.geoms[invalid] = shapely.make_valid(self.geoms[invalid])
+        self.tree = shapely.STRtree(self.geoms)
+        self.attributes = {name: _clean(values) for name, values in attributes.items()}
+
+    def __len__(self):
+        return len(self.geoms)
+
+    def query_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Posisi polygon yang memuat setiap titik, -1 jika tidak ada
+
+        Titik tepat di batas dua polygon diberikan ke polygon dengan posisi
+        terkecil agar hasilnya deterministik.
+        """
+        result = np.full(len(points), -1, dtype=np.int64)
+        point_idx, geom_idx = self.tree.query(points, predicate="intersects")
+        if len(point_idx):
+            order = np.lexsort((geom_idx, point_idx))
+            point_idx, geom_idx = point_idx[order], geom_idx[order]
+            first = np.r_[True, point_idx[1:] != point_idx[:-1]]
+            result[point_idx[first]] = geom_idx[first]
+        return result
+
+
+def load_village_index(store_dir: str, shapefile: str) -> Optional[PolygonIndex]:
+    """Polygon desa dari GeoParquet store, fallback ke shapefile"""
+    import geopandas as gpd
+    import pandas as pd
+
+    start = time.time()
+    manifest_path = os.path.join(store_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        frames = [gpd.read_parquet(os.path.join(store_dir, part["file"]), columns=VILLAGE_COLUMNS + ["geometry"])
+                  for part in manifest["partitions"].values()]
+        gdf = gpd.GeoDataFrame(pd.concat(frames, ignore_index=True), geometry="geometry", crs=frames[0].crs)
+        source = store_dir
+    elif os.path.exists(shapefile):
+        try:
+            gdf = gpd.read_file(shapefile, columns=VILLAGE_COLUMNS)
+        except Exception as e:
+            logger.warning(f"⚠ Shapefile desa tidak bisa dibaca ({shapefile}): {e}")
+            return None
+        source = shapefile
+    else:
+        logger.warning(f"⚠ Data desa tidak ditemukan ({store_dir}, {shapefile})")
+        return None
+
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+    index = PolygonIndex(gdf.geometry.values, {field: gdf[column].to_numpy()
+                                                for field, column in VILLAGE_FIELDS.items()})
+    logger.info(f"✓ {len(index):,} polygon desa dari {source} ({time.time() - start:.1f}s)")
+    return index
+
+
+def load_province_index(path: str) -> Optional[PolygonIndex]:
+    """Polygon provinsi dari GeoJSON frontend (properti PROVINSI)"""
+    import geopandas as gpd
+
+    if not os.path.exists(path):
+        logger.warning(f"⚠ Data provinsi tidak ditemukan ({path})")
+        return None
+    start = time.time()
+    gdf = gpd.read_file(path)
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+    index = PolygonIndex(gdf.geometry.values, {"provinsi": gdf["PROVINSI"].to_numpy()})
+    logger.info(f"✓ {len(index)} polygon provinsi dari {path} ({time.time() - start:.1f}s)")
+    return index
+
+
+class ReverseGeocoder:
+    """Lookup titik -> desa/kecamatan/kabupaten/provinsi"""
+
+    def __init__(self, villages: Optional[PolygonIndex], provinces: Optional[PolygonIndex]):
+        self.villages = villages
+        self.provinces = provinces
+
+    @property
+    def ready(self) -> bool:
+        return self.villages is not None or self.provinces is not None
+
+    def locate_many(self, lon: Sequence[float], lat: Sequence[float]) -> Dict[str, List]:
+        """
+        Lookup vektor untuk banyak titik sekaligus
+
+        Returns:
+            Dict kolom (list sepanjang jumlah titik): kdepum, desa, kecamatan,
+            kabupaten, provinsi dan level ("desa", "provinsi" atau None)
+        """
+        points = shapely.points(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+        n = len(points)
+        columns = {field: np.full(n, None, dtype=object) for field in RESULT_FIELDS}
+        level = np.full(n, None, dtype=object)
+
+        pending = np.arange(n)
+        if self.villages is not None:
+            hit = self.villages.query_points(points)
+            found = hit >= 0
+            for field in RESULT_FIELDS:
+                columns[field][found] = self.villages.attributes[field][hit[found]]
+            level[found] = "desa"
+            pending = np.flatnonzero(~found)
+
+        if self.provinces is not None and len(pending):
+            hit = self.provinces.query_points(points[pending])
+            found = hit >= 0
+            columns["provinsi"][pending[found]] = self.provinces.attributes["provinsi"][hit[found]]
+            level[pending[found]] = "provinsi"
+
+        result = {field: values.tolist() for field, values in columns.items()}
+        result["level"] = level.tolist()
+        return result
+
+    def locate(self, lon: float, lat: float) -> Dict:
+        """Lookup satu titik"""
+        columns = self.locate_many([lon], [lat])
+        return {field: values[0] for field, values in columns.items()}
@@ -0,0 +1,232 @@
+"""
+Geo Service
+FastAPI service for reverse geocoding (point -> desa/kecamatan/kabupaten/provinsi)
+
+Polygon desa BIG dan provinsi dimuat sekali saat startup ke STRtree
+(geo_index.py). Lookup satu titik di bawah 1 ms; batch ribuan titik
+dijawab dengan satu query vektor.
+
+Layer desa transmigrasi (transmigrasi_index.py) disajikan per viewport:
+hanya feature yang beririsan dengan bbox, pada level simplifikasi untuk
+zoom peta, dengan batas ukuran respons.
+
+Batas kecamatan/kabupaten/provinsi (boundary_index.py) dibaca dari cache
+hasil dissolve scripts/admin_boundaries.py, tidak dihitung saat request.
+
+Lewat API gateway: /api/geo/* -> /api/* (SERVICES.GEO, port 3004)
+"""
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from typing import List, Optional
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+from boundary_index import ADMIN_LEVELS, BoundaryStore
+from geo_index import ReverseGeocoder, load_province_index, load_village_index
+from transmigrasi_index import FeatureIndex, load_transmigrasi_index
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="Geo Service",
+    description="Reverse geocoding over BIG village and province boundaries",
+    version="1.0.0"
+)
+
+# CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Default: layout repo (data/ dan frontend/ di root); di container di-mount ke /data
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+STORE_DIR = os.getenv("GEO_STORE_DIR", os.path.join(ROOT_DIR, "data", "cache", "desa-geoparquet"))
+SHAPEFILE_PATH = os.getenv("GEO_SHAPEFILE", os.path.join(
+    ROOT_DIR, "data", "batas desa", "Batas_Wilayah_KelurahanDesa_10K_AR.shp"))
+PROVINCES_PATH = os.getenv("GEO_PROVINCES_PATH", os.path.join(ROOT_DIR, "frontend", "provinsi.json"))
+TEMPLATE_PATH = os.getenv("GEO_TEMPLATE_PATH", os.path.join(ROOT_DIR, "data", "kawasan-transmigrasi.json"))
+TRANSMIGRASI_PATH = os.getenv("GEO_TRANSMIGRASI_PATH", os.path.join(
+    ROOT_DIR, "frontend", "data-kawasan-transmigrasi.geojson"))
+BOUNDARY_DIR = os.getenv("GEO_BOUNDARY_DIR", os.path.join(ROOT_DIR, "data", "cache", "admin-boundaries"))
+
+# Batas jumlah titik per request batch
+MAX_BATCH_POINTS = int(os.getenv("MAX_BATCH_POINTS", 200_000))
+
+# Batas respons viewport transmigrasi (jumlah feature dan byte GeoJSON)
+MAX_VIEWPORT_FEATURES = int(os.getenv("MAX_VIEWPORT_FEATURES", 2000))
+MAX_VIEWPORT_BYTES = int(os.getenv("MAX_VIEWPORT_BYTES", 2 * 1024 * 1024))
+
+geocoder = ReverseGeocoder(None, None)
+transmigrasi: Optional[FeatureIndex] = None
+boundaries = BoundaryStore(BOUNDARY_DIR)
+loaded_at: Optional[str] = None
+
+
+class BatchLocateRequest(BaseModel):
+    lat: List[float]
+    lon: List[float]
+
+
+@app.get("/")
+def root():
+    """Root endpoint"""
+    return {
+        "service": "Geo Service",
+        "version": "1.0.0",
+        "status": "running",
+        "endpoints": {
+            "health": "/health",
+            "locate": "/api/locate?lat=&lon=",
+            "locate_batch": "POST /api/locate/batch {lat: [...], lon: [...]}",
+            "transmigrasi": "/api/transmigrasi?bbox=minLon,minLat,maxLon,maxLat&zoom=",
+            "boundaries": "/api/boundaries/{kecamatan|kabupaten|provinsi}?zoom=&provinsi="
+        }
+    }
+
+
+@app.get("/health")
+def health_check():
+    """Health check endpoint"""
+    return {
+        "status": "healthy" if geocoder.ready else "loading",
+        "service": "geo",
+        "villages": len(geocoder.villages) if geocoder.villages is not None else 0,
+        "provinces": len(geocoder.provinces) if geocoder.provinces is not None else 0,
+        "transmigrasi": len(transmigrasi) if transmigrasi is not None else 0,
+        "boundaries": boundaries.available,
+        "loaded_at": loaded_at,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.on_event("startup")
+def load_indexes():
+    """Muat polygon desa, provinsi dan desa transmigrasi, bangun STRtree (sekali per proses)"""
+    global geocoder, transmigrasi, loaded_at
+    geocoder = ReverseGeocoder(load_village_index(STORE_DIR, SHAPEFILE_PATH),
+                               load_province_index(PROVINCES_PATH))
+    try:
+        transmigrasi = load_transmigrasi_index(STORE_DIR, SHAPEFILE_PATH, TEMPLATE_PATH, TRANSMIGRASI_PATH)
+    except Exception as e:
+        # Layer viewport opsional: reverse geocoding tetap jalan, /api/transmigrasi 503
+        logger.error(f"❌ Layer transmigrasi gagal dimuat: {e}")
+        transmigrasi = None
+    loaded_at = datetime.now().isoformat()
+    if not geocoder.ready:
+        logger.error("❌ Tidak ada data polygon; semua lookup akan gagal")
+
+
+def _require_index():
+    if not geocoder.ready:
+        raise HTTPException(status_code=503, detail="Geo index not loaded")
+
+
+@app.get("/api/locate")
+def locate(lat: float = Query(..., ge=-90, le=90), lon: float = Query(..., ge=-180, le=180)):
+    """Desa/kecamatan/kabupaten/provinsi untuk satu titik"""
+    _require_index()
+    result = geocoder.locate(lon, lat)
+    return {
+        "success": True,
+        "lat": lat,
+        "lon": lon,
+        "found": result["level"] is not None,
+        **result
+    }
+
+
+@app.post("/api/locate/batch")
+def locate_batch(request: BatchLocateRequest):
+    """
+    Lookup banyak titik sekaligus
+
+    Input dan output kolumnar (list paralel) supaya ratusan ribu titik
+    tidak perlu diserialisasi sebagai objek per titik.
+    """
+    _require_index()
+    if len(request.lat) != len(request.lon):
+        raise HTTPException(status_code=400, detail="lat and lon must have the same length")
+    if len(request.lat) > MAX_BATCH_POINTS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_BATCH_POINTS} points)")
+
+    start = time.perf_counter()
+    result = geocoder.locate_many(request.lon, request.lat)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    return JSONResponse({
+        "success": True,
+        "count": len(request.lat),
+        "found": sum(level is not None for level in result["level"]),
+        "elapsed_ms": round(elapsed_ms, 2),
+        **result
+    })
+
+
+def _parse_bbox(bbox: str):
+    """'minLon,minLat,maxLon,maxLat' -> tuple float"""
+    try:
+        values = tuple(float(v) for v in bbox.split(","))
+    except ValueError:
+        values = ()
+    if len(values) != 4 or values[0] > values[2] or values[1] > values[3]:
+        raise HTTPException(status_code=400, detail="bbox must be minLon,minLat,maxLon,maxLat")
+    return values
+
+
+@app.get("/api/transmigrasi")
+def transmigrasi_viewport(bbox: Optional[str] = None, zoom: int = Query(5, ge=0, le=22)):
+    """
+    FeatureCollection desa transmigrasi di dalam viewport
+
+    Geometri disimplifikasi sesuai zoom; respons dipotong (polygon terbesar
+    didahulukan) jika melebihi MAX_VIEWPORT_FEATURES / MAX_VIEWPORT_BYTES,
+    ditandai dengan "truncated": true.
+    """
+    if transmigrasi is None:
+        raise HTTPException(status_code=503, detail="Transmigrasi index not loaded")
+    box = _parse_bbox(bbox) if bbox else None
+
+    features, info = transmigrasi.query(box, zoom, MAX_VIEWPORT_FEATURES, MAX_VIEWPORT_BYTES)
+    header = json.dumps({
+        "type": "FeatureCollection",
+        "query_bbox": list(box) if box else None,
+        "zoom": zoom,
+        "total": len(transmigrasi),
+        "count": len(features),
+        **info
+    }, separators=(",", ":"))
+    # Feature sudah berupa string GeoJSON; sambung tanpa parse ulang
+    body = header[:-1] + ',"features":[' + ",".join(features) + "]}"
+    return Response(content=body, media_type="application/geo+json")
+
+
+@app.get("/api/boundaries/{level}")
+def admin_boundaries(level: str, zoom: int = Query(5, ge=0, le=22), provinsi: Optional[str] = None):
+    """
+    FeatureCollection batas kecamatan/kabupaten/provinsi (sudah di-dissolve)
+
+    `provinsi` bisa berisi beberapa nama dipisah koma.
+    """
+    if level not in ADMIN_LEVELS:
+        raise HTTPException(status_code=404, detail=f"Unknown level (use {', '.join(ADMIN_LEVELS)})")
+    if not boundaries.available:
+        raise HTTPException(status_code=503, detail="Admin boundaries not built (run scripts/admin_boundaries.py)")
+
+    provinces = [p for p in provinsi.split(",") if p.strip()] if provinsi else None
+    features, info = boundaries.query(level, zoom, provinces)
+    header = json.dumps({"type": "FeatureCollection", "zoom": zoom, "count": len(features), **info},
+                        separators=(",", ":"))
+    body = header[:-1] + ',"features":[' + ",".join(features) + "]}"
+    return Response(content=body, media_type="application/geo+json")
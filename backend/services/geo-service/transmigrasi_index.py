@@ -0,0 +1,189 @@
+"""
+Transmigration village viewport index
+Bbox queries over transmigration village polygons with per-zoom LOD
+
+Polygon desa transmigrasi dimuat sekali, di-index dengan STRtree, dan
+setiap level LOD (toleransi simplifikasi + presisi koordinat per rentang
+zoom dari backend/shared/lod.py, sama dengan scripts/generate-lod-pyramid.py)
+di-serialisasi ke string GeoJSON saat startup. Query viewport hanya: traversal tree untuk
+bbox, test intersects, lalu menyambung string feature yang sudah jadi
+sampai batas jumlah feature / byte respons.
+
+Sumber (urutan prioritas):
+- GeoParquet store (scripts/village_store.py) difilter dengan kode KDEPUM
+  di data/kawasan-transmigrasi.json -> geometri detail penuh
+- shapefile BIG dengan filter yang sama
+- frontend/data-kawasan-transmigrasi.geojson (sudah disimplifikasi)
+"""
+
+import json
+import logging
+import math
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+
+# Modul bersama (backend/shared): LOD_LEVELS dan prepare_geometries yang sama
+# dengan script batch (generate-lod-pyramid.py, admin_boundaries.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+from lod import LOD_LEVELS, lod_for_zoom, prepare_geometries  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+SOURCE_COLUMNS = ["KDEPUM", "KDEBPS", "WADMKD", "NAMOBJ", "WADMKC", "WADMKK", "WADMPR", "LUAS"]
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    text = str(value)
+    return "" if text in ("nan", "NaN", "None") else text
+
+
+def _area(value) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return 0 if math.isnan(number) or math.isinf(number) else round(number, 2)
+
+
+def village_properties(row) -> Dict:
+    """Properti feature seperti frontend/data-kawasan-transmigrasi.geojson"""
+    return {
+        "kode_desa": _text(row.KDEPUM) or _text(row.KDEBPS),
+        "nama_desa": _text(row.WADMKD) or _text(row.NAMOBJ),
+        "kecamatan": _text(row.WADMKC),
+        "kabupaten": _text(row.WADMKK),
+        "provinsi": _text(row.WADMPR),
+        "luas_km2": _area(row.LUAS),
+    }
+
+
+class FeatureIndex:
+    """STRtree + string Feature GeoJSON per level LOD"""
+
+    def __init__(self, geoms, properties: Sequence[Dict]):
+        self.geoms = shapely.force_2d(np.asarray(geoms))
+        self.tree = shapely.STRtree(self.geoms)
+        # Urutan prioritas saat respons dipotong: polygon terbesar dulu
+        self.area = shapely.area(self.geoms)
+
+        props = [json.dumps(p, ensure_ascii=False, separators=(",", ":")) for p in properties]
+        self.features = {}
+        for level in LOD_LEVELS:
+            geometries = shapely.to_geojson(prepare_geometries(self.geoms, level["tolerance"], level["precision"]))
+            self.features[level["level"]] = [
+                '{"type":"Feature","properties":' + p + ',"geometry":' + g + '}'
+                for p, g in zip(props, geometries)
+            ]
+
+    def __len__(self):
+        return len(self.geoms)
+
+    def query(self, bbox: Optional[Tuple[float, float, float, float]], zoom: int,
+              max_features: int, max_bytes: int) -> Tuple[List[str], Dict]:
+        """
+        Feature (string GeoJSON) yang beririsan dengan bbox pada LOD zoom
+
+        Returns:
+            (list string Feature, info: lod, min_zoom, max_zoom, matched, truncated)
+        """
+        level = lod_for_zoom(zoom)
+        if bbox is None:
+            hits = np.arange(len(self.geoms))
+        else:
+            hits = self.tree.query(shapely.box(*bbox), predicate="intersects")
+        hits = hits[np.argsort(-self.area[hits], kind="stable")]
+
+        strings = self.features[level["level"]]
+        selected, size = [], 0
+        for i in hits[:max_features]:
+            feature = strings[i]
+            if size + len(feature) + 1 > max_bytes:
+                break
+            selected.append(feature)
+            size += len(feature) + 1
+
+        info = {
+            "lod": level["level"],
+            "min_zoom": level["min_zoom"],
+            "max_zoom": level["max_zoom"],
+            "matched": len(hits),
+            "truncated": len(selected) < len(hits),
+        }
+        return selected, info
+
+
+def _template_codes(template_path: str) -> set:
+    """Kode KDEPUM (tanpa titik/spasi) dari data/kawasan-transmigrasi.json"""
+    with open(template_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    codes = set()
+    for desa in data.get("desa_transmigrasi", []):
+        code = str(desa.get("kdepum", desa.get("kdebps", ""))).replace(".", "").replace(" ", "").strip()
+        if code and code != "nan":
+            codes.add(code)
+    return codes
+
+
+def _read_villages(store_dir: str, shapefile: str):
+    """Atribut + geometri desa dari store atau shapefile, None jika tidak ada"""
+    import geopandas as gpd
+    import pandas as pd
+
+    manifest_path = os.path.join(store_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        frames = [gpd.read_parquet(os.path.join(store_dir, part["file"]), columns=SOURCE_COLUMNS + ["geometry"])
+                  for part in manifest["partitions"].values()]
+        return gpd.GeoDataFrame(pd.concat(frames, ignore_index=True), geometry="geometry",
+                                crs=frames[0].crs), store_dir
+    if os.path.exists(shapefile):
+        try:
+            return gpd.read_file(shapefile, columns=SOURCE_COLUMNS), shapefile
+        except Exception as e:
+            logger.warning(f"⚠ Shapefile desa tidak bisa dibaca ({shapefile}): {e}")
+    return None, None
+
+
+def _build_index(gdf, properties: Sequence[Dict], source: str, start: float) -> FeatureIndex:
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+    index = FeatureIndex(gdf.geometry.values, properties)
+    logger.info(f"✓ {len(index)} desa transmigrasi dari {source} ({time.time() - start:.1f}s)")
+    return index
+
+
+def load_transmigrasi_index(store_dir: str, shapefile: str, template_path: str,
+                            geojson_path: str) -> Optional[FeatureIndex]:
+    """Layer desa transmigrasi dari store/shapefile + template, fallback ke GeoJSON frontend"""
+    import geopandas as gpd
+
+    start = time.time()
+    if os.path.exists(template_path):
+        source = store_dir
+        try:
+            villages, source = _read_villages(store_dir, shapefile)
+            if villages is not None:
+                codes = villages["KDEPUM"].astype(str).str.replace(r"[.\s]", "", regex=True)
+                gdf = villages[codes.isin(_template_codes(template_path)).to_numpy()]
+                if len(gdf):
+                    properties = [village_properties(row) for row in gdf.itertuples(index=False)]
+                    return _build_index(gdf, properties, source, start)
+        except Exception as e:
+            logger.warning(f"⚠ Layer transmigrasi dari {source} gagal dimuat, fallback ke GeoJSON: {e}")
+
+    if not os.path.exists(geojson_path):
+        logger.warning(f"⚠ Data desa transmigrasi tidak ditemukan ({template_path}, {geojson_path})")
+        return None
+    gdf = gpd.read_file(geojson_path)
+    columns = [c for c in gdf.columns if c != "geometry"]
+    properties = [{c: (v.item() if hasattr(v, "item") else v) for c, v in zip(columns, row)}
+                  for row in gdf[columns].itertuples(index=False)]
+    return _build_index(gdf, properties, geojson_path, start)
@@ -15,6 +15,7 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 import os
+import sys
 import httpx
 import json
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
@@ -22,6 +23,10 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import redis
 
+# Modul bersama antar service (backend/shared)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+from synthetic import SyntheticGenerator
+
 # ==========================================
 # APP INITIALIZATION
 # ==========================================
@@ -129,53 +134,21 @@ MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct',
 # MOCK DATA GENERATION
 # ==========================================
 
+synthetic = SyntheticGenerator(seed=int(os.getenv("SYNTHETIC_SEED", 42)))
+
 def generate_production_data(year: int = 2023):
-    """Generate realistic production data"""
-    import random
+    """Generate realistic production data (deterministic per year)"""
+    codes = list(PROVINCE_MAPPING)
+    production = synthetic.production_series(codes, [year])[0].tolist()
     
-    data = []
-    production_ranges = {
-        'jawa': (500000, 2000000),
-        'sumatera': (300000, 1500000),
-        'sulawesi': (200000, 800000),
-        'kalimantan': (100000, 500000),
-        'others': (50000, 300000)
-    }
-    
-    for code, name in PROVINCE_MAPPING.items():
-        # Determine region
-        if code in ['31', '32', '33', '34', '35', '36']:
-            region = 'jawa'
-        elif code in ['11', '12', '13', '14', '15', '16', '17', '18', '19', '21']:
-            region = 'sumatera'
-        elif code in ['71', '72', '73', '74', '75', '76']:
-            region = 'sulawesi'
-        elif code in ['61', '62', '63', '64', '65']:
-            region = 'kalimantan'
-        else:
-            region = 'others'
-        
-        min_prod, max_prod = production_ranges[region]
-        
-        monthly_data = {}
-        for month in MONTHS:
-            # Add seasonal variation
-            seasonal_factor = 1.0
-            if month in ['may', 'jun', 'jul']:  # Harvest season
-                seasonal_factor = 1.3
-            elif month in ['nov', 'dec', 'jan']:  # Planting season
-                seasonal_factor = 0.7
-            
-            production = random.randint(min_prod, max_prod) * seasonal_factor
-            monthly_data[month] = round(production)
-        
-        data.append({
+    return [
+        {
             'kode_prov': code,
-            'provinsi': name,
-            **monthly_data
-        })
-    
-    return data
+            'provinsi': PROVINCE_MAPPING[code],
+            **dict(zip(MONTHS, monthly_data))
+        }
+        for code, monthly_data in zip(codes, production)
+    ]
 
 # ==========================================
 # ROUTES
@@ -0,0 +1,75 @@
+"""
+Level of detail (LOD) geometri peta
+Shared zoom bands and geometry preparation for map layers
+
+Satu definisi untuk script batch (scripts/geojson_writer.py,
+generate-lod-pyramid.py, admin_boundaries.py) dan geo-service
+(transmigrasi_index.py, boundary_index.py), supaya file LOD yang dibangun
+batch dan yang disajikan service memakai rentang zoom yang sama.
+
+Hanya butuh numpy + shapely 2.0 (versi yang di-pin geo-service).
+"""
+
+import numpy as np
+import shapely
+
+# Level detail per rentang zoom Leaflet. Toleransi (derajat) kira-kira satu
+# piksel di zoom maksimum band (360 / 256 / 2^zoom); level terakhir tanpa
+# simplifikasi.
+LOD_LEVELS = [
+    {"level": 0, "min_zoom": 0, "max_zoom": 6, "tolerance": 0.005, "precision": 3},
+    {"level": 1, "min_zoom": 7, "max_zoom": 9, "tolerance": 0.001, "precision": 4},
+    {"level": 2, "min_zoom": 10, "max_zoom": 12, "tolerance": 0.0002, "precision": 5},
+    {"level": 3, "min_zoom": 13, "max_zoom": 22, "tolerance": 0.0, "precision": 6},
+]
+
+# Level batas administrasi di atas desa, dari terkecil ke terbesar
+ADMIN_LEVELS = ["kecamatan", "kabupaten", "provinsi"]
+
+
+def lod_for_zoom(zoom):
+    """Level LOD untuk zoom (di luar rentang -> level terdekat)"""
+    for level in LOD_LEVELS:
+        if level["min_zoom"] <= zoom <= level["max_zoom"]:
+            return level
+    return LOD_LEVELS[0] if zoom < LOD_LEVELS[0]["min_zoom"] else LOD_LEVELS[-1]
+
+
+def polygonal(geom):
+    """Valid + hanya bagian polygon (make_valid bisa menghasilkan garis/titik dari ring yang kolaps)"""
+    if not geom.is_valid:
+        geom = shapely.make_valid(geom)
+    if geom.geom_type in ("Polygon", "MultiPolygon"):
+        return geom
+    parts = [p for p in shapely.get_parts(geom) if p.geom_type in ("Polygon", "MultiPolygon")]
+    return shapely.union_all(parts) if parts else shapely.Polygon()
+
+
+def prepare_geometries(geoms, tolerance, precision):
+    """
+    Simplify, drop Z dan quantize koordinat untuk satu array geometri (vektor)
+
+    Koordinat di-snap ke grid 10^-precision derajat oleh GEOS untuk seluruh
+    array sekaligus; titik duplikat dan ring yang kolaps dibuang sehingga
+    hasilnya valid (geometri yang invalid diperbaiki dulu, hanya bagian
+    polygon yang disimpan). Geometri kecil yang kolaps seluruhnya hanya
+    dibulatkan per titik agar feature tidak hilang. precision=None: tanpa
+    quantize.
+    """
+    geoms = np.asarray(geoms)
+    if tolerance:
+        geoms = shapely.simplify(geoms, tolerance, preserve_topology=True)
+    # Leaflet tidak butuh Z
+    geoms = shapely.force_2d(geoms)
+    if precision is not None:
+        # set_precision butuh input valid
+        invalid = ~shapely.is_valid(geoms)
+        if invalid.any():
+            geoms[invalid] = [polygonal(g) for g in geoms[invalid]]
+        grid = 10.0 ** -precision
+        snapped = shapely.set_precision(geoms, grid)
+        collapsed = shapely.is_empty(snapped) & ~shapely.is_empty(geoms)
+        if collapsed.any():
+            snapped[collapsed] = shapely.set_precision(geoms[collapsed], grid, mode="pointwise")
+        geoms = snapped
+    return geoms
@@ -0,0 +1,165 @@
+"""
+Synthetic Data Generator
+Seeded, vectorized generator for price and production series
+
+Dipakai bersama oleh bi-scraper-service (fallback harga) dan
+production-service (data produksi), serta sebagai sumber fixture untuk
+benchmark/load test. Faktor regional, musiman, dan lokasi sama dengan
+generator lama per-sel, tapi seluruh blok tahun × provinsi × komoditas
+× bulan dihitung sekaligus dengan NumPy.
+
+Reproducible: argumen dan seed yang sama selalu menghasilkan array yang
+sama. Setiap (tahun, komoditas) punya stream acak sendiri, sehingga
+satu komoditas yang di-generate sendiri identik dengan irisannya di
+generate massal.
+
+Usage:
+    python synthetic.py --years 1990-2030 --commodities 10
+"""
+
+import argparse
+import time
+import zlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun",
+          "jul", "aug", "sep", "oct", "nov", "dec"]
+
+# Harga: panen raya (Mar-Apr, Sep-Oct) turun, paceklik (Jan-Feb, Jul-Aug) naik
+PRICE_SEASONAL_FACTORS = np.array([1.05, 1.05, 0.95, 0.95, 1.0, 1.0,
+                                   1.05, 1.05, 0.95, 0.95, 1.0, 1.0])
+
+# Produksi: panen (May-Jul) naik, tanam (Nov-Jan) turun
+PRODUCTION_SEASONAL_FACTORS = np.array([0.7, 1.0, 1.0, 1.0, 1.3, 1.3,
+                                        1.3, 1.0, 1.0, 1.0, 0.7, 0.7])
+
+# Rentang produksi bulanan (ton) per region
+PRODUCTION_RANGES = {
+    "jawa": (500000, 2000000),
+    "sumatera": (300000, 1500000),
+    "sulawesi": (200000, 800000),
+    "kalimantan": (100000, 500000),
+    "others": (50000, 300000),
+}
+
+# Variasi acak harga ±3%
+PRICE_NOISE = 0.03
+
+
+def location_factors(province_codes: Sequence[str]) -> np.ndarray:
+    """
+    Faktor harga berdasarkan lokasi (biaya logistik)
+    Papua & Maluku lebih mahal, Jawa lebih murah (sentra produksi)
+    """
+    codes = np.asarray([int(c) for c in province_codes])
+    return np.select(
+        [codes >= 91, codes >= 81, codes >= 71, codes >= 61, codes >= 51, codes >= 31],
+        [1.20, 1.12, 1.05, 1.02, 1.00, 0.95],
+        default=0.98,  # Sumatera
+    )
+
+
+def production_region(province_code: str) -> str:
+    """Region produksi dari kode provinsi BPS"""
+    if province_code in ("31", "32", "33", "34", "35", "36"):
+        return "jawa"
+    if province_code in ("11", "12", "13", "14", "15", "16", "17", "18", "19", "21"):
+        return "sumatera"
+    if province_code in ("71", "72", "73", "74", "75", "76"):
+        return "sulawesi"
+    if province_code in ("61", "62", "63", "64", "65"):
+        return "kalimantan"
+    return "others"
+
+
+class SyntheticGenerator:
+    """Generator data sintetis deterministik berbasis NumPy"""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    def _rng(self, year: int, stream: str) -> np.random.Generator:
+        key = [self.seed, int(year), zlib.crc32(stream.encode("utf-8"))]
+        return np.random.default_rng(np.random.SeedSequence(key))
+
+    def price_series(self, base_prices: Dict[str, float], province_codes: Sequence[str],
+                     years: Sequence[int]) -> np.ndarray:
+        """
+        Harga bulanan sintetis
+
+        Args:
+            base_prices: Nama komoditas -> harga dasar nasional (Rp)
+            province_codes: Kode provinsi BPS
+            years: Daftar tahun
+
+        Returns:
+            Array int64 berbentuk (tahun, komoditas, provinsi, 12)
+        """
+        commodities = list(base_prices)
+        base = np.array([base_prices[c] for c in commodities], dtype=np.float64)
+        factors = (base[:, None, None]
+                   * location_factors(province_codes)[None, :, None]
+                   * PRICE_SEASONAL_FACTORS[None, None, :])
+
+        out = np.empty((len(years), len(commodities), len(province_codes), 12), dtype=np.int64)
+        for y, year in enumerate(years):
+            for c, commodity in enumerate(commodities):
+                noise = self._rng(year, f"price:{commodity}").uniform(
+                    1 - PRICE_NOISE, 1 + PRICE_NOISE, size=(len(province_codes), 12))
+                out[y, c] = factors[c] * noise
+        return out
+
+    def production_series(self, province_codes: Sequence[str], years: Sequence[int]) -> np.ndarray:
+        """
+        Produksi bulanan sintetis (ton)
+
+        Returns:
+            Array int64 berbentuk (tahun, provinsi, 12)
+        """
+        ranges = np.array([PRODUCTION_RANGES[production_region(c)] for c in province_codes], dtype=np.int64)
+        low = ranges[:, 0:1]
+        high = ranges[:, 1:2] + 1
+
+        out = np.empty((len(years), len(province_codes), 12), dtype=np.int64)
+        for y, year in enumerate(years):
+            base = self._rng(year, "production").integers(low, high, size=(len(province_codes), 12))
+            out[y] = np.rint(base * PRODUCTION_SEASONAL_FACTORS)
+        return out
+
+
+def _parse_years(value: str) -> List[int]:
+    start, _, end = value.partition("-")
+    return list(range(int(start), int(end or start) + 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic data throughput check")
+    parser.add_argument("--years", default="1990-2030", help="Year range, e.g. 1990-2030")
+    parser.add_argument("--provinces", type=int, default=38)
+    parser.add_argument("--commodities", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    years = _parse_years(args.years)
+    codes = [str(11 + (i % 86)) for i in range(args.provinces)]
+    base_prices = {f"commodity_{i}": 10000 + 1000 * i for i in range(args.commodities)}
+    generator = SyntheticGenerator(seed=args.seed)
+
+    start = time.perf_counter()
+    prices = generator.price_series(base_prices, codes, years)
+    price_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    production = generator.production_series(codes, years)
+    production_elapsed = time.perf_counter() - start
+
+    print(f"Prices:     {prices.size:,} cells in {price_elapsed * 1000:.1f} ms "
+          f"({prices.size / price_elapsed / 1e6:.1f} M cells/s)")
+    print(f"Production: {production.size:,} cells in {production_elapsed * 1000:.1f} ms "
+          f"({production.size / production_elapsed / 1e6:.1f} M cells/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,10 @@ const CONFIG = {
 
     // Kawasan Transmigrasi overlay
     TRANSMIGRASI_GEOJSON_PATH: 'data-kawasan-transmigrasi.geojson',
+    // Viewport API (geo-service): hanya desa di dalam peta, LOD sesuai zoom.
+    // Jika API tidak tersedia, fallback ke GeoJSON statis di atas.
+    TRANSMIGRASI_API_URL: '/api/geo/transmigrasi',
+    TRANSMIGRASI_BBOX_PADDING: 0.5,  // bbox request = viewport + 50% tiap sisi
 
     // Color scales untuk visualisasi
     COLOR_SCALES: {
@@ -175,7 +179,11 @@ const AppState = {
     transmigrasiLayer: null,
     transmigrasiPinLayer: null,
     transmigrasiVisible: false,
-    transmigrasiMode: 'overlay' // 'overlay' or 'pin'
+    transmigrasiMode: 'overlay', // 'overlay' or 'pin'
+    transmigrasiSource: null,    // 'api' (per viewport) or 'static' (GeoJSON penuh)
+    transmigrasiExtent: null,    // bbox + rentang zoom LOD yang sudah dimuat dari API
+    transmigrasiRequest: null,   // AbortController request viewport yang sedang jalan
+    transmigrasiMoveTimer: null
 };
 
 // ==========================================
@@ -1248,6 +1256,9 @@ function initializeMap() {
     // Load transmigrasi data (non-blocking)
     loadTransmigrasiData();
 
+    // Viewport API: muat ulang desa transmigrasi saat peta digeser/di-zoom
+    AppState.map.on('moveend', onTransmigrasiViewportChange);
+
     console.log('Map initialized successfully');
 }
 
@@ -1257,28 +1268,116 @@ function initializeMap() {
 
 /**
  * Load transmigration area GeoJSON data
+ * Pertama coba viewport API (hanya desa yang terlihat); jika gagal,
+ * unduh GeoJSON statis penuh sekali dan berhenti memakai API.
  */
 async function loadTransmigrasiData() {
+    if (AppState.transmigrasiSource !== 'static') {
+        try {
+            await loadTransmigrasiViewport();
+            return;
+        } catch (err) {
+            if (err.name === 'AbortError') return;
+            console.warn('Transmigrasi API unavailable, falling back to static GeoJSON:', err);
+        }
+    }
+
     try {
         const response = await fetch(CONFIG.TRANSMIGRASI_GEOJSON_PATH);
         if (!response.ok) {
             console.warn('Transmigrasi GeoJSON not found:', response.status);
             return;
         }
+        AppState.transmigrasiSource = 'static';
         AppState.transmigrasiData = await response.json();
         const count = AppState.transmigrasiData.features ? AppState.transmigrasiData.features.length : 0;
         console.log(`✓ Transmigrasi data loaded: ${count} desa`);
 
-        // Update count in UI
-        const countEl = document.getElementById('transmigrasiCount');
-        if (countEl) {
-            countEl.textContent = `${count} desa`;
-        }
+        updateTransmigrasiCount(count);
+        refreshTransmigrasiLayers();
     } catch (err) {
         console.warn('Failed to load transmigrasi data:', err);
     }
 }
 
+/**
+ * Load transmigration villages intersecting the current viewport
+ * Request dilewati jika viewport masih di dalam bbox yang sudah dimuat
+ * dan zoom masih di rentang LOD yang sama.
+ */
+async function loadTransmigrasiViewport() {
+    const map = AppState.map;
+    const zoom = map.getZoom();
+    const extent = AppState.transmigrasiExtent;
+    if (extent && !extent.truncated && zoom >= extent.minZoom && zoom <= extent.maxZoom &&
+        extent.bounds.contains(map.getBounds())) {
+        return;
+    }
+
+    const bounds = map.getBounds().pad(CONFIG.TRANSMIGRASI_BBOX_PADDING);
+    const bbox = [
+        Math.max(bounds.getWest(), -180), Math.max(bounds.getSouth(), -90),
+        Math.min(bounds.getEast(), 180), Math.min(bounds.getNorth(), 90)
+    ].map(v => v.toFixed(4)).join(',');
+
+    // Batalkan request viewport sebelumnya yang belum selesai
+    if (AppState.transmigrasiRequest) {
+        AppState.transmigrasiRequest.abort();
+    }
+    const controller = new AbortController();
+    AppState.transmigrasiRequest = controller;
+
+    const response = await fetch(`${CONFIG.TRANSMIGRASI_API_URL}?bbox=${bbox}&zoom=${zoom}`, {
+        signal: controller.signal
+    });
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+    }
+    const data = await response.json();
+    AppState.transmigrasiRequest = null;
+
+    AppState.transmigrasiSource = 'api';
+    AppState.transmigrasiExtent = {
+        bounds: bounds,
+        minZoom: data.min_zoom,
+        maxZoom: data.max_zoom,
+        truncated: data.truncated
+    };
+    AppState.transmigrasiData = data;
+    console.log(`✓ Transmigrasi viewport loaded: ${data.count}/${data.total} desa (LOD ${data.lod}` +
+        `${data.truncated ? ', truncated' : ''})`);
+
+    updateTransmigrasiCount(data.total);
+    refreshTransmigrasiLayers();
+}
+
+/**
+ * Debounced reload on map pan/zoom (viewport API only)
+ */
+function onTransmigrasiViewportChange() {
+    if (AppState.transmigrasiSource !== 'api') return;
+    clearTimeout(AppState.transmigrasiMoveTimer);
+    AppState.transmigrasiMoveTimer = setTimeout(loadTransmigrasiData, 250);
+}
+
+/** Update transmigration village count in UI */
+function updateTransmigrasiCount(count) {
+    const countEl = document.getElementById('transmigrasiCount');
+    if (countEl) {
+        countEl.textContent = `${count} desa`;
+    }
+}
+
+/** Rebuild overlay/pin layers from AppState.transmigrasiData */
+function refreshTransmigrasiLayers() {
+    removeAllTransmigrasiLayers();
+    AppState.transmigrasiLayer = null;
+    AppState.transmigrasiPinLayer = null;
+    if (AppState.transmigrasiVisible) {
+        showActiveTransmigrasiMode();
+    }
+}
+
 /**
  * Create/update transmigration overlay layer
  */
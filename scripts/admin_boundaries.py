@@ -0,0 +1,301 @@
+"""
+Batas kecamatan, kabupaten dan provinsi (dissolve desa BIG)
+===========================================================
+
+Shapefile desa BIG hanya berisi polygon desa dengan atribut WADMKC,
+WADMKK dan WADMPR. Tahap batch ini men-dissolve polygon desa menjadi
+batas administrasi di atasnya sekali saja, lalu menyimpannya di cache
+GeoParquet sehingga drill-down provinsi -> kabupaten -> kecamatan tinggal
+membaca file kecil:
+
+    data/cache/admin-boundaries/
+        manifest.json
+        kecamatan.lod0.parquet ... kecamatan.lod3.parquet
+        kabupaten.lod0.parquet ... kabupaten.lod3.parquet
+        provinsi.lod0.parquet  ... provinsi.lod3.parquet
+
+- Setiap partisi provinsi GeoParquet store (village_store.py) diproses
+  satu worker di process pool (provinsi terbesar dulu): geometri invalid
+  diperbaiki dengan make_valid, lalu unary_union per kecamatan. Hasil
+  union dipastikan valid dan hanya berisi polygon.
+- Level LOD sama dengan generate-lod-pyramid.py (LOD_LEVELS di
+  backend/shared/lod.py). Simplifikasi topologis: seluruh kecamatan
+  nasional disederhanakan sebagai satu coverage (shapely.coverage_simplify,
+  Visvalingam-Whyatt), jadi border bersama dua kecamatan disederhanakan
+  sekali dan tidak ada celah/tumpang tindih antar tetangga. Koordinat
+  lalu dibulatkan per rentang zoom, dan kabupaten = union kecamatan,
+  provinsi = union kabupaten dari geometri LOD yang sama, sehingga batas
+  di semua level berimpit. Butuh shapely >= 2.1.
+- Atribut: nama wilayah per level, kode (prefix KDEPUM terbanyak,
+  mis. 52.07.04), jumlah_desa, luas_km2 (jumlah LUAS desa).
+
+Cache dibangun ulang hanya jika signature shapefile di manifest store
+berubah (atau --force).
+
+Usage:
+    python scripts/admin_boundaries.py
+    python scripts/admin_boundaries.py --workers 4 --force
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from geojson_writer import LOD_LEVELS, prepare_geometries
+from village_store import SHAPEFILE_PATH, STORE_DIR, ensure_store
+
+# backend/shared sudah ada di sys.path lewat geojson_writer
+from lod import ADMIN_LEVELS, polygonal  # noqa: E402
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+BOUNDARY_DIR = os.path.join(ROOT_DIR, "data", "cache", "admin-boundaries")
+
+# Naikkan jika layout/atribut cache berubah
+# 2: simplifikasi coverage, level di atas kecamatan diturunkan per LOD
+BOUNDARY_VERSION = 2
+
+# Kolom nama per level (hierarki wilayah di atasnya ikut disimpan)
+LEVEL_COLUMNS = {
+    "kecamatan": ["provinsi", "kabupaten", "kecamatan"],
+    "kabupaten": ["provinsi", "kabupaten"],
+    "provinsi": ["provinsi"],
+}
+
+# Toleransi coverage_simplify (Visvalingam-Whyatt, akar luas segitiga) = faktor x
+# toleransi LOD (jarak Douglas-Peucker); dengan faktor 2 jumlah vertex sebanding
+# dengan simplify biasa pada toleransi yang sama
+COVERAGE_TOLERANCE_FACTOR = 2.0
+
+# Panjang prefix KDEPUM (format 'PP.KK.CC.DDDD') untuk kode wilayah
+CODE_LENGTH = {"kecamatan": 8, "kabupaten": 5, "provinsi": 2}
+
+SOURCE_COLUMNS = ['KDEPUM', 'WADMKC', 'WADMKK', 'WADMPR', 'LUAS']
+
+
+def _area_code(codes, length):
+    """Prefix kode yang paling sering muncul di grup (kosong jika tidak ada)"""
+    prefixes = codes.str[:length]
+    prefixes = prefixes[prefixes.str.len() == length]
+    return prefixes.mode().iloc[0] if len(prefixes) else ''
+
+
+def dissolve_partition(path):
+    """
+    Worker: dissolve satu partisi provinsi ke semua level administrasi
+
+    Hanya kecamatan yang di-union di sini; geometri level di atasnya
+    diturunkan per LOD dari kecamatan yang sudah disimplifikasi
+    (dissolve_layer).
+
+    Returns:
+        Dict level -> (DataFrame atribut, list WKB geometri atau None)
+    """
+    import geopandas as gpd
+
+    gdf = gpd.read_parquet(path, columns=SOURCE_COLUMNS + ['geometry'])
+    geoms = shapely.force_2d(np.asarray(gdf.geometry.values))
+    invalid = ~shapely.is_valid(geoms)
+    if invalid.any():
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+
+    frame = pd.DataFrame({
+        "provinsi": gdf['WADMPR'].fillna('').astype(str).str.strip(),
+        "kabupaten": gdf['WADMKK'].fillna('').astype(str).str.strip(),
+        "kecamatan": gdf['WADMKC'].fillna('').astype(str).str.strip(),
+        "kode": gdf['KDEPUM'].fillna('').astype(str).str.strip(),
+        "jumlah_desa": 1,
+        "luas_km2": pd.to_numeric(gdf['LUAS'], errors='coerce').fillna(0.0),
+    })
+
+    results = {}
+    for level in ADMIN_LEVELS:
+        keys = LEVEL_COLUMNS[level]
+        rows, unions = [], []
+        for key, positions in frame.groupby(keys, sort=True).indices.items():
+            key = key if isinstance(key, tuple) else (key,)
+            group = frame.iloc[positions]
+            rows.append({
+                **dict(zip(keys, key)),
+                "kode": _area_code(group['kode'], CODE_LENGTH[level]),
+                "jumlah_desa": int(group['jumlah_desa'].sum()),
+                "luas_km2": round(float(group['luas_km2'].sum()), 2),
+            })
+            if geoms is not None:
+                unions.append(polygonal(shapely.union_all(geoms[positions])))
+
+        # Atribut level berikutnya diagregasi dari hasil level ini
+        frame = pd.DataFrame(rows)
+        wkbs = shapely.to_wkb(np.asarray(unions, dtype=object)).tolist() if geoms is not None else None
+        results[level] = (frame[keys + ["kode", "jumlah_desa", "luas_km2"]], wkbs)
+        geoms = None
+    return results
+
+
+def simplify_coverage(geoms, tolerance, precision):
+    """
+    Simplifikasi topologis satu coverage polygon (mis. semua kecamatan)
+
+    Edge bersama disederhanakan sekali untuk kedua polygon di sisinya,
+    lalu koordinat di-snap ke grid 10^-precision (vertex bersama jatuh ke
+    titik grid yang sama).
+    """
+    geoms = np.array(geoms, dtype=object)
+    if tolerance:
+        nonempty = ~shapely.is_empty(geoms)
+        geoms[nonempty] = shapely.coverage_simplify(geoms[nonempty], tolerance * COVERAGE_TOLERANCE_FACTOR)
+    return prepare_geometries(geoms, 0, precision)
+
+
+def dissolve_layer(frame, geoms, parent_frame, level, precision):
+    """Geometri tiap baris parent_frame = union baris frame dengan nama wilayah yang sama"""
+    keys = LEVEL_COLUMNS[level]
+    groups = {(k if isinstance(k, tuple) else (k,)): positions
+              for k, positions in frame.groupby(keys, sort=False).indices.items()}
+    grid = 10.0 ** -precision
+    return np.array([polygonal(shapely.union_all(geoms[groups[tuple(key)]], grid_size=grid))
+                     for key in parent_frame[keys].itertuples(index=False, name=None)], dtype=object)
+
+
+def read_boundary_manifest(output_dir=BOUNDARY_DIR):
+    path = os.path.join(output_dir, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_boundaries(shp_path=SHAPEFILE_PATH, store_dir=STORE_DIR, output_dir=BOUNDARY_DIR, workers=None):
+    """Dissolve semua provinsi paralel, tulis setiap level x LOD (dir sementara lalu di-rename)"""
+    import geopandas as gpd
+
+    store = ensure_store(shp_path, store_dir)
+    start = time.time()
+
+    # Provinsi dengan desa terbanyak disubmit dulu agar worker seimbang
+    partitions = sorted(store["partitions"].values(), key=lambda p: -p["rows"])
+    paths = [os.path.join(store_dir, p["file"]) for p in partitions]
+    print(f"Dissolve {store['rows']:,} desa dari {len(paths)} provinsi...")
+
+    collected = {level: [] for level in ADMIN_LEVELS}
+    wkbs = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(dissolve_partition, paths):
+            for level, (frame, _) in result.items():
+                collected[level].append(frame)
+            wkbs.extend(result[ADMIN_LEVELS[0]][1])
+    print(f"Dissolve selesai dalam {time.time() - start:.1f}s")
+
+    frames = {}
+    for level in ADMIN_LEVELS:
+        frame = pd.concat(collected[level], ignore_index=True)
+        order = frame.sort_values(LEVEL_COLUMNS[level], kind="stable").index.to_numpy()
+        frames[level] = frame.iloc[order].reset_index(drop=True)
+        if level == ADMIN_LEVELS[0]:
+            geoms = shapely.from_wkb(wkbs)[order]
+
+    tmp_dir = output_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    files = {level: [] for level in ADMIN_LEVELS}
+    crs = store.get("crs") or "EPSG:4326"
+    for lod in LOD_LEVELS:
+        lod_start = time.time()
+        layer = simplify_coverage(geoms, lod["tolerance"], lod["precision"])
+        for i, level in enumerate(ADMIN_LEVELS):
+            if i:
+                layer = dissolve_layer(frames[ADMIN_LEVELS[i - 1]], layer, frames[level], level, lod["precision"])
+            name = f"{level}.lod{lod['level']}.parquet"
+            path = os.path.join(tmp_dir, name)
+            gpd.GeoDataFrame(frames[level], geometry=layer, crs=crs).to_parquet(path, index=False)
+            files[level].append({"lod": lod["level"], "file": name, "rows": len(frames[level]),
+                                 "bytes": os.path.getsize(path)})
+        print(f"  lod{lod['level']}: {time.time() - lod_start:.1f}s")
+    for level in ADMIN_LEVELS:
+        sizes = ", ".join(f"lod{f['lod']} {f['bytes'] / 1024:.0f} KB" for f in files[level])
+        print(f"  {level}: {len(frames[level]):,} wilayah ({sizes})")
+
+    manifest = {
+        "version": BOUNDARY_VERSION,
+        "source": store["source"],
+        "source_signature": store["source_signature"],
+        "levels": LOD_LEVELS,
+        "simplification": "coverage",
+        "files": files,
+        "built_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(tmp_dir, output_dir)
+    print(f"Cache ditulis: {output_dir} ({time.time() - start:.1f}s)")
+    return manifest
+
+
+def ensure_boundaries(shp_path=SHAPEFILE_PATH, store_dir=STORE_DIR, output_dir=BOUNDARY_DIR,
+                      workers=None, force=False):
+    """Return manifest cache batas wilayah, build ulang jika store desa berubah"""
+    manifest = read_boundary_manifest(output_dir)
+    if manifest and not force:
+        store = ensure_store(shp_path, store_dir)
+        if (manifest.get("version") == BOUNDARY_VERSION
+                and manifest.get("source_signature") == store["source_signature"]
+                and manifest.get("levels") == LOD_LEVELS):
+            return manifest
+        print("Cache batas wilayah kedaluwarsa, build ulang...")
+    return build_boundaries(shp_path, store_dir, output_dir, workers)
+
+
+def load_boundaries(level, lod=0, provinces=None, output_dir=BOUNDARY_DIR):
+    """
+    Batas satu level administrasi sebagai GeoDataFrame
+
+    Args:
+        level: "kecamatan", "kabupaten" atau "provinsi"
+        lod: Nomor level LOD (lod.lod_for_zoom(zoom)["level"] di backend/shared)
+        provinces: Filter nama provinsi (push-down ke reader Parquet)
+    """
+    import geopandas as gpd
+
+    if level not in ADMIN_LEVELS:
+        raise ValueError(f"Level tidak dikenal: {level} (pilih {', '.join(ADMIN_LEVELS)})")
+    path = os.path.join(output_dir, f"{level}.lod{lod}.parquet")
+    filters = [("provinsi", "in", list(provinces))] if provinces else None
+    return gpd.read_parquet(path, filters=filters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dissolve BIG villages into kecamatan/kabupaten/province boundaries")
+    parser.add_argument("--shapefile", default=SHAPEFILE_PATH)
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--output-dir", default=BOUNDARY_DIR)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah core)")
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Admin Boundaries (dissolve desa)")
+    print("=" * 60)
+
+    try:
+        manifest = ensure_boundaries(args.shapefile, args.store, args.output_dir, args.workers, args.force)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    counts = ", ".join(f"{level} {files[0]['rows']:,}" for level, files in manifest["files"].items())
+    print(f"Cache OK ({manifest['built_at']}): {counts}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,468 @@
+"""
+Tabel harga BI (PIHPS) -> JSON historis per tahun
+=================================================
+
+Export "Tabel Harga Berdasarkan Komoditas" dari Bank Indonesia berupa CSV
+lebar dengan separator ';':
+
+    No;Komoditas (Rp);01/2025;02/2025;...
+    I;Semua Provinsi;15,050;15,250;...
+    II;Aceh;13,800;13,750;...
+
+Kolom periode dikenali dari nama header (MM/YYYY) dan baris provinsi dari
+nama provinsinya (PROVINCE_CODES), bukan dari posisi kolom/baris. Baris
+dengan label selain provinsi dan "Semua Provinsi" dianggap judul blok
+komoditas (export multi-komoditas); baris provinsi di bawahnya masuk ke
+komoditas tersebut.
+
+CSV dibaca per blok baris (pandas chunksize, angka "15,050" dan "-"
+diparse oleh parser C), setiap blok di-melt ke format panjang
+(komoditas, provinsi, tahun, bulan, harga), lalu di-pivot sekali menjadi
+struktur JSON historis yang dipakai frontend
+(frontend/data-harga-beras-bi-historical.json).
+
+Update bulanan (update_historical): setiap kolom periode yang sudah
+diproses disimpan fingerprint-nya di data/cache/bi-prices/. Run berikutnya
+hanya membaca header + kolom label, lalu mem-parse kolom bulan baru saja
+(usecols) dan menimpa key bulan tersebut di artifact JSON yang ada, termasuk
+rata-rata nasionalnya. Build penuh dilakukan jika state belum ada, baris
+provinsi/komoditas berubah, atau artifact diubah di luar ETL.
+
+Dipakai oleh transform-bi-csv-correct.py.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+CSV_PATH = os.path.join(ROOT_DIR, "data", "Tabel Harga Berdasarkan Komoditas (1).csv")
+OUTPUT_PATH = os.path.join(ROOT_DIR, "frontend", "data-harga-beras-bi-historical.json")
+STATE_DIR = os.path.join(ROOT_DIR, "data", "cache", "bi-prices")
+
+# Naikkan jika format state/fingerprint berubah
+STATE_VERSION = 1
+
+MONTH_KEYS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+# Nama provinsi di export BI -> kode BPS
+PROVINCE_CODES = {
+    "Aceh": "11", "Sumatera Utara": "12", "Sumatera Barat": "13", "Riau": "14", "Jambi": "15",
+    "Sumatera Selatan": "16", "Bengkulu": "17", "Lampung": "18", "Kepulauan Bangka Belitung": "19",
+    "Kepulauan Riau": "21",
+    "DKI Jakarta": "31", "Jawa Barat": "32", "Jawa Tengah": "33", "DI Yogyakarta": "34", "Jawa Timur": "35",
+    "Banten": "36",
+    "Bali": "51", "Nusa Tenggara Barat": "52", "Nusa Tenggara Timur": "53",
+    "Kalimantan Barat": "61", "Kalimantan Tengah": "62", "Kalimantan Selatan": "63", "Kalimantan Timur": "64",
+    "Kalimantan Utara": "65",
+    "Sulawesi Utara": "71", "Sulawesi Tengah": "72", "Sulawesi Selatan": "73", "Sulawesi Tenggara": "74",
+    "Gorontalo": "75", "Sulawesi Barat": "76",
+    "Maluku": "81", "Maluku Utara": "82",
+    "Papua Barat": "91", "Papua Barat Daya": "92", "Papua": "94", "Papua Selatan": "95",
+    "Papua Tengah": "96", "Papua Pegunungan": "97",
+}
+
+# Label baris rata-rata nasional
+NATIONAL_LABEL = "Semua Provinsi"
+
+# Komoditas untuk export satu komoditas (tanpa baris judul blok)
+DEFAULT_COMMODITY = "Beras (Semua Kualitas)"
+
+METADATA = {
+    "source": "Bank Indonesia - Harga Pangan",
+    "commodity": DEFAULT_COMMODITY,
+    "unit": "Rupiah per Kg",
+    "data_type": "monthly",
+    "note": "Data harga historis dari Pasar Tradisional",
+}
+
+# Baris CSV per chunk (tabel lebar: puluhan tahun x banyak komoditas)
+CHUNK_ROWS = 512
+
+PERIOD_PATTERN = re.compile(r"^\s*(\d{1,2})/(\d{4})\s*$")
+
+
+def _normalize(name):
+    return re.sub(r"\s+", " ", str(name)).strip().lower()
+
+
+_PROVINCE_LOOKUP = {_normalize(name): (code, name) for name, code in PROVINCE_CODES.items()}
+
+
+def read_header(path=CSV_PATH):
+    """
+    Header CSV: (kolom label, {header periode: (tahun, bulan)})
+
+    Kolom label adalah kolom teks terakhir sebelum kolom periode pertama
+    ("Komoditas (Rp)").
+    """
+    header = pd.read_csv(path, sep=";", encoding="utf-8-sig", nrows=0).columns
+    periods = {}
+    for column in header:
+        match = PERIOD_PATTERN.match(column)
+        if match:
+            periods[column] = (int(match.group(2)), int(match.group(1)))
+    if not periods:
+        raise ValueError(f"Tidak ada kolom periode MM/YYYY di {path}")
+    first = min(header.get_loc(c) for c in periods)
+    if first == 0:
+        raise ValueError(f"Kolom label (provinsi/komoditas) tidak ditemukan di {path}")
+    return header[first - 1], periods
+
+
+def read_price_table(path=CSV_PATH, periods=None, chunk_rows=CHUNK_ROWS):
+    """
+    Baca CSV harga BI sebagai tabel panjang
+
+    Args:
+        periods: Header periode yang dibaca (default semua); kolom lain
+            tidak diparse sama sekali (usecols)
+
+    Returns:
+        DataFrame kolom commodity, province_code ('' = nasional),
+        province_name, row (urutan baris di CSV), year, month, price
+        (float, NaN untuk '-' atau kosong)
+    """
+    label_column, all_periods = read_header(path)
+    periods = list(all_periods) if periods is None else [p for p in all_periods if p in set(periods)]
+    year_of = {p: all_periods[p][0] for p in periods}
+    month_of = {p: all_periods[p][1] for p in periods}
+
+    frames = []
+    commodity = DEFAULT_COMMODITY
+    offset = 0
+    reader = pd.read_csv(path, sep=";", encoding="utf-8-sig", usecols=[label_column] + periods,
+                         dtype={label_column: str}, thousands=",", na_values=["-"], keep_default_na=True,
+                         chunksize=chunk_rows)
+    for chunk in reader:
+        labels = chunk[label_column].fillna("").map(_normalize)
+        lookup = labels.map(_PROVINCE_LOOKUP)
+        is_national = labels == _normalize(NATIONAL_LABEL)
+        is_province = lookup.notna()
+        is_block = ~is_national & ~is_province & (labels != "")
+
+        # Judul blok komoditas di-forward-fill ke baris provinsi di bawahnya
+        blocks = chunk[label_column].str.strip().where(is_block)
+        if len(blocks) and pd.isna(blocks.iloc[0]):
+            blocks.iloc[0] = commodity
+        blocks = blocks.ffill()
+        if len(blocks):
+            commodity = blocks.iloc[-1]
+
+        keep = (is_national | is_province).to_numpy()
+        values = chunk.loc[keep, periods]
+        ids = pd.DataFrame({
+            "commodity": blocks[keep].to_numpy(),
+            "province_code": np.where(is_national[keep], "", lookup[keep].str[0]),
+            "province_name": np.where(is_national[keep], NATIONAL_LABEL, lookup[keep].str[1]),
+            "row": np.flatnonzero(keep) + offset,
+        })
+        offset += len(chunk)
+        if not len(ids):
+            continue
+
+        long = pd.concat([ids, values.reset_index(drop=True)], axis=1).melt(
+            id_vars=list(ids.columns), var_name="period", value_name="price")
+        long["year"] = long["period"].map(year_of).astype("int32")
+        long["month"] = long["period"].map(month_of).astype("int8")
+        long["price"] = pd.to_numeric(long["price"], errors="coerce").astype("float64")
+        frames.append(long.drop(columns="period"))
+
+    columns = ["commodity", "province_code", "province_name", "row", "year", "month", "price"]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    table = pd.concat(frames, ignore_index=True)[columns]
+    for column in ("commodity", "province_code", "province_name"):
+        table[column] = table[column].astype("category")
+    return table
+
+
+def commodities(table):
+    """Nama komoditas di tabel panjang, urut kemunculan di CSV"""
+    return table["commodity"].unique().tolist()
+
+
+def _month_values(values):
+    """Array harga 12 bulan -> {jan: ..., ...}; NaN (tidak ada data / '-') menjadi 0"""
+    return {key: (float(v) if v == v else 0) for key, v in zip(MONTH_KEYS, values)}
+
+
+def to_historical(table, commodity=None, metadata=None, updated_at=None):
+    """
+    Tabel panjang -> {tahun: {metadata, national_averages, data: [provinsi...]}}
+
+    Provinsi diurutkan sesuai urutan baris di CSV; bulan tanpa kolom di
+    CSV atau berisi '-' bernilai 0. Rata-rata nasional diambil dari baris
+    "Semua Provinsi"; jika kosong, rata-rata harga provinsi bulan itu.
+
+    Args:
+        updated_at: Nilai metadata.last_update (default: sekarang)
+    """
+    commodity = commodity or (commodities(table)[0] if len(table) else DEFAULT_COMMODITY)
+    table = table[table["commodity"] == commodity]
+    metadata = dict(metadata or METADATA)
+    if commodity != DEFAULT_COMMODITY:
+        metadata["commodity"] = commodity
+    metadata["last_update"] = updated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    provinces = table[table["province_code"] != ""].drop_duplicates(
+        ["province_code", "year", "month"], keep="last")
+    national = table[table["province_code"] == ""].drop_duplicates(["year", "month"], keep="last") \
+        .pivot(index="year", columns="month", values="price") \
+        .combine_first(provinces.groupby(["year", "month"])["price"].mean().unstack("month")) \
+        .reindex(columns=range(1, 13))
+    prices = provinces.pivot(index=["year", "province_code"], columns="month", values="price") \
+        .reindex(columns=range(1, 13)).reset_index()
+    prices["row"] = prices["province_code"].map(provinces.groupby("province_code", observed=True)["row"].min())
+    prices = prices.sort_values(["year", "row"], kind="stable")
+    names = provinces.drop_duplicates("province_code").set_index("province_code")["province_name"].to_dict()
+
+    entries = {}
+    for year, code, values in zip(prices["year"].to_numpy(), prices["province_code"].to_numpy(),
+                                  prices[list(range(1, 13))].to_numpy()):
+        entries.setdefault(year, []).append({"province_code": code, "province_name": names[code],
+                                             **_month_values(values)})
+
+    historical = {}
+    for year in sorted(table["year"].unique()):
+        averages = national.loc[year].to_numpy() if year in national.index else np.full(12, np.nan)
+        historical[str(year)] = {
+            "metadata": dict(metadata),
+            "national_averages": _month_values(averages),
+            "data": entries.get(year, []),
+        }
+    return historical
+
+
+def write_historical(path, historical):
+    """Tulis JSON historis (file sementara lalu di-rename)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(historical, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def commodity_slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+# ---------------------------------------------------------------------------
+# Update inkremental
+# ---------------------------------------------------------------------------
+
+def _digest(frame):
+    return hashlib.sha1(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()).hexdigest()[:16]
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def period_key(year, month):
+    return f"{year}-{month:02d}"
+
+
+def period_fingerprints(table):
+    """Hash isi setiap kolom periode di tabel panjang: {'YYYY-MM': hash}"""
+    return {period_key(year, month): _digest(group[["commodity", "province_code", "price"]])
+            for (year, month), group in table.groupby(["year", "month"], sort=True)}
+
+
+class PriceSource:
+    """
+    Satu CSV harga BI dengan cache lazy per run
+
+    Header, kolom label, tabel penuh dan tabel sebagian (per daftar
+    periode) masing-masing diparse sekali walaupun dipakai beberapa
+    artifact (--all-commodities).
+    """
+
+    def __init__(self, path=CSV_PATH, chunk_rows=CHUNK_ROWS):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._cache = {}
+
+    def _cached(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def periods(self):
+        """{header periode: (tahun, bulan)}"""
+        return self._cached("header", lambda: read_header(self.path))[1]
+
+    @property
+    def labels(self):
+        """Kolom label saja (nama provinsi / judul komoditas), tanpa kolom periode"""
+        def build():
+            label_column = self._cached("header", lambda: read_header(self.path))[0]
+            labels = pd.read_csv(self.path, sep=";", encoding="utf-8-sig", usecols=[label_column],
+                                 dtype=str)[label_column]
+            return labels.fillna("").str.strip()
+        return self._cached("labels", build)
+
+    @property
+    def label_fingerprint(self):
+        """Berubah jika baris provinsi/komoditas ditambah, dihapus atau diurutkan ulang"""
+        return self._cached("label_fingerprint", lambda: _digest(self.labels.map(_normalize)))
+
+    @property
+    def commodities(self):
+        """Nama komoditas dari kolom label saja (aturan blok sama dengan read_price_table)"""
+        def build():
+            names = []
+            for label in self.labels:
+                key = _normalize(label)
+                if not key:
+                    continue
+                if key in _PROVINCE_LOOKUP or key == _normalize(NATIONAL_LABEL):
+                    if not names:
+                        names.append(DEFAULT_COMMODITY)
+                elif label not in names:
+                    names.append(label)
+            return names
+        return self._cached("commodities", build)
+
+    def table(self, periods=None):
+        """Tabel panjang untuk `periods` (default semua kolom periode)"""
+        key = ("table", None if periods is None else tuple(periods))
+        return self._cached(key, lambda: read_price_table(self.path, periods, self.chunk_rows))
+
+    def fingerprints(self, periods=None):
+        key = ("fingerprints", None if periods is None else tuple(periods))
+        return self._cached(key, lambda: period_fingerprints(self.table(periods)))
+
+
+def state_path(output_path):
+    return os.path.join(STATE_DIR, os.path.basename(output_path) + ".state.json")
+
+
+def read_state(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def write_state(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def merge_historical(existing, update, months):
+    """
+    Gabungkan hasil to_historical() untuk sebagian bulan ke artifact lama
+
+    Hanya key bulan di `months` ({tahun: set bulan}) yang ditimpa: harga
+    provinsi dan rata-rata nasional. Provinsi baru ditambahkan di akhir
+    list tahunnya, tahun baru disisipkan sesuai urutan.
+    """
+    merged = dict(existing)
+    for year, entry in update.items():
+        if year not in merged:
+            merged[year] = entry
+            continue
+        keys = [MONTH_KEYS[m - 1] for m in sorted(months.get(int(year), ()))]
+        target = merged[year]
+        for key in keys:
+            target["national_averages"][key] = entry["national_averages"][key]
+        by_code = {p["province_code"]: p for p in target["data"]}
+        for province in entry["data"]:
+            current = by_code.get(province["province_code"])
+            if current is None:
+                current = {"province_code": province["province_code"], "province_name": province["province_name"],
+                           **dict.fromkeys(MONTH_KEYS, 0)}
+                target["data"].append(current)
+            for key in keys:
+                current[key] = province[key]
+        target["metadata"]["last_update"] = entry["metadata"]["last_update"]
+    return {year: merged[year] for year in sorted(merged, key=int)}
+
+
+def rebuild_historical(source, output_path=OUTPUT_PATH, commodity=None):
+    """Build penuh artifact + state fingerprint (juga fallback update_historical)"""
+    table = source.table()
+    commodity = commodity or (commodities(table)[0] if len(table) else DEFAULT_COMMODITY)
+    historical = to_historical(table, commodity)
+    write_historical(output_path, historical)
+    write_state(state_path(output_path), {
+        "version": STATE_VERSION,
+        "source": os.path.basename(source.path),
+        "commodity": commodity,
+        "labels": source.label_fingerprint,
+        "periods": source.fingerprints(),
+        "artifact": file_digest(output_path),
+        "updated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    })
+    return historical
+
+
+def update_historical(source, output_path=OUTPUT_PATH, commodity=None, verify=False):
+    """
+    Tambahkan hanya bulan baru dari CSV ke artifact JSON yang ada
+
+    Args:
+        source: PriceSource
+        verify: Hitung ulang fingerprint kolom lama juga (membaca seluruh
+            CSV) dan proses ulang bulan yang direvisi BI
+
+    Returns:
+        Dict: mode ("full", "incremental" atau "unchanged"), reason,
+        months (list 'YYYY-MM' yang diproses)
+    """
+    state_file = state_path(output_path)
+    state = read_state(state_file)
+    periods = source.periods
+
+    reason = None
+    if state is None:
+        reason = "state belum ada"
+    elif not os.path.exists(output_path) or file_digest(output_path) != state["artifact"]:
+        reason = "artifact berubah di luar ETL"
+    elif state["labels"] != source.label_fingerprint:
+        reason = "baris provinsi/komoditas di CSV berubah"
+    elif commodity and commodity != state["commodity"]:
+        reason = "komoditas berbeda"
+    if reason:
+        rebuild_historical(source, output_path, commodity)
+        return {"mode": "full", "reason": reason, "months": sorted(period_key(*p) for p in periods.values())}
+
+    pending = [h for h, p in periods.items() if period_key(*p) not in state["periods"]]
+    if verify:
+        known = [h for h in periods if h not in pending]
+        fingerprints = source.fingerprints(known)
+        for header in known:
+            key = period_key(*periods[header])
+            if fingerprints.get(key) != state["periods"][key]:
+                pending.append(header)
+    if not pending:
+        return {"mode": "unchanged", "reason": None, "months": []}
+
+    pending = [h for h in periods if h in set(pending)]
+    update = to_historical(source.table(pending), state["commodity"])
+    months = {}
+    for header in pending:
+        year, month = periods[header]
+        months.setdefault(year, set()).add(month)
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        existing = json.load(f)
+    write_historical(output_path, merge_historical(existing, update, months))
+
+    state["periods"].update(source.fingerprints(pending))
+    state["artifact"] = file_digest(output_path)
+    state["updated_at"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    write_state(state_file, state)
+    return {"mode": "incremental", "reason": None, "months": sorted(period_key(*periods[h]) for h in pending)}
@@ -0,0 +1,366 @@
+"""
+Chunked pipeline untuk shapefile desa BIG
+=========================================
+
+Job seluruh Indonesia (validasi, simplifikasi, reproyeksi, ekspor) tidak
+perlu memuat shapefile ~1.1 GB sekaligus. Sumber dibagi menjadi chunk:
+
+- shapefile: offset feature (skip_features/max_features pyogrio; .shx
+  membuat seek ke feature ke-N O(1))
+- GeoParquet store (village_store.py): row group per partisi provinsi
+
+Setiap worker di process pool membaca chunk-nya sendiri langsung dari
+file (data sumber tidak lewat proses utama), menjalankan step pipeline,
+lalu mengembalikan hasilnya. Proses utama menulis hasil berurutan secara
+streaming ke output, dengan paling banyak `max_in_flight` chunk di memori.
+Puncak RSS sebanding dengan ukuran chunk, bukan ukuran file.
+
+Step yang tersedia (STEPS), dijalankan berurutan per chunk:
+    make_valid            perbaiki geometri invalid (hanya yang invalid)
+    simplify=<toleransi>  simplify topology-preserving (unit CRS saat itu)
+    reproject=<crs>       reproyeksi, mis. reproject=EPSG:3857
+
+Output: .parquet (GeoParquet, ParquetWriter per chunk) atau format OGR
+lain lewat pyogrio append (.fgb, .gpkg, .geojsonl, .shp).
+
+Usage:
+    python scripts/chunked_pipeline.py output.parquet --make-valid --simplify 0.0001
+    python scripts/chunked_pipeline.py desa-3857.fgb --to-crs EPSG:3857 --chunk-size 5000
+    python scripts/chunked_pipeline.py jabar.gpkg --source store --provinces "JAWA BARAT"
+
+Dari script lain:
+    from chunked_pipeline import plan_shapefile_chunks, iter_pipeline
+    for gdf in iter_pipeline(plan_shapefile_chunks(path), [("make_valid", None)]):
+        ...
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import shapely
+
+from village_store import SHAPEFILE_PATH, STORE_DIR, match_provinces, read_manifest
+
+# Feature per chunk; ~5000 desa BIG ≈ 60-80 MB GeoDataFrame
+DEFAULT_CHUNK_SIZE = 5000
+
+# Driver OGR per ekstensi output (.parquet ditulis langsung dengan pyarrow)
+OUTPUT_DRIVERS = {
+    ".fgb": "FlatGeobuf",
+    ".gpkg": "GPKG",
+    ".geojsonl": "GeoJSONSeq",
+    ".geojsons": "GeoJSONSeq",
+    ".shp": "ESRI Shapefile",
+}
+
+
+# ---------------------------------------------------------------------------
+# Rencana chunk
+# ---------------------------------------------------------------------------
+
+def plan_shapefile_chunks(shp_path=SHAPEFILE_PATH, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Chunk berdasarkan offset feature: [{"kind", "path", "start", "count"}, ...]"""
+    import pyogrio
+
+    total = pyogrio.read_info(shp_path)["features"]
+    return [{"kind": "shapefile", "path": shp_path, "start": start, "count": min(chunk_size, total - start)}
+            for start in range(0, total, chunk_size)]
+
+
+def plan_store_chunks(store_dir=STORE_DIR, chunk_size=DEFAULT_CHUNK_SIZE, provinces=None):
+    """
+    Chunk berdasarkan row group partisi GeoParquet store
+
+    Row group berurutan dalam satu partisi digabung sampai ~chunk_size
+    baris; chunk tidak pernah melintasi dua partisi.
+    """
+    import pyarrow.parquet as pq
+
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"GeoParquet store tidak ditemukan: {store_dir}")
+    names = match_provinces(manifest, provinces) if provinces else list(manifest["partitions"])
+
+    chunks = []
+    for name in names:
+        path = os.path.join(store_dir, manifest["partitions"][name]["file"])
+        metadata = pq.ParquetFile(path).metadata
+        groups, rows = [], 0
+        for i in range(metadata.num_row_groups):
+            groups.append(i)
+            rows += metadata.row_group(i).num_rows
+            if rows >= chunk_size:
+                chunks.append({"kind": "parquet", "path": path, "row_groups": groups, "count": rows})
+                groups, rows = [], 0
+        if groups:
+            chunks.append({"kind": "parquet", "path": path, "row_groups": groups, "count": rows})
+    return chunks
+
+
+def read_chunk(chunk, columns=None):
+    """Baca satu chunk sebagai GeoDataFrame (hanya baris chunk yang didekode)"""
+    if chunk["kind"] == "shapefile":
+        import pyogrio
+
+        return pyogrio.read_dataframe(chunk["path"], columns=columns, skip_features=chunk["start"],
+                                      max_features=chunk["count"])
+
+    import geopandas as gpd
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(chunk["path"])
+    if columns is not None:
+        columns = [c for c in columns if c != "geometry"] + ["geometry"]
+    table = parquet.read_row_groups(chunk["row_groups"], columns=columns)
+    return gpd.GeoDataFrame.from_arrow(table)
+
+
+# ---------------------------------------------------------------------------
+# Step pipeline
+# ---------------------------------------------------------------------------
+
+def step_make_valid(gdf, _arg=None):
+    geoms = np.asarray(gdf.geometry.values)
+    invalid = ~shapely.is_valid(geoms)
+    if invalid.any():
+        geoms = geoms.copy()
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+        gdf = gdf.set_geometry(geoms, crs=gdf.crs)
+    return gdf
+
+
+def step_simplify(gdf, tolerance):
+    geoms = shapely.simplify(np.asarray(gdf.geometry.values), float(tolerance), preserve_topology=True)
+    return gdf.set_geometry(geoms, crs=gdf.crs)
+
+
+def step_reproject(gdf, crs):
+    return gdf.to_crs(crs)
+
+
+STEPS = {
+    "make_valid": step_make_valid,
+    "simplify": step_simplify,
+    "reproject": step_reproject,
+}
+
+
+def parse_steps(specs):
+    """['make_valid', 'simplify=0.0001', 'reproject=EPSG:3857'] -> [(nama, argumen), ...]"""
+    steps = []
+    for spec in specs:
+        name, _, arg = spec.partition("=")
+        if name not in STEPS:
+            raise ValueError(f"Step tidak dikenal: {name} (pilih {', '.join(STEPS)})")
+        steps.append((name, arg or None))
+    return steps
+
+
+def process_chunk(chunk, steps, columns=None):
+    """Worker: baca chunk, jalankan step berurutan, return GeoDataFrame hasil"""
+    gdf = read_chunk(chunk, columns)
+    for name, arg in steps:
+        gdf = STEPS[name](gdf, arg)
+    return gdf
+
+
+def iter_pipeline(chunks, steps=(), columns=None, workers=None, max_in_flight=None):
+    """
+    Yield GeoDataFrame hasil per chunk, berurutan sesuai `chunks`
+
+    Dengan workers=1 chunk diproses di proses ini (tanpa pool). Selain itu
+    paling banyak `max_in_flight` (default 2 x workers) chunk disubmit ke
+    pool sekaligus; chunk berikutnya baru disubmit setelah hasil paling
+    awal diambil konsumen, sehingga memori tetap terbatas walaupun
+    penulisan output lebih lambat dari pemrosesan.
+    """
+    steps = list(steps)
+    if workers == 1:
+        for chunk in chunks:
+            yield process_chunk(chunk, steps, columns)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    pending = deque()
+    chunks = iter(chunks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(process_chunk, chunk, steps, columns))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            result = pending.popleft().result()
+            for chunk in chunks:
+                pending.append(pool.submit(process_chunk, chunk, steps, columns))
+                break
+            yield result
+
+
+# ---------------------------------------------------------------------------
+# Writer streaming
+# ---------------------------------------------------------------------------
+
+def _geo_metadata(crs):
+    """Metadata 'geo' GeoParquet 1.0 untuk kolom geometry WKB"""
+    column = {"encoding": "WKB", "geometry_types": []}
+    if crs is not None:
+        column["crs"] = crs.to_json_dict()
+    return json.dumps({"version": "1.0.0", "primary_column": "geometry", "columns": {"geometry": column}})
+
+
+class ParquetChunkWriter:
+    """Tulis GeoDataFrame per chunk ke satu file GeoParquet (row group per chunk)"""
+
+    def __init__(self, path, row_group_size=None):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, gdf):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(gdf.to_arrow(index=False, geometry_encoding="WKB"))
+        if self._writer is None:
+            # Kolom yang kosong di chunk pertama (tipe null) dianggap string
+            fields = [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in table.schema]
+            self._schema = pa.schema(fields, metadata={b"geo": _geo_metadata(gdf.crs).encode()})
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        table = table.select(self._schema.names).cast(self._schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows += len(gdf)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class OGRChunkWriter:
+    """Tulis GeoDataFrame per chunk lewat pyogrio (chunk pertama create, berikutnya append)"""
+
+    def __init__(self, path, driver, layer=None):
+        self.path = path
+        self.driver = driver
+        self.layer = layer
+        self.rows = 0
+
+    def write(self, gdf):
+        import pyogrio
+
+        pyogrio.write_dataframe(gdf, self.path, driver=self.driver, layer=self.layer, append=self.rows > 0)
+        self.rows += len(gdf)
+
+    def close(self):
+        pass
+
+
+def open_writer(path, layer=None, row_group_size=None):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return ParquetChunkWriter(path, row_group_size)
+    if ext not in OUTPUT_DRIVERS:
+        raise ValueError(f"Format output tidak didukung: {ext} (pilih .parquet, {', '.join(OUTPUT_DRIVERS)})")
+    return OGRChunkWriter(path, OUTPUT_DRIVERS[ext], layer)
+
+
+def peak_rss_mb():
+    """Puncak RSS proses ini dan worker (MB; ru_maxrss dalam KB di Linux)"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return own, children
+
+
+def run_pipeline(chunks, steps, output, columns=None, workers=None, max_in_flight=None, layer=None):
+    """
+    Jalankan pipeline dan stream hasilnya ke `output`
+
+    Output ditulis ke file sementara (ekstensi sama) lalu di-rename, jadi
+    file lama tetap utuh jika proses gagal di tengah jalan.
+
+    Returns:
+        Dict statistik: rows, chunks, seconds
+    """
+    start = time.time()
+    base, ext = os.path.splitext(output)
+    tmp_path = f"{base}.tmp{ext}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    writer = open_writer(tmp_path, layer)
+    total = sum(c["count"] for c in chunks)
+    done = 0
+    try:
+        for i, gdf in enumerate(iter_pipeline(chunks, steps, columns, workers, max_in_flight), 1):
+            writer.write(gdf)
+            done += len(gdf)
+            print(f"  chunk {i}/{len(chunks)}: {done:,}/{total:,} feature ({time.time() - start:.1f}s)")
+    finally:
+        writer.close()
+
+    if ext.lower() == ".shp":
+        for sidecar in (".shp", ".shx", ".dbf", ".prj", ".cpg"):
+            if os.path.exists(f"{base}.tmp{sidecar}"):
+                os.replace(f"{base}.tmp{sidecar}", base + sidecar)
+    else:
+        os.replace(tmp_path, output)
+    return {"rows": done, "chunks": len(chunks), "seconds": round(time.time() - start, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked make_valid/simplify/reproject over the BIG village shapefile")
+    parser.add_argument("output", help="File output (.parquet, .fgb, .gpkg, .geojsonl, .shp)")
+    parser.add_argument("--source", choices=["shapefile", "store"], default="shapefile",
+                        help="Baca shapefile per offset feature atau GeoParquet store per row group")
+    parser.add_argument("--shapefile", default=SHAPEFILE_PATH)
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--provinces", nargs="+", help="Filter provinsi (hanya --source store)")
+    parser.add_argument("--columns", nargs="+", help="Kolom atribut yang dibawa (default: semua)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses worker (default: jumlah core)")
+    parser.add_argument("--make-valid", action="store_true")
+    parser.add_argument("--simplify", type=float, default=None, metavar="TOLERANCE")
+    parser.add_argument("--to-crs", default=None, metavar="CRS", help="Reproyeksi, mis. EPSG:3857")
+    parser.add_argument("--layer", default=None, help="Nama layer output (format OGR)")
+    args = parser.parse_args()
+
+    specs = (["make_valid"] if args.make_valid else []) \
+        + ([f"simplify={args.simplify}"] if args.simplify else []) \
+        + ([f"reproject={args.to_crs}"] if args.to_crs else [])
+    steps = parse_steps(specs)
+
+    print("=" * 60)
+    print("Chunked Pipeline")
+    print("=" * 60)
+
+    try:
+        if args.source == "store":
+            chunks = plan_store_chunks(args.store, args.chunk_size, args.provinces)
+        else:
+            if not os.path.exists(args.shapefile):
+                raise FileNotFoundError(f"Shapefile tidak ditemukan: {args.shapefile}")
+            chunks = plan_shapefile_chunks(args.shapefile, args.chunk_size)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(f"Sumber: {args.source}, {sum(c['count'] for c in chunks):,} feature dalam {len(chunks)} chunk")
+    print(f"Step: {', '.join(specs) or '(tanpa step, salin saja)'}")
+    stats = run_pipeline(chunks, steps, args.output, args.columns, args.workers, layer=args.layer)
+
+    own, children = peak_rss_mb()
+    print(f"\n✓ {stats['rows']:,} feature → {args.output} ({stats['seconds']}s)")
+    print(f"  Puncak RSS: utama {own:.0f} MB, worker {children:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
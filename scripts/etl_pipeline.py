@@ -0,0 +1,537 @@
+"""
+ETL pipeline seluruh artifact data dashboard
+============================================
+
+Satu runner untuk semua script/notebook yang menghasilkan data frontend
+dan cache. Setiap stage (STAGES) mendeklarasikan command, input dan
+output-nya; dependensi antar stage diturunkan otomatis (input stage B
+cocok dengan output stage A -> A jalan dulu).
+
+- Stage dilewati jika hash isi semua input (termasuk source Python yang
+  di-import script-nya, dicari lewat AST) dan command sama dengan run
+  terakhir, dan output masih ada dengan hash yang sama. Perubahan satu
+  file hanya menjalankan ulang stage yang membacanya dan stage hilirnya;
+  jika output stage hulu ternyata identik, stage hilir tetap dilewati.
+- Hash file besar (shapefile ~1.1 GB) di-cache per (ukuran, mtime).
+- Stage yang tidak saling bergantung dijalankan paralel (--jobs).
+- Log setiap stage ditulis ke data/cache/etl/logs/<stage>.log; di akhir
+  dicetak tabel status dan durasi per stage.
+
+Stage dengan input yang tidak ada (mis. shapefile BIG masih pointer Git
+LFS) tidak dijalankan; stage hilir memakai output yang sudah ada. Input
+di `optional_inputs` (mis. store desa untuk script yang punya fallback
+GeoJSON) di-hash jika ada, tapi ketiadaannya tidak menahan stage.
+Stage `network` (scraping BPS) hanya jalan dengan --network atau jika
+disebut langsung.
+
+Usage:
+    python scripts/etl_pipeline.py                  # semua stage yang kedaluwarsa
+    python scripts/etl_pipeline.py bi-harga         # stage tertentu + hulunya
+    python scripts/etl_pipeline.py --dry-run        # tampilkan rencana saja
+    python scripts/etl_pipeline.py --list
+    python scripts/etl_pipeline.py --force transmigrasi-geojson
+"""
+
+import argparse
+import ast
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+STATE_DIR = os.path.join(ROOT_DIR, "data", "cache", "etl")
+
+# Naikkan jika format state berubah
+STATE_VERSION = 1
+
+SHAPEFILE = "data/batas desa/Batas_Wilayah_KelurahanDesa_10K_AR"
+STORE_MANIFEST = "data/cache/desa-geoparquet/manifest.json"
+TEMPLATE = "data/kawasan-transmigrasi.json"
+
+# Semua path relatif terhadap root repo; input boleh berupa glob.
+# Source Python lokal yang di-import script di command ditambahkan
+# otomatis sebagai input (lihat python_sources). optional_inputs: dipakai
+# jika ada (ikut hash dan dependensi), boleh tidak ada.
+#
+# transform-bi-csv.py (versi lama tanpa national_averages) menulis file
+# yang sama dengan transform-bi-csv-correct.py, jadi tidak didaftarkan.
+STAGES = [
+    {
+        "name": "bps-scrape",
+        "notebook": "scripts/scrape.ipynb",
+        "cwd": "data",
+        "inputs": ["scripts/scrape.ipynb"],
+        "outputs": ["data/bps-scraping-results-*.json"],
+        "network": True,
+    },
+    {
+        "name": "bps-produksi",
+        "command": ["node", "scripts/transform-bps-data.js"],
+        "inputs": ["data/bps-scraping-results-*.json"],
+        "outputs": ["frontend/data-produksi-padi-bps.json"],
+    },
+    {
+        "name": "bi-harga",
+        "command": [sys.executable, "scripts/transform-bi-csv-correct.py"],
+        "inputs": ["data/Tabel Harga Berdasarkan Komoditas (1).csv"],
+        "outputs": ["frontend/data-harga-beras-bi-historical.json"],
+    },
+    {
+        "name": "village-store",
+        "command": [sys.executable, "scripts/village_store.py", "--force"],
+        "inputs": [SHAPEFILE + ".shp", SHAPEFILE + ".shx", SHAPEFILE + ".dbf"],
+        "outputs": [STORE_MANIFEST],
+    },
+    {
+        "name": "match-transmigrasi",
+        "command": [sys.executable, "scripts/match-transmigrasi-desa.py"],
+        "inputs": ["data/desa-transmigrasi.json", STORE_MANIFEST],
+        "outputs": ["data/transmigrasi-matched.json", "data/transmigrasi-matching-report.json",
+                    "data/transmigrasi-no-match.json", TEMPLATE],
+    },
+    {
+        "name": "transmigrasi-geojson",
+        "command": [sys.executable, "scripts/generate-transmigrasi-geojson.py"],
+        "inputs": [TEMPLATE, STORE_MANIFEST],
+        "outputs": ["frontend/data-kawasan-transmigrasi.geojson"],
+    },
+    {
+        "name": "lod-pyramid",
+        "command": [sys.executable, "scripts/generate-lod-pyramid.py"],
+        "inputs": ["frontend/provinsi.json", "frontend/data-kawasan-transmigrasi.geojson"],
+        # Tanpa store, layer transmigrasi dibangun dari GeoJSON frontend
+        "optional_inputs": [TEMPLATE, STORE_MANIFEST],
+        "outputs": ["frontend/lod/manifest.json"],
+    },
+    {
+        "name": "admin-boundaries",
+        "command": [sys.executable, "scripts/admin_boundaries.py", "--force"],
+        "inputs": [STORE_MANIFEST],
+        "outputs": ["data/cache/admin-boundaries/manifest.json"],
+    },
+    {
+        "name": "village-tiles",
+        "command": [sys.executable, "scripts/generate-village-tiles.py"],
+        "inputs": [TEMPLATE, STORE_MANIFEST],
+        "outputs": ["data/tiles/desa.mbtiles"],
+    },
+    {
+        "name": "flatgeobuf-desa",
+        "command": [sys.executable, "scripts/generate-flatgeobuf.py", "--layers", "desa"],
+        "inputs": [STORE_MANIFEST],
+        "optional_inputs": [TEMPLATE],
+        "outputs": ["data/fgb/desa.fgb"],
+    },
+    {
+        "name": "flatgeobuf-transmigrasi",
+        "command": [sys.executable, "scripts/generate-flatgeobuf.py", "--layers", "transmigrasi"],
+        "inputs": ["frontend/data-kawasan-transmigrasi.geojson"],
+        # Tanpa store, layer dibangun dari GeoJSON frontend
+        "optional_inputs": [TEMPLATE, STORE_MANIFEST],
+        "outputs": ["data/fgb/transmigrasi.fgb"],
+    },
+]
+
+LFS_POINTER_PREFIX = b"version https://git-lfs"
+
+# Direktori modul lokal yang bisa di-import script (backend/shared lewat sys.path di geojson_writer)
+SOURCE_DIRS = ["scripts", os.path.join("backend", "shared")]
+
+
+# ---------------------------------------------------------------------------
+# Hash file (di-cache per ukuran + mtime)
+# ---------------------------------------------------------------------------
+
+class HashCache:
+    """Digest isi file; dihitung ulang hanya jika ukuran/mtime berubah"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def digest(self, rel_path):
+        """sha1 isi file, None jika tidak ada atau masih pointer Git LFS"""
+        path = os.path.join(ROOT_DIR, rel_path)
+        if not os.path.isfile(path):
+            return None
+        st = os.stat(path)
+        signature = [st.st_size, st.st_mtime_ns]
+        with self._lock:
+            cached = self._entries.get(rel_path)
+        if cached and cached[:2] == signature:
+            return cached[2]
+
+        sha = hashlib.sha1()
+        with open(path, "rb") as f:
+            head = f.read(1 << 20)
+            if st.st_size < 1024 and head.startswith(LFS_POINTER_PREFIX):
+                return None
+            while head:
+                sha.update(head)
+                head = f.read(1 << 20)
+        digest = sha.hexdigest()
+        with self._lock:
+            self._entries[rel_path] = signature + [digest]
+        return digest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            data = json.dumps(self._entries, ensure_ascii=False)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+def expand(pattern):
+    """Path relatif root yang cocok dengan pattern (glob), terurut"""
+    if not glob.has_magic(pattern):
+        return [pattern]
+    return sorted(os.path.relpath(p, ROOT_DIR) for p in glob.glob(os.path.join(ROOT_DIR, pattern)))
+
+
+def python_sources(script):
+    """Script Python + modul lokal (SOURCE_DIRS) yang di-import (transitif, termasuk import di dalam fungsi)"""
+    seen, queue = [], [script]
+    while queue:
+        rel_path = queue.pop()
+        if rel_path in seen or not os.path.exists(os.path.join(ROOT_DIR, rel_path)):
+            continue
+        seen.append(rel_path)
+        with open(os.path.join(ROOT_DIR, rel_path), "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                for source_dir in SOURCE_DIRS:
+                    module = os.path.join(source_dir, name.split(".")[0] + ".py")
+                    if os.path.exists(os.path.join(ROOT_DIR, module)):
+                        queue.append(module)
+                        break
+    return sorted(seen)
+
+
+def stage_inputs(stage):
+    """Pattern input lengkap: input data (wajib + opsional) + file command/notebook + source Python yang di-import"""
+    patterns = list(stage["inputs"]) + list(stage.get("optional_inputs", []))
+    for arg in stage.get("command", [])[1:]:
+        if arg.endswith(".py"):
+            patterns += python_sources(arg)
+        elif arg.endswith(".js"):
+            patterns.append(arg)
+    if stage.get("notebook"):
+        patterns.append(stage["notebook"])
+    return list(dict.fromkeys(patterns))
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+def _overlaps(a, b):
+    return a == b or fnmatch.fnmatch(a, b) or fnmatch.fnmatch(b, a)
+
+
+def build_graph(stages):
+    """
+    {stage: set stage hulu} dari kecocokan input <-> output, plus urutan topologis
+
+    Raises:
+        ValueError: dua stage menulis output yang sama, atau ada siklus
+    """
+    by_name = {s["name"]: s for s in stages}
+    owners = {}
+    for stage in stages:
+        for output in stage["outputs"]:
+            for other, name in owners.items():
+                if _overlaps(output, other):
+                    raise ValueError(f"Output {output} ditulis oleh {name} dan {stage['name']}")
+            owners[output] = stage["name"]
+
+    deps = {name: set() for name in by_name}
+    for stage in stages:
+        for pattern in stage_inputs(stage):
+            for output, owner in owners.items():
+                if owner != stage["name"] and _overlaps(pattern, output):
+                    deps[stage["name"]].add(owner)
+
+    order, done = [], set()
+    while len(order) < len(stages):
+        ready = [s["name"] for s in stages if s["name"] not in done and deps[s["name"]] <= done]
+        if not ready:
+            raise ValueError(f"Siklus dependensi: {', '.join(sorted(set(by_name) - done))}")
+        order += ready
+        done.update(ready)
+    return deps, order
+
+
+def upstream_closure(names, deps):
+    selected, queue = set(), list(names)
+    while queue:
+        name = queue.pop()
+        if name not in selected:
+            selected.add(name)
+            queue.extend(deps[name])
+    return selected
+
+
+# ---------------------------------------------------------------------------
+# Eksekusi
+# ---------------------------------------------------------------------------
+
+def read_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    return state.get("stages", {}) if state.get("version") == STATE_VERSION else {}
+
+
+def write_state(path, stages):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "stages": stages}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _digests(patterns, hashes):
+    """{path: digest} untuk semua file yang cocok; pattern tanpa file -> None"""
+    digests = {}
+    for pattern in patterns:
+        paths = expand(pattern)
+        if not paths:
+            digests[pattern] = None
+        for path in paths:
+            digests[path] = hashes.digest(path)
+    return digests
+
+
+def _command_key(stage):
+    """Identitas command (interpreter Python dinormalisasi agar state portabel antar venv)"""
+    if stage.get("notebook"):
+        return ["notebook", stage["notebook"], stage.get("cwd", ".")]
+    return ["python" if arg == sys.executable else arg for arg in stage["command"]]
+
+
+def check_stage(stage, record, hashes, force=False):
+    """
+    Returns:
+        (status, alasan, digest input) dengan status "run", "fresh" atau "missing"
+    """
+    inputs = _digests(stage_inputs(stage), hashes)
+    # Input opsional yang tidak ada tetap tercatat (None), jadi kemunculannya memicu run ulang
+    optional = {path for pattern in stage.get("optional_inputs", []) for path in expand(pattern) or [pattern]}
+    missing = [path for path, digest in inputs.items() if digest is None and path not in optional]
+    if missing:
+        return "missing", f"input tidak ada: {', '.join(missing)}", inputs
+    if force:
+        return "run", "--force", inputs
+    if not record:
+        return "run", "belum pernah dijalankan", inputs
+    if record.get("command") != _command_key(stage):
+        return "run", "command berubah", inputs
+    changed = sorted(p for p in set(inputs) | set(record.get("inputs", {}))
+                     if inputs.get(p) != record.get("inputs", {}).get(p))
+    if changed:
+        return "run", f"input berubah: {', '.join(changed)}", inputs
+    outputs = _digests(stage["outputs"], hashes)
+    if outputs != record.get("outputs"):
+        return "run", "output hilang/berubah", inputs
+    return "fresh", "tidak berubah", inputs
+
+
+def _run_notebook(stage, log):
+    try:
+        import nbformat
+        from nbclient import NotebookClient
+    except ImportError:
+        raise RuntimeError("nbclient diperlukan untuk stage notebook (pip install nbclient ipykernel)")
+    path = os.path.join(ROOT_DIR, stage["notebook"])
+    notebook = nbformat.read(path, as_version=4)
+    cwd = os.path.join(ROOT_DIR, stage.get("cwd", os.path.dirname(stage["notebook"])))
+    NotebookClient(notebook, timeout=600, resources={"metadata": {"path": cwd}}).execute()
+    for cell in notebook.cells:
+        for output in cell.get("outputs", []):
+            if output.get("output_type") == "stream":
+                log.write(output.get("text", ""))
+
+
+def run_stage(stage, log_path):
+    """Jalankan command/notebook stage, stdout+stderr ke log_path. Returns (ok, pesan error)"""
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path, "w", encoding="utf-8") as log:
+        try:
+            if stage.get("notebook"):
+                _run_notebook(stage, log)
+                return True, None
+            process = subprocess.run(stage["command"], cwd=os.path.join(ROOT_DIR, stage.get("cwd", ".")),
+                                     stdout=log, stderr=subprocess.STDOUT)
+        except Exception as e:
+            log.write(f"\n{type(e).__name__}: {e}\n")
+            return False, str(e)
+    if process.returncode != 0:
+        return False, f"exit code {process.returncode}"
+    return True, None
+
+
+def _tail(path, lines=15):
+    if not os.path.exists(path):
+        return ""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return "".join(f.readlines()[-lines:])
+
+
+def run_pipeline(targets=None, force=False, jobs=None, network=False, dry_run=False, stages=STAGES,
+                 state_dir=STATE_DIR):
+    """
+    Jalankan stage yang kedaluwarsa (dan hulunya) secara paralel
+
+    force hanya berlaku untuk stage target (atau semua stage jika tanpa
+    target); stage hulu tetap dicek kedaluwarsa seperti biasa.
+
+    Returns:
+        Dict stage -> {status, reason, seconds}; status salah satu "ran",
+        "fresh", "missing", "manual", "failed", "blocked" (dry-run:
+        "would-run")
+    """
+    by_name = {s["name"]: s for s in stages}
+    deps, order = build_graph(stages)
+    unknown = [t for t in targets or [] if t not in by_name]
+    if unknown:
+        raise ValueError(f"Stage tidak dikenal: {', '.join(unknown)}")
+    selected = upstream_closure(targets, deps) if targets else set(by_name)
+
+    state_path = os.path.join(state_dir, "state.json")
+    records = read_state(state_path)
+    hashes = HashCache(os.path.join(state_dir, "hashes.json"))
+    results = {}
+    pending = [name for name in order if name in selected]
+
+    def evaluate_and_run(name):
+        stage = by_name[name]
+        start = time.time()
+        status, reason, inputs = check_stage(stage, records.get(name), hashes,
+                                             force and (not targets or name in targets))
+        if status != "run" or dry_run:
+            return {"status": "would-run" if status == "run" else status, "reason": reason,
+                    "seconds": time.time() - start}
+        ok, error = run_stage(stage, os.path.join(state_dir, "logs", f"{name}.log"))
+        seconds = time.time() - start
+        if not ok:
+            return {"status": "failed", "reason": error, "seconds": seconds}
+        return {"status": "ran", "reason": reason, "seconds": seconds, "inputs": inputs,
+                "outputs": _digests(stage["outputs"], hashes)}
+
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for name in list(pending):
+                if any(dep in selected and dep not in results for dep in deps[name]):
+                    continue
+                pending.remove(name)
+                upstream = [results[dep]["status"] for dep in deps[name] if dep in results]
+                if any(s in ("failed", "blocked") for s in upstream):
+                    results[name] = {"status": "blocked", "reason": "stage hulu gagal", "seconds": 0.0}
+                elif by_name[name].get("network") and not network and name not in (targets or []):
+                    results[name] = {"status": "manual", "reason": "butuh --network", "seconds": 0.0}
+                elif dry_run and "would-run" in upstream:
+                    results[name] = {"status": "would-run", "reason": "stage hulu akan dijalankan",
+                                     "seconds": 0.0}
+                else:
+                    running[pool.submit(evaluate_and_run, name)] = name
+                    print(f"  → {name}")
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                result = future.result()
+                results[name] = result
+                print(f"  {'✓' if result['status'] != 'failed' else '✗'} {name}: "
+                      f"{result['status']} ({result['seconds']:.1f}s) {result['reason']}")
+                if result["status"] == "ran":
+                    records[name] = {
+                        "command": _command_key(by_name[name]),
+                        "inputs": result.pop("inputs"),
+                        "outputs": result.pop("outputs"),
+                        "seconds": round(result["seconds"], 2),
+                        "finished_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+                    }
+                    write_state(state_path, records)
+                elif result["status"] == "failed":
+                    print(_tail(os.path.join(state_dir, "logs", f"{name}.log")))
+
+    hashes.save()
+    return {name: results[name] for name in order if name in results}
+
+
+def print_report(results, wall_seconds):
+    print("\n" + "=" * 72)
+    print(f"{'Stage':<24}{'Status':<12}{'Durasi':>9}  Keterangan")
+    print("-" * 72)
+    for name, result in results.items():
+        print(f"{name:<24}{result['status']:<12}{result['seconds']:>8.1f}s  {result['reason'] or ''}")
+    total = sum(r["seconds"] for r in results.values())
+    print("-" * 72)
+    print(f"Total waktu stage {total:.1f}s, wall clock {wall_seconds:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build dashboard data artifacts with content-hash caching")
+    parser.add_argument("stages", nargs="*", help="Stage target (default: semua); hulunya ikut dicek")
+    parser.add_argument("--force", action="store_true", help="Jalankan stage terpilih walaupun input tidak berubah")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Stage paralel (default: jumlah core)")
+    parser.add_argument("--network", action="store_true", help="Sertakan stage yang butuh internet (scraping)")
+    parser.add_argument("--dry-run", action="store_true", help="Tampilkan stage yang akan dijalankan saja")
+    parser.add_argument("--list", action="store_true", help="Daftar stage beserta input/output")
+    args = parser.parse_args()
+
+    if args.list:
+        deps, order = build_graph(STAGES)
+        by_name = {s["name"]: s for s in STAGES}
+        for name in order:
+            stage = by_name[name]
+            print(f"{name}{' [network]' if stage.get('network') else ''}")
+            print(f"  setelah: {', '.join(sorted(deps[name])) or '-'}")
+            print(f"  input:   {', '.join(stage_inputs(stage))}")
+            if stage.get("optional_inputs"):
+                print(f"  opsional: {', '.join(stage['optional_inputs'])}")
+            print(f"  output:  {', '.join(stage['outputs'])}")
+        return
+
+    print("=" * 72)
+    print("ETL Pipeline" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 72)
+    start = time.time()
+    try:
+        results = run_pipeline(args.stages, args.force, args.jobs, args.network, args.dry_run)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print_report(results, time.time() - start)
+    if any(r["status"] in ("failed", "blocked") for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+FlatGeobuf bbox reader + benchmark
+==================================
+
+Baca feature FlatGeobuf (hasil generate-flatgeobuf.py) yang beririsan
+dengan bbox, dari file lokal atau URL HTTP. Untuk URL, GDAL (/vsicurl/)
+membaca header dan packed Hilbert R-tree lewat HTTP range request, lalu
+hanya mengambil rentang byte feature yang cocok.
+
+Sebagai CLI, script ini mengukur bbox read end-to-end: waktu, jumlah
+feature, dan (jika server adalah scripts/serve-static.py) jumlah request
+serta byte yang benar-benar dikirim dibanding ukuran file utuh. Cache
+/vsicurl/ dimatikan untuk URL yang diukur agar setiap read "dingin".
+
+Usage:
+    python scripts/flatgeobuf_reader.py data/fgb/desa.fgb --bbox 106.7 -6.4 106.9 -6.1
+    python scripts/serve-static.py &
+    python scripts/flatgeobuf_reader.py http://127.0.0.1:8091/desa.fgb --random 20 --size 0.2
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import urllib.request
+
+try:
+    import pyogrio
+except ImportError:
+    print("ERROR: pyogrio diperlukan.")
+    print("Install: pip install pyogrio geopandas")
+    sys.exit(1)
+
+
+def is_url(source):
+    return source.startswith(("http://", "https://"))
+
+
+def gdal_path(source):
+    """Path GDAL: URL HTTP dibaca lewat /vsicurl/ (range request)"""
+    return "/vsicurl/" + source if is_url(source) else source
+
+
+def read_info(source):
+    """Metadata layer (jumlah feature, bounds, kolom) dari header FlatGeobuf"""
+    return pyogrio.read_info(gdal_path(source))
+
+
+def read_bbox(source, bbox, columns=None):
+    """
+    GeoDataFrame feature yang beririsan dengan bbox (minx, miny, maxx, maxy)
+
+    Filter bbox dijawab oleh index spasial FlatGeobuf, bukan scan penuh.
+    """
+    return pyogrio.read_dataframe(gdal_path(source), bbox=tuple(bbox), columns=columns)
+
+
+def server_stats(source):
+    """Counter /_stats dari serve-static.py, None jika tidak tersedia"""
+    if not is_url(source):
+        return None
+    base = source.split("://", 1)
+    stats_url = base[0] + "://" + base[1].split("/", 1)[0] + "/_stats"
+    try:
+        with urllib.request.urlopen(stats_url, timeout=5) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+def random_bboxes(bounds, count, size, seed=0):
+    """`count` bbox persegi sisi `size` derajat di dalam bounds layer"""
+    rng = random.Random(seed)
+    minx, miny, maxx, maxy = bounds
+    boxes = []
+    for _ in range(count):
+        x = rng.uniform(minx, max(minx, maxx - size))
+        y = rng.uniform(miny, max(miny, maxy - size))
+        boxes.append((x, y, x + size, y + size))
+    return boxes
+
+
+def benchmark(source, bboxes, columns=None):
+    """
+    Ukur read setiap bbox
+
+    Returns:
+        List dict {bbox, features, seconds, requests, bytes} (requests/bytes
+        None jika server tidak menyediakan /_stats)
+    """
+    if is_url(source):
+        pyogrio.set_gdal_config_options({"CPL_VSIL_CURL_NON_CACHED": gdal_path(source)})
+
+    results = []
+    for bbox in bboxes:
+        before = server_stats(source)
+        start = time.perf_counter()
+        gdf = read_bbox(source, bbox, columns)
+        elapsed = time.perf_counter() - start
+        after = server_stats(source)
+        results.append({
+            "bbox": bbox,
+            "features": len(gdf),
+            "seconds": elapsed,
+            "requests": after["requests"] - before["requests"] if before and after else None,
+            "bytes": after["bytes"] - before["bytes"] if before and after else None,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read/benchmark FlatGeobuf bbox queries (local file or URL)")
+    parser.add_argument("source", help="Path .fgb atau URL http(s)")
+    parser.add_argument("--bbox", nargs=4, type=float, metavar=("MINX", "MINY", "MAXX", "MAXY"))
+    parser.add_argument("--random", type=int, default=0, help="Jumlah bbox acak di dalam bounds layer")
+    parser.add_argument("--size", type=float, default=0.1, help="Sisi bbox acak (derajat)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--columns", nargs="+", default=None)
+    args = parser.parse_args()
+
+    info = read_info(args.source)
+    if is_url(args.source):
+        request = urllib.request.Request(args.source, method="HEAD")
+        with urllib.request.urlopen(request, timeout=10) as response:
+            file_size = int(response.headers.get("Content-Length", 0)) or None
+    else:
+        file_size = os.path.getsize(args.source)
+
+    print(f"{args.source}: {info['features']:,} features, bounds={tuple(round(v, 4) for v in info['total_bounds'])}")
+    if file_size:
+        print(f"File: {file_size / 1024 / 1024:.2f} MB")
+
+    bboxes = [tuple(args.bbox)] if args.bbox else []
+    bboxes += random_bboxes(info['total_bounds'], args.random, args.size, args.seed)
+    if not bboxes:
+        parser.error("Berikan --bbox atau --random N")
+
+    results = benchmark(args.source, bboxes, args.columns)
+    for r in results:
+        line = f"  bbox={tuple(round(v, 3) for v in r['bbox'])}: {r['features']:5d} features, {r['seconds'] * 1000:7.1f} ms"
+        if r["bytes"] is not None:
+            line += f", {r['requests']} requests, {r['bytes'] / 1024:.1f} KB"
+        print(line)
+
+    times = [r["seconds"] * 1000 for r in results]
+    print(f"\nReads: {len(results)}, median {statistics.median(times):.1f} ms, max {max(times):.1f} ms")
+    sent = [r["bytes"] for r in results if r["bytes"] is not None]
+    if sent and file_size:
+        print(f"Byte terkirim: median {statistics.median(sent) / 1024:.1f} KB per read "
+              f"({statistics.median(sent) / file_size:.2%} dari file utuh)")
+
+
+if __name__ == '__main__':
+    main()
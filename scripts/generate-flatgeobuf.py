@@ -0,0 +1,154 @@
+"""
+Generate FlatGeobuf Layers with Spatial Index
+=============================================
+
+Mengekspor batas desa ke FlatGeobuf (.fgb) dengan index spasial bawaan
+(packed Hilbert R-tree). Feature diurutkan menurut kurva Hilbert oleh
+driver GDAL saat index dibangun, sehingga desa yang berdekatan juga
+berdekatan di file. Query bbox cukup membaca header + node index yang
+relevan + rentang byte feature yang cocok, baik dari disk maupun lewat
+HTTP range request (lihat scripts/serve-static.py dan
+scripts/flatgeobuf_reader.py) tanpa mengunduh seluruh file.
+
+Layer:
+- desa:          seluruh desa di GeoParquet store (village_store.py),
+                 opsional dibatasi --provinces; properti sama dengan layer
+                 transmigrasi + flag transmigrasi
+- transmigrasi:  desa transmigrasi (kode di data/kawasan-transmigrasi.json);
+                 jika shapefile/store tidak tersedia, dari
+                 frontend/data-kawasan-transmigrasi.geojson
+
+Default geometri detail penuh (hanya Z yang dibuang); --tolerance untuk
+simplifikasi.
+
+Usage:
+    python scripts/generate-flatgeobuf.py
+    python scripts/generate-flatgeobuf.py --layers transmigrasi
+    python scripts/generate-flatgeobuf.py --provinces "JAWA BARAT" --tolerance 0.0001
+
+Output:
+    data/fgb/desa.fgb
+    data/fgb/transmigrasi.fgb
+"""
+
+import argparse
+import os
+import sys
+import time
+
+try:
+    import geopandas as gpd
+    import pandas as pd
+    import pyogrio
+    from geojson_writer import prepare_geometries
+    from transmigrasi_layer import (GEOMETRY_COLUMNS, SHAPEFILE_PATH, TEMPLATE_PATH, iter_village_chunks,
+                                    load_template, normalize_codes, select_villages, village_properties)
+    from village_store import (STORE_DIR, ensure_store, load_geodataframe, match_provinces, read_manifest,
+                               shapefile_available)
+except ImportError:
+    print("ERROR: geopandas, shapely, pyogrio dan pyarrow diperlukan.")
+    print("Install: pip install geopandas shapely pyogrio pyproj pyarrow")
+    sys.exit(1)
+
+# Paths
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+TRANSMIGRASI_PATH = os.path.join(ROOT_DIR, "frontend", "data-kawasan-transmigrasi.geojson")
+OUTPUT_DIR = os.path.join(ROOT_DIR, "data", "fgb")
+
+LAYERS = ["desa", "transmigrasi"]
+
+
+def village_frame(gdf, tolerance, transmigrasi_codes=None):
+    """GeoDataFrame dengan properti frontend (village_properties) + geometri 2D"""
+    frame = pd.DataFrame([village_properties(row) for row in gdf.itertuples(index=False)])
+    if transmigrasi_codes is not None:
+        frame["transmigrasi"] = normalize_codes(gdf['KDEPUM']).isin(transmigrasi_codes).astype('int32').to_numpy()
+    geometry = prepare_geometries(gdf.geometry.values, tolerance, None)
+    return gpd.GeoDataFrame(frame, geometry=geometry, crs=gdf.crs or "EPSG:4326")
+
+
+def desa_frame(tolerance, provinces=None):
+    """Layer semua desa dari store"""
+    manifest = ensure_store(SHAPEFILE_PATH, STORE_DIR)
+    if provinces:
+        provinces = match_provinces(manifest, provinces)
+        if not provinces:
+            raise ValueError("Provinsi tidak ditemukan di store")
+    gdf = load_geodataframe(GEOMETRY_COLUMNS, provinces=provinces, store_dir=STORE_DIR, manifest=manifest)
+
+    transmigrasi = set()
+    if os.path.exists(TEMPLATE_PATH):
+        transmigrasi = set(load_template(TEMPLATE_PATH)[0])
+    return village_frame(gdf, tolerance, transmigrasi), manifest["source"]
+
+
+def transmigrasi_frame(tolerance):
+    """Layer desa transmigrasi dari store, fallback ke GeoJSON frontend"""
+    if shapefile_available(SHAPEFILE_PATH) or read_manifest(STORE_DIR) is not None:
+        kode_desa_list, _ = load_template(TEMPLATE_PATH)
+        selection = select_villages(kode_desa_list, SHAPEFILE_PATH, STORE_DIR) if kode_desa_list else None
+        if selection is not None:
+            manifest, selected = selection
+            chunks = [village_frame(gdf, tolerance) for gdf in iter_village_chunks(manifest, selected, STORE_DIR)]
+            return pd.concat(chunks, ignore_index=True), manifest["source"]
+
+    print(f"WARNING: Shapefile/store tidak tersedia, pakai {TRANSMIGRASI_PATH}")
+    gdf = gpd.read_file(TRANSMIGRASI_PATH)
+    gdf.geometry = prepare_geometries(gdf.geometry.values, tolerance, None)
+    return gdf, os.path.relpath(TRANSMIGRASI_PATH, ROOT_DIR)
+
+
+def write_flatgeobuf(gdf, path, layer):
+    """
+    Tulis FlatGeobuf dengan packed Hilbert R-tree (SPATIAL_INDEX=YES)
+
+    Ditulis ke file sementara lalu di-rename agar file lama yang sedang
+    disajikan tetap utuh sampai build selesai.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Driver FlatGeobuf menulis direktori jika ekstensi bukan .fgb
+    tmp_path = os.path.splitext(path)[0] + '.tmp.fgb'
+    pyogrio.write_dataframe(gdf, tmp_path, layer=layer, driver="FlatGeobuf",
+                            SPATIAL_INDEX="YES", TITLE=layer)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export village boundaries to FlatGeobuf with a spatial index")
+    parser.add_argument("--layers", nargs="+", choices=LAYERS, default=LAYERS)
+    parser.add_argument("--provinces", nargs="+", default=None,
+                        help="Batasi layer desa ke provinsi ini (nama WADMPR)")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Toleransi simplifikasi (derajat), default 0 = detail penuh")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Generate FlatGeobuf Layers")
+    print("=" * 60)
+
+    for name in args.layers:
+        print(f"\n[{name}]")
+        start = time.time()
+        try:
+            if name == "desa":
+                gdf, source = desa_frame(args.tolerance, args.provinces)
+            else:
+                gdf, source = transmigrasi_frame(args.tolerance)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+        path = os.path.join(args.output_dir, f"{name}.fgb")
+        size = write_flatgeobuf(gdf, path, name)
+        print(f"  Source: {source}")
+        print(f"  {path}: {len(gdf):,} features, {size / 1024 / 1024:.1f} MB ({time.time() - start:.1f}s)")
+
+    print("\nSajikan dengan: python scripts/serve-static.py")
+    print("Done!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Generate Multi-Resolution (LOD) Geometry Pyramid
+================================================
+
+Membuat beberapa versi layer peta dengan toleransi simplifikasi berbeda,
+satu per rentang zoom, supaya tampilan nasional tidak mengunduh polygon
+detail penuh dan tampilan dekat tidak mendapat polygon kasar.
+
+Layer:
+- provinsi:      frontend/provinsi.json
+- transmigrasi:  desa transmigrasi dari GeoParquet store (kode di
+                 data/kawasan-transmigrasi.json); jika shapefile/store
+                 tidak tersedia, dari frontend/data-kawasan-transmigrasi.geojson
+
+Simplifikasi memakai preserve_topology=True (polygon tetap valid) dan
+koordinat dibulatkan sesuai level. Setiap level ditulis sebagai GeoJSON
+(atau TopoJSON) terpisah, plus manifest.json berisi rentang zoom, toleransi, ukuran file
+dan jumlah feature per level.
+
+Usage:
+    python scripts/generate-lod-pyramid.py
+    python scripts/generate-lod-pyramid.py --layers provinsi
+    python scripts/generate-lod-pyramid.py --format topojson
+
+Output:
+    frontend/lod/manifest.json
+    frontend/lod/<layer>.lod<N>.geojson (atau .topojson)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import geopandas as gpd
+    from geojson_writer import FORMATS, LOD_LEVELS, frame_features, write_layer
+    from transmigrasi_layer import (SHAPEFILE_PATH, TEMPLATE_PATH, iter_village_chunks, load_template,
+                                    select_villages, village_properties)
+    from village_store import STORE_DIR, read_manifest, shapefile_available
+except ImportError:
+    print("ERROR: geopandas, shapely dan pyarrow diperlukan.")
+    print("Install: pip install geopandas shapely fiona pyproj pyarrow")
+    sys.exit(1)
+
+# Paths
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+PROVINSI_PATH = os.path.join(ROOT_DIR, "frontend", "provinsi.json")
+TRANSMIGRASI_PATH = os.path.join(ROOT_DIR, "frontend", "data-kawasan-transmigrasi.geojson")
+OUTPUT_DIR = os.path.join(ROOT_DIR, "frontend", "lod")
+
+LAYERS = ["provinsi", "transmigrasi"]
+
+
+def frame_properties(row):
+    """Properti feature apa adanya (semua kolom kecuali geometry)"""
+    properties = row._asdict()
+    properties.pop('geometry', None)
+    return {k: (v.item() if hasattr(v, 'item') else v) for k, v in properties.items()}
+
+
+def geojson_source(path):
+    """Layer dari file GeoJSON: fungsi level -> iterator Feature"""
+    gdf = gpd.read_file(path)
+
+    def features(level):
+        return frame_features(gdf, frame_properties, level["tolerance"], level["precision"])
+    return features, os.path.relpath(path, ROOT_DIR)
+
+
+def transmigrasi_source():
+    """Layer desa transmigrasi dari store (geometri asli), fallback ke GeoJSON frontend"""
+    if shapefile_available(SHAPEFILE_PATH) or read_manifest(STORE_DIR) is not None:
+        kode_desa_list, _ = load_template(TEMPLATE_PATH)
+        selection = select_villages(kode_desa_list, SHAPEFILE_PATH, STORE_DIR) if kode_desa_list else None
+        if selection is not None:
+            manifest, selected = selection
+
+            def features(level):
+                for gdf in iter_village_chunks(manifest, selected, STORE_DIR):
+                    yield from frame_features(gdf, village_properties, level["tolerance"], level["precision"])
+            return features, manifest["source"]
+
+    print(f"WARNING: Shapefile/store tidak tersedia, pakai {TRANSMIGRASI_PATH}")
+    print("         (level detail dibatasi oleh simplifikasi file tersebut)")
+    return geojson_source(TRANSMIGRASI_PATH)
+
+
+def build_layer(name, features, output_dir, fmt="geojson"):
+    """Tulis semua level satu layer, return entry manifest"""
+    files = []
+    for level in LOD_LEVELS:
+        filename = f"{name}.lod{level['level']}.{fmt}"
+        path = os.path.join(output_dir, filename)
+        start = time.time()
+        count = write_layer(path, features(level), fmt, name, level["precision"])
+        size = os.path.getsize(path)
+        files.append({
+            "level": level["level"],
+            "format": fmt,
+            "path": filename,
+            "bytes": size,
+            "features": count,
+        })
+        print(f"  {filename}: {count} features, {size / 1024:.1f} KB "
+              f"(tolerance={level['tolerance']}, {time.time() - start:.1f}s)")
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate LOD geometry pyramid")
+    parser.add_argument("--layers", nargs="+", choices=LAYERS, default=LAYERS)
+    parser.add_argument("--format", choices=FORMATS, default="geojson")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Generate LOD Geometry Pyramid")
+    print("=" * 60)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest_path = os.path.join(args.output_dir, "manifest.json")
+
+    # Layer yang tidak di-build ulang tetap dipertahankan di manifest
+    manifest = {"levels": LOD_LEVELS, "layers": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        if previous.get("levels") == LOD_LEVELS:
+            manifest["layers"] = previous.get("layers", {})
+
+    for name in args.layers:
+        print(f"\n[{name}]")
+        if name == "provinsi":
+            features, source = geojson_source(PROVINSI_PATH)
+        else:
+            features, source = transmigrasi_source()
+        manifest["layers"][name] = {
+            "source": source,
+            "files": build_layer(name, features, args.output_dir, args.format),
+        }
+
+    manifest["generated"] = time.strftime('%Y-%m-%d %H:%M:%S')
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"\nManifest: {manifest_path}")
+    print("Done!")
+
+
+if __name__ == '__main__':
+    main()
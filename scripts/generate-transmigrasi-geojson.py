@@ -6,183 +6,53 @@ Membaca file kawasan-transmigrasi.json (template data desa transmigrasi)
 dan mengekstrak geometri dari shapefile Batas_Wilayah_KelurahanDesa_10K_AR.shp
 untuk menghasilkan GeoJSON yang ringan untuk overlay di peta Leaflet.
 
+Shapefile dibaca lewat GeoParquet store (village_store.py); seleksi
+desa ada di transmigrasi_layer.py. Feature ditulis satu per satu
+(streaming, geojson_writer.py) dengan koordinat 2D yang dibulatkan ke
+COORD_PRECISION desimal.
+
+Dengan --format topojson output ditulis sebagai TopoJSON (border desa
+yang bersebelahan disimpan sekali, koordinat dikuantisasi).
+
 Usage:
     python scripts/generate-transmigrasi-geojson.py
+    python scripts/generate-transmigrasi-geojson.py --precision 6
+    python scripts/generate-transmigrasi-geojson.py --format topojson
 
 Output:
-    frontend/data-kawasan-transmigrasi.geojson
+    frontend/data-kawasan-transmigrasi.geojson (atau .topojson)
 """
 
+import argparse
 import json
 import os
 import sys
-import time
 
 try:
-    import geopandas as gpd
-    from shapely.geometry import mapping
+    from geojson_writer import COORD_PRECISION, FORMATS, SIMPLIFY_TOLERANCE, frame_features, write_layer
+    from transmigrasi_layer import (SHAPEFILE_PATH, TEMPLATE_PATH, iter_village_chunks, load_template,
+                                    select_villages, village_properties)
+    from village_store import STORE_DIR, read_manifest, shapefile_available
 except ImportError:
-    print("ERROR: geopandas dan shapely diperlukan.")
-    print("Install: pip install geopandas shapely fiona pyproj")
+    print("ERROR: geopandas, shapely dan pyarrow diperlukan.")
+    print("Install: pip install geopandas shapely fiona pyproj pyarrow")
     sys.exit(1)
 
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.dirname(SCRIPT_DIR)
-SHAPEFILE_PATH = os.path.join(ROOT_DIR, "data", "batas desa", "Batas_Wilayah_KelurahanDesa_10K_AR.shp")
-TEMPLATE_PATH = os.path.join(ROOT_DIR, "data", "kawasan-transmigrasi.json")
 OUTPUT_PATH = os.path.join(ROOT_DIR, "frontend", "data-kawasan-transmigrasi.geojson")
 
-# Geometry simplification tolerance (degrees, ~100m at equator)
-SIMPLIFY_TOLERANCE = 0.001
-
-
-def load_template():
-    """Load daftar kode desa transmigrasi dari template JSON."""
-    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    desa_list = data.get('desa_transmigrasi', [])
-    if not desa_list:
-        print("WARNING: Tidak ada desa dalam template kawasan-transmigrasi.json")
-        return [], []
-
-    # Build lookup: kdepum -> desa info
-    kode_list = []
-    desa_info = []
-    for d in desa_list:
-        # New format uses kdepum; fallback to kdebps for backward compat
-        kode = d.get('kdepum', d.get('kdebps', ''))
-        kode = str(kode).replace('.', '').replace(' ', '').strip()
-        if kode and kode != 'nan':
-            kode_list.append(kode)
-            desa_info.append(d)
-
-    print(f"Template: {len(kode_list)} desa transmigrasi")
-    return kode_list, desa_info
-
-
-def extract_and_simplify(kode_desa_list):
-    """Extract desa geometries from shapefile and simplify."""
-    print(f"Loading shapefile: {SHAPEFILE_PATH}")
-    print("(File besar ~1.1GB, mohon tunggu...)")
-
-    start = time.time()
-    gdf = gpd.read_file(SHAPEFILE_PATH)
-    elapsed = time.time() - start
-    print(f"Shapefile loaded: {len(gdf)} desa dalam {elapsed:.1f}s")
-
-    # Normalize KDEPUM column (strip dots and spaces)
-    gdf['KDEPUM_NORM'] = gdf['KDEPUM'].astype(str).str.replace('.', '', regex=False).str.replace(' ', '', regex=False).str.strip()
-
-    # Filter to transmigration villages using KDEPUM
-    mask = gdf['KDEPUM_NORM'].isin(kode_desa_list)
-    filtered = gdf[mask].copy()
-
-    print(f"Matched: {len(filtered)} dari {len(kode_desa_list)} kode desa")
-
-    if len(filtered) == 0:
-        # Report unmatched codes for debugging
-        print("\nKode desa yang tidak ditemukan:")
-        for k in kode_desa_list[:10]:
-            print(f"  - {k}")
-        return None
-
-    # Report unmatched
-    matched_pum = set(gdf[mask]['KDEPUM_NORM'].tolist())
-    unmatched = set(kode_desa_list) - matched_pum
-    if unmatched:
-        print(f"\nPeringatan: {len(unmatched)} kode desa tidak ditemukan di shapefile:")
-        for k in list(unmatched)[:10]:
-            print(f"  - {k}")
-
-    # Simplify geometry for web performance
-    print(f"Simplifying geometry (tolerance={SIMPLIFY_TOLERANCE})...")
-    filtered['geometry'] = filtered['geometry'].simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
-
-    # Drop Z coordinate if present (Leaflet doesn't need Z)
-    from shapely.ops import transform as shapely_transform
-    def drop_z(geom):
-        from shapely.geometry import shape
-        from shapely import wkt
-        return shape(json.loads(json.dumps(mapping(geom))))  # Round-trip removes Z
 
-    # Helper to sanitize NaN/None values for JSON
-    import math
-    def safe_str(val, default=''):
-        if val is None:
-            return default
-        s = str(val)
-        if s in ('nan', 'NaN', 'None', ''):
-            return default
-        return s
+def iter_features(manifest, selected, tolerance=SIMPLIFY_TOLERANCE, precision=COORD_PRECISION):
+    """
+    Yield Feature GeoJSON (string) per desa
 
-    def safe_float(val, default=0):
-        if val is None:
-            return default
-        try:
-            f = float(val)
-            return default if math.isnan(f) or math.isinf(f) else round(f, 2)
-        except (ValueError, TypeError):
-            return default
-
-    # Build GeoJSON manually to control output
-    features = []
-    for _, row in filtered.iterrows():
-        geom = row['geometry']
-        # Remove Z coordinates by converting through GeoJSON
-        geom_json = mapping(geom)
-        # Strip Z values from coordinates
-        geom_json = strip_z_coordinates(geom_json)
-
-        nama = safe_str(row.get('WADMKD')) or safe_str(row.get('NAMOBJ'))
-
-        feature = {
-            "type": "Feature",
-            "properties": {
-                "kode_desa": safe_str(row.get('KDEPUM')) or safe_str(row.get('KDEBPS')),
-                "nama_desa": nama,
-                "kecamatan": safe_str(row.get('WADMKC')),
-                "kabupaten": safe_str(row.get('WADMKK')),
-                "provinsi": safe_str(row.get('WADMPR')),
-                "luas_km2": safe_float(row.get('LUAS'))
-            },
-            "geometry": geom_json
-        }
-        features.append(feature)
-
-    geojson = {
-        "type": "FeatureCollection",
-        "features": features
-    }
-
-    return geojson
-
-
-def strip_z_coordinates(geom):
-    """Recursively strip Z coordinates from GeoJSON geometry."""
-    geom_type = geom.get('type', '')
-    coords = geom.get('coordinates')
-
-    if coords is None:
-        # GeometryCollection
-        if 'geometries' in geom:
-            geom['geometries'] = [strip_z_coordinates(g) for g in geom['geometries']]
-        return geom
-
-    def strip_z_from_coord(coord):
-        """Strip Z from a single coordinate tuple."""
-        if isinstance(coord, (list, tuple)):
-            if len(coord) > 0 and isinstance(coord[0], (int, float)):
-                # This is a coordinate point [x, y] or [x, y, z]
-                return list(coord[:2])
-            else:
-                # This is a list of coordinates
-                return [strip_z_from_coord(c) for c in coord]
-        return coord
-
-    geom['coordinates'] = strip_z_from_coord(coords)
-    return geom
+    Geometri dibaca dari store per chunk FID, jadi memori tetap konstan
+    berapa pun jumlah desa yang diekspor.
+    """
+    for gdf in iter_village_chunks(manifest, selected, STORE_DIR):
+        yield from frame_features(gdf, village_properties, tolerance, precision)
 
 
 def generate_demo_geojson():
@@ -244,45 +114,61 @@ def generate_demo_geojson():
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate kawasan transmigrasi GeoJSON")
+    parser.add_argument("--precision", type=int, default=COORD_PRECISION,
+                        help="Desimal koordinat output (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=SIMPLIFY_TOLERANCE,
+                        help="Toleransi simplifikasi dalam derajat (default: %(default)s)")
+    parser.add_argument("--format", choices=FORMATS, default="geojson")
+    parser.add_argument("--output", default=None,
+                        help="Default: frontend/data-kawasan-transmigrasi.<format>")
+    args = parser.parse_args()
+    output = args.output or os.path.splitext(OUTPUT_PATH)[0] + "." + args.format
+
     print("=" * 60)
     print("Generate Kawasan Transmigrasi GeoJSON")
     print("=" * 60)
 
-    # Check if shapefile exists
-    shapefile_exists = os.path.exists(SHAPEFILE_PATH)
+    # Check if shapefile (atau store GeoParquet hasil konversinya) exists
+    shapefile_exists = shapefile_available(SHAPEFILE_PATH) or read_manifest(STORE_DIR) is not None
     if not shapefile_exists:
         print(f"WARNING: Shapefile tidak ditemukan: {SHAPEFILE_PATH}")
 
     # Load template
-    kode_desa_list, desa_info = load_template()
+    kode_desa_list, desa_info = load_template(TEMPLATE_PATH)
 
+    selection = None
     if kode_desa_list and shapefile_exists:
         # Extract real data from shapefile
-        geojson = extract_and_simplify(kode_desa_list)
-        if geojson is None:
+        selection = select_villages(kode_desa_list, SHAPEFILE_PATH, STORE_DIR)
+        if selection is None:
             print("\nFallback ke demo GeoJSON...")
-            geojson = generate_demo_geojson()
+
+    if selection is not None:
+        manifest, selected = selection
+        print(f"Simplifying geometry (tolerance={args.tolerance}, precision={args.precision})...")
+        features = iter_features(manifest, selected, args.tolerance, args.precision)
     else:
         # Generate demo data
-        geojson = generate_demo_geojson()
+        features = (json.dumps(f, ensure_ascii=False, separators=(',', ':'))
+                    for f in generate_demo_geojson()['features'])
 
     # Add metadata from kawasan-transmigrasi.json
+    metadata = None
     try:
         with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
             tmpl = json.load(f)
-        if 'metadata' in tmpl:
-            geojson['metadata'] = tmpl['metadata']
-    except:
+        metadata = tmpl.get('metadata')
+    except (OSError, ValueError):
         pass
 
     # Write output
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(geojson, f, ensure_ascii=False)
+    count = write_layer(output, features, args.format, "transmigrasi", args.precision, metadata)
 
-    file_size = os.path.getsize(OUTPUT_PATH)
-    print(f"\nOutput: {OUTPUT_PATH}")
+    file_size = os.path.getsize(output)
+    print(f"\nOutput: {output}")
     print(f"Size: {file_size / 1024:.1f} KB")
-    print(f"Features: {len(geojson['features'])}")
+    print(f"Features: {count}")
     print("Done!")
 
 
@@ -0,0 +1,258 @@
+"""
+Generate Vector Tiles (MVT) for All Villages
+============================================
+
+Merender seluruh desa di shapefile BIG (~83 ribu polygon, lewat
+GeoParquet store village_store.py) menjadi Mapbox Vector Tile per zoom,
+dikemas dalam satu archive MBTiles.
+
+Per zoom:
+- geometri (Web Mercator) di-simplify dengan toleransi satu unit tile
+  (tile / EXTENT) secara vektor, desa yang lebih kecil dari satu piksel
+  layar dibuang
+- setiap desa di-assign ke semua tile yang bersinggungan dengan bbox-nya
+  (plus buffer), tile dikelompokkan per metatile 8x8
+- metatile dirender paralel di process pool: clip ke tile + buffer,
+  encode MVT, gzip
+
+Atribut minimal per feature: kode (KDEPUM), nama, transmigrasi (1 jika
+kode ada di data/kawasan-transmigrasi.json).
+
+Usage:
+    python scripts/generate-village-tiles.py
+    python scripts/generate-village-tiles.py --min-zoom 8 --max-zoom 13 --workers 8
+
+Output:
+    data/tiles/desa.mbtiles (sajikan dengan scripts/serve-tiles.py)
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import mapbox_vector_tile
+    import numpy as np
+    import shapely
+    from mapbox_vector_tile.encoder import on_invalid_geometry_make_valid
+    from mbtiles import MBTilesWriter
+    from transmigrasi_layer import TEMPLATE_PATH, load_template, normalize_codes, safe_str
+    from village_store import SHAPEFILE_PATH, STORE_DIR, ensure_store, load_geodataframe
+except ImportError:
+    print("ERROR: geopandas, shapely, pyarrow dan mapbox-vector-tile diperlukan.")
+    print("Install: pip install geopandas shapely pyproj pyarrow mapbox-vector-tile")
+    sys.exit(1)
+
+# Paths
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+OUTPUT_PATH = os.path.join(ROOT_DIR, "data", "tiles", "desa.mbtiles")
+
+LAYER_NAME = "desa"
+TILE_COLUMNS = ['KDEPUM', 'NAMOBJ']
+
+# Di bawah zoom 8 desa lebih kecil dari beberapa piksel; pakai layer provinsi
+MIN_ZOOM = 8
+MAX_ZOOM = 12
+
+# Resolusi tile MVT dan buffer di sekeliling tile (unit tile)
+EXTENT = 4096
+BUFFER = 64
+
+# Desa dengan luas < MIN_AREA_PX piksel layar (tile 256px) tidak dirender
+MIN_AREA_PX = 1.0
+
+# Batas Web Mercator (EPSG:3857)
+ORIGIN = 20037508.342789244
+
+# Sisi metatile (tile per job worker)
+METATILE = 8
+
+
+def tile_size(z):
+    """Sisi tile dalam meter Web Mercator"""
+    return 2 * ORIGIN / (1 << z)
+
+
+def tile_bounds(z, x, y):
+    """(minx, miny, maxx, maxy) tile XYZ dalam Web Mercator"""
+    size = tile_size(z)
+    minx = -ORIGIN + x * size
+    maxy = ORIGIN - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def assign_tiles(bounds, z, pad):
+    """
+    Pasangan (feature, tile) untuk semua tile yang beririsan dengan bbox + pad
+
+    Returns:
+        (index feature, x tile, y tile) sebagai array NumPy
+    """
+    size = tile_size(z)
+    last = (1 << z) - 1
+    x0 = np.clip(np.floor((bounds[:, 0] - pad + ORIGIN) / size), 0, last).astype(np.int64)
+    x1 = np.clip(np.floor((bounds[:, 2] + pad + ORIGIN) / size), 0, last).astype(np.int64)
+    y0 = np.clip(np.floor((ORIGIN - bounds[:, 3] - pad) / size), 0, last).astype(np.int64)
+    y1 = np.clip(np.floor((ORIGIN - bounds[:, 1] + pad) / size), 0, last).astype(np.int64)
+
+    nx = x1 - x0 + 1
+    counts = nx * (y1 - y0 + 1)
+    feature = np.repeat(np.arange(len(bounds)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return feature, x0[feature] + offset % nx[feature], y0[feature] + offset // nx[feature]
+
+
+def render_metatile(job):
+    """
+    Worker: render semua tile dalam satu metatile
+
+    Args:
+        job: (z, wkb geometri, properties, [(x, y, posisi feature di job)])
+
+    Returns:
+        List (z, x, y, gzip PBF)
+    """
+    z, wkbs, properties, tiles = job
+    geoms = shapely.from_wkb(wkbs)
+    pad = tile_size(z) * BUFFER / EXTENT
+    rendered = []
+    for x, y, positions in tiles:
+        minx, miny, maxx, maxy = tile_bounds(z, x, y)
+        clipped = shapely.clip_by_rect(geoms[positions], minx - pad, miny - pad, maxx + pad, maxy + pad)
+        features = [
+            {"geometry": geom, "properties": properties[pos]}
+            for geom, pos in zip(clipped, positions)
+            if not geom.is_empty
+        ]
+        if not features:
+            continue
+        data = mapbox_vector_tile.encode(
+            [{"name": LAYER_NAME, "features": features}],
+            default_options={
+                "quantize_bounds": (minx, miny, maxx, maxy),
+                "extents": EXTENT,
+                "on_invalid_geometry": on_invalid_geometry_make_valid,
+            },
+        )
+        rendered.append((z, x, y, gzip.compress(data, 6)))
+    return rendered
+
+
+def iter_jobs(z, geoms, properties):
+    """Simplify untuk zoom z, assign ke tile, kelompokkan per metatile"""
+    unit = tile_size(z) / EXTENT
+    geoms = shapely.simplify(geoms, unit, preserve_topology=True)
+
+    # Satu piksel layar = EXTENT / 256 unit tile
+    pixel = unit * EXTENT / 256
+    keep = np.flatnonzero(~shapely.is_empty(geoms) & (shapely.area(geoms) >= MIN_AREA_PX * pixel * pixel))
+
+    feature, tx, ty = assign_tiles(shapely.bounds(geoms[keep]), z, unit * BUFFER)
+    feature = keep[feature]
+
+    order = np.lexsort((ty, tx, ty // METATILE, tx // METATILE))
+    feature, tx, ty = feature[order], tx[order], ty[order]
+    meta = (tx // METATILE) * (1 << z) + ty // METATILE
+    tile_key = tx * (1 << z) + ty
+
+    meta_starts = np.flatnonzero(np.r_[True, meta[1:] != meta[:-1]])
+    meta_ends = np.r_[meta_starts[1:], len(meta)]
+    for start, end in zip(meta_starts, meta_ends):
+        members, local = np.unique(feature[start:end], return_inverse=True)
+        keys = tile_key[start:end]
+        tile_starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        tile_ends = np.r_[tile_starts[1:], len(keys)]
+        tiles = [
+            (int(tx[start + a]), int(ty[start + a]), local[a:b])
+            for a, b in zip(tile_starts, tile_ends)
+        ]
+        yield (z, shapely.to_wkb(geoms[members]), [properties[i] for i in members], tiles)
+
+
+def load_villages():
+    """Semua desa dari store, diproyeksikan ke Web Mercator, + properti minimal"""
+    manifest = ensure_store(SHAPEFILE_PATH, STORE_DIR)
+    start = time.time()
+    gdf = load_geodataframe(TILE_COLUMNS, store_dir=STORE_DIR, manifest=manifest)
+    if gdf.crs is None:
+        gdf = gdf.set_crs(4326)
+    lonlat_bounds = [float(v) for v in gdf.to_crs(4326).total_bounds]
+    gdf = gdf.to_crs(3857)
+    print(f"Store loaded: {len(gdf):,} desa dalam {time.time() - start:.1f}s")
+
+    transmigrasi = set()
+    if os.path.exists(TEMPLATE_PATH):
+        transmigrasi = set(load_template(TEMPLATE_PATH)[0])
+    flags = normalize_codes(gdf['KDEPUM']).isin(transmigrasi).to_numpy()
+
+    properties = [
+        {"kode": safe_str(kode), "nama": safe_str(nama), "transmigrasi": int(flag)}
+        for kode, nama, flag in zip(gdf['KDEPUM'], gdf['NAMOBJ'], flags)
+    ]
+    geoms = shapely.force_2d(gdf.geometry.values)
+    return np.asarray(geoms), properties, lonlat_bounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all BIG villages into an MBTiles vector tile archive")
+    parser.add_argument("--min-zoom", type=int, default=MIN_ZOOM)
+    parser.add_argument("--max-zoom", type=int, default=MAX_ZOOM)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah core)")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Generate Village Vector Tiles (MVT)")
+    print("=" * 60)
+
+    try:
+        geoms, properties, bounds = load_villages()
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    writer = MBTilesWriter(args.output)
+    total_bytes = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for z in range(args.min_zoom, args.max_zoom + 1):
+            start = time.time()
+            count = 0
+            for rendered in pool.map(render_metatile, iter_jobs(z, geoms, properties)):
+                for tile in rendered:
+                    writer.put(*tile)
+                    total_bytes += len(tile[3])
+                    count += 1
+            print(f"  z{z}: {count:,} tiles ({time.time() - start:.1f}s)")
+
+    writer.close({
+        "name": "Desa BIG",
+        "format": "pbf",
+        "type": "overlay",
+        "version": "1",
+        "description": "Batas desa/kelurahan BIG (Batas_Wilayah_KelurahanDesa_10K_AR)",
+        "minzoom": str(args.min_zoom),
+        "maxzoom": str(args.max_zoom),
+        "bounds": ",".join(f"{v:.6f}" for v in bounds),
+        "center": f"{(bounds[0] + bounds[2]) / 2:.6f},{(bounds[1] + bounds[3]) / 2:.6f},{args.min_zoom}",
+        "json": {
+            "vector_layers": [{
+                "id": LAYER_NAME,
+                "fields": {"kode": "String", "nama": "String", "transmigrasi": "Number"},
+                "minzoom": args.min_zoom,
+                "maxzoom": args.max_zoom,
+            }]
+        },
+    })
+
+    print(f"\nOutput: {args.output}")
+    print(f"Tiles: {writer.count:,} ({total_bytes / 1024 / 1024:.1f} MB gzip)")
+    print("Done!")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Streaming GeoJSON writer
+========================
+
+Helper bersama untuk script yang menulis layer GeoJSON ke frontend:
+- prepare_geometries() dan LOD_LEVELS: simplify, drop Z dan quantize
+  koordinat secara vektor (Shapely 2 / NumPy); didefinisikan di
+  backend/shared/lod.py karena geo-service memakai yang sama
+- frame_features(): GeoDataFrame -> string Feature per baris
+- write_feature_collection(): tulis FeatureCollection satu feature per
+  baris, memori konstan berapa pun jumlah feature
+- write_topology(): tulis TopoJSON (arc bersama disimpan sekali,
+  koordinat dikuantisasi dan di-delta-encode), butuh paket `topojson`
+
+Dipakai oleh generate-transmigrasi-geojson.py, generate-lod-pyramid.py dan
+admin_boundaries.py.
+"""
+
+import json
+import math
+import os
+import sys
+
+import shapely
+
+# LOD_LEVELS dan prepare_geometries dipakai bersama dengan geo-service
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "shared"))
+from lod import LOD_LEVELS, prepare_geometries  # noqa: E402
+
+# Geometry simplification tolerance (degrees, ~100m at equator)
+SIMPLIFY_TOLERANCE = 0.001
+
+# Desimal koordinat output (5 desimal ~1.1m di ekuator)
+COORD_PRECISION = 5
+
+FORMATS = ("geojson", "topojson")
+
+
+def feature_json(properties, geometry):
+    """Satu Feature GeoJSON (compact) dari dict properties dan string geometri"""
+    return ('{"type":"Feature","properties":'
+            + json.dumps(properties, ensure_ascii=False, separators=(',', ':'))
+            + ',"geometry":' + geometry + '}')
+
+
+def frame_features(gdf, properties, tolerance=SIMPLIFY_TOLERANCE, precision=COORD_PRECISION):
+    """
+    Yield Feature GeoJSON (string) untuk setiap baris GeoDataFrame
+
+    Args:
+        properties: Fungsi row (namedtuple dari itertuples) -> dict properties
+    """
+    geometries = shapely.to_geojson(prepare_geometries(gdf.geometry.values, tolerance, precision))
+    for row, geometry in zip(gdf.itertuples(index=False), geometries):
+        yield feature_json(properties(row), geometry)
+
+
+def write_feature_collection(path, features, metadata=None):
+    """
+    Tulis FeatureCollection secara streaming (satu feature per baris)
+
+    Ditulis ke file sementara lalu di-rename, jadi output lama tetap utuh
+    jika proses gagal di tengah jalan.
+
+    Returns:
+        Jumlah feature yang ditulis
+    """
+    count = 0
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('{"type":"FeatureCollection","features":[')
+        for feature in features:
+            f.write(',\n' if count else '\n')
+            f.write(feature)
+            count += 1
+        f.write('\n]')
+        if metadata is not None:
+            f.write(',"metadata":' + json.dumps(metadata, ensure_ascii=False, separators=(',', ':')))
+        f.write('}\n')
+    os.replace(tmp_path, path)
+    return count
+
+
+def write_topology(path, features, object_name, precision=COORD_PRECISION, metadata=None):
+    """
+    Tulis feature sebagai TopoJSON
+
+    Border yang dipakai bersama oleh polygon bertetangga disimpan sekali
+    sebagai arc. Koordinat dikuantisasi ke grid integer yang resolusinya
+    sama dengan `precision` desimal, lalu arc di-delta-encode. Berbeda
+    dengan write_feature_collection(), semua feature ditampung di memori
+    (topologi butuh seluruh geometri).
+
+    Returns:
+        Jumlah feature yang ditulis
+    """
+    import topojson
+
+    collection = {"type": "FeatureCollection", "features": [json.loads(f) for f in features]}
+    count = len(collection["features"])
+    if count:
+        bounds = shapely.total_bounds(shapely.from_geojson([json.dumps(f["geometry"]) for f in collection["features"]]))
+        span = max(bounds[2] - bounds[0], bounds[3] - bounds[1])
+        quantization = max(2, math.ceil(span * 10 ** precision) + 1)
+        topology = topojson.Topology(collection, prequantize=quantization, object_name=object_name).to_dict()
+    else:
+        topology = {"type": "Topology", "objects": {object_name: {"type": "GeometryCollection", "geometries": []}},
+                    "arcs": []}
+    if metadata is not None:
+        topology["metadata"] = metadata
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(topology, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return count
+
+
+def write_layer(path, features, fmt="geojson", object_name="data", precision=COORD_PRECISION, metadata=None):
+    """Tulis feature sebagai GeoJSON (streaming) atau TopoJSON sesuai `fmt`"""
+    if fmt == "topojson":
+        return write_topology(path, features, object_name, precision, metadata)
+    return write_feature_collection(path, features, metadata)
@@ -0,0 +1,89 @@
+"""
+MBTiles (SQLite) reader/writer
+==============================
+
+Implementasi minimal spesifikasi MBTiles 1.3 untuk vector tile:
+tabel `tiles` (zoom_level, tile_column, tile_row, tile_data) dengan
+tile_row dalam skema TMS (y dibalik), dan tabel `metadata` (name, value).
+Tile disimpan apa adanya (PBF yang sudah di-gzip).
+
+Dipakai oleh generate-village-tiles.py dan serve-tiles.py.
+"""
+
+import json
+import os
+import sqlite3
+
+
+def tms_row(z, y):
+    """Konversi y XYZ (Leaflet/OSM) ke tile_row TMS (MBTiles)"""
+    return (1 << z) - 1 - y
+
+
+class MBTilesWriter:
+    """
+    Tulis MBTiles ke file sementara, rename ke path tujuan saat close()
+
+    Insert di-batch per transaksi; archive lama tetap utuh sampai build
+    selesai.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.batch_size = batch_size
+        self.count = 0
+        self._pending = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        self.conn = sqlite3.connect(self.tmp_path)
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("PRAGMA journal_mode=MEMORY")
+        self.conn.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+        self.conn.execute("CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, "
+                          "tile_row INTEGER, tile_data BLOB)")
+
+    def put(self, z, x, y, data):
+        """Simpan satu tile (koordinat XYZ)"""
+        self.conn.execute("INSERT INTO tiles VALUES (?, ?, ?, ?)", (z, x, tms_row(z, y), data))
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.conn.commit()
+            self._pending = 0
+
+    def close(self, metadata):
+        """Tulis metadata, buat index, lalu pindahkan ke path tujuan"""
+        self.conn.executemany("INSERT INTO metadata VALUES (?, ?)",
+                              [(k, v if isinstance(v, str) else json.dumps(v)) for k, v in metadata.items()])
+        self.conn.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+        self.conn.execute("CREATE UNIQUE INDEX name ON metadata (name)")
+        self.conn.commit()
+        self.conn.close()
+        os.replace(self.tmp_path, self.path)
+
+
+class MBTilesReader:
+    """Akses tile read-only; satu koneksi dipakai bersama oleh thread server"""
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"MBTiles tidak ditemukan: {path}")
+        self.path = path
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+    def get(self, z, x, y):
+        """Tile (bytes, gzip PBF) untuk koordinat XYZ, atau None"""
+        row = self.conn.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, tms_row(z, y))
+        ).fetchone()
+        return row[0] if row else None
+
+    def metadata(self):
+        return dict(self.conn.execute("SELECT name, value FROM metadata").fetchall())
+
+    def close(self):
+        self.conn.close()
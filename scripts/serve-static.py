@@ -0,0 +1,217 @@
+"""
+Local Static Server with HTTP Range Requests
+============================================
+
+Menyajikan file statis (mis. data/fgb/*.fgb hasil generate-flatgeobuf.py)
+dengan dukungan header Range, sehingga klien FlatGeobuf (flatgeobuf.js,
+GDAL /vsicurl/, scripts/flatgeobuf_reader.py) hanya mengunduh header,
+node index dan feature yang beririsan dengan bbox. http.server bawaan
+Python selalu mengirim file utuh.
+
+- Range satu rentang (bytes=a-b, bytes=a-, bytes=-n) -> 206 Partial Content
+- Range di luar ukuran file -> 416; multi-range dilayani sebagai 200 file utuh
+- CORS terbuka, header Content-Range/Accept-Ranges di-expose ke browser
+- GET /_stats: jumlah request dan byte yang sudah dikirim (untuk benchmark)
+
+Usage:
+    python scripts/serve-static.py
+    python scripts/serve-static.py --directory frontend --port 8091
+"""
+
+import argparse
+import email.utils
+import json
+import mimetypes
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+STATIC_DIR = os.path.join(ROOT_DIR, "data", "fgb")
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+CONTENT_TYPES = {
+    ".fgb": "application/octet-stream",
+    ".geojson": "application/geo+json",
+    ".topojson": "application/json",
+    ".pbf": "application/x-protobuf",
+}
+
+COPY_BUFFER = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    (start, end) inklusif untuk header Range satu rentang
+
+    Returns:
+        None jika header tidak dipakai (kosong, multi-range, bukan bytes),
+        atau "invalid" jika rentang tidak bisa dipenuhi (416)
+    """
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return "invalid"
+    if not first:
+        # bytes=-n: n byte terakhir
+        length = int(last)
+        if length == 0:
+            return "invalid"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return "invalid"
+    return start, end
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    directory = STATIC_DIR
+    stats = {"requests": 0, "bytes": 0}
+    stats_lock = threading.Lock()
+
+    def _cors(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "Range")
+        self.send_header("Access-Control-Expose-Headers", "Accept-Ranges, Content-Range, Content-Length")
+
+    def _error(self, status, message):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self._cors()
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _resolve(self, url_path):
+        """Path file di bawah `directory`, None jika keluar dari root"""
+        root = os.path.realpath(self.directory)
+        path = os.path.realpath(os.path.join(root, unquote(url_path).lstrip("/")))
+        if path != root and not path.startswith(root + os.sep):
+            return None
+        return path
+
+    def _record(self, sent):
+        with self.stats_lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += sent
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors()
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, OPTIONS")
+        self.end_headers()
+
+    def do_GET(self):
+        url_path = self.path.split("?", 1)[0]
+        if url_path == "/_stats":
+            with self.stats_lock:
+                body = json.dumps(self.stats).encode("utf-8")
+            self.send_response(200)
+            self._cors()
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+            return
+
+        path = self._resolve(url_path)
+        if path is None or not os.path.isfile(path):
+            self._error(404, "Not found")
+            return
+
+        stat = os.stat(path)
+        size = stat.st_size
+        byte_range = parse_range(self.headers.get("Range"), size)
+        if byte_range == "invalid":
+            self.send_response(416)
+            self._cors()
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if byte_range is None:
+            status, start, end = 200, 0, size - 1
+        else:
+            status, (start, end) = 206, byte_range
+        length = max(end - start + 1, 0)
+
+        ext = os.path.splitext(path)[1].lower()
+        content_type = CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+        self.send_response(status)
+        self._cors()
+        self.send_header("Content-Type", content_type)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Last-Modified", email.utils.formatdate(stat.st_mtime, usegmt=True))
+        self.send_header("Content-Length", str(length))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if self.command == "HEAD" or length == 0:
+            return
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(COPY_BUFFER, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+        self._record(length - remaining)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        # Tampilkan rentang yang diminta supaya pola akses index terlihat
+        byte_range = self.headers.get("Range") if hasattr(self, "headers") else None
+        suffix = f" [{byte_range}]" if byte_range else ""
+        super().log_message(format + suffix, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve static files with HTTP range request support")
+    parser.add_argument("--directory", default=STATIC_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--quiet", action="store_true", help="Jangan log setiap request")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        print(f"ERROR: Direktori tidak ditemukan: {args.directory}")
+        print("Jalankan dulu: python scripts/generate-flatgeobuf.py")
+        sys.exit(1)
+
+    RangeHandler.directory = args.directory
+    if args.quiet:
+        RangeHandler.log_message = lambda self, *a: None
+
+    server = ThreadingHTTPServer((args.host, args.port), RangeHandler)
+    print(f"Serving {args.directory}")
+    print(f"URL: http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Local Vector Tile Server
+========================
+
+Menyajikan tile dari archive MBTiles hasil generate-village-tiles.py
+untuk development (Leaflet.VectorGrid, MapLibre, QGIS).
+
+Endpoint:
+    GET /tiles/{z}/{x}/{y}.pbf   tile MVT (gzip), 204 jika tile kosong
+    GET /tiles.json              TileJSON 3.0 (bounds, zoom, vector_layers)
+
+Usage:
+    python scripts/serve-tiles.py
+    python scripts/serve-tiles.py --mbtiles data/tiles/desa.mbtiles --port 8090
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mbtiles import MBTilesReader
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+MBTILES_PATH = os.path.join(ROOT_DIR, "data", "tiles", "desa.mbtiles")
+
+TILE_PATTERN = re.compile(r'^/tiles/(\d+)/(\d+)/(\d+)\.pbf$')
+
+
+def tilejson(metadata, base_url):
+    """TileJSON dari metadata MBTiles"""
+    doc = {
+        "tilejson": "3.0.0",
+        "name": metadata.get("name", ""),
+        "description": metadata.get("description", ""),
+        "tiles": [f"{base_url}/tiles/{{z}}/{{x}}/{{y}}.pbf"],
+        "minzoom": int(metadata.get("minzoom", 0)),
+        "maxzoom": int(metadata.get("maxzoom", 14)),
+    }
+    if "bounds" in metadata:
+        doc["bounds"] = [float(v) for v in metadata["bounds"].split(",")]
+    if "center" in metadata:
+        doc["center"] = [float(v) for v in metadata["center"].split(",")]
+    if "json" in metadata:
+        doc.update(json.loads(metadata["json"]))
+    return doc
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    reader = None
+
+    def _send(self, status, body=b"", content_type=None, headers=None):
+        self.send_response(status)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        match = TILE_PATTERN.match(path)
+        if match:
+            z, x, y = (int(v) for v in match.groups())
+            data = self.reader.get(z, x, y)
+            if data is None:
+                self._send(204)
+                return
+            self._send(200, data, "application/vnd.mapbox-vector-tile", {
+                "Content-Encoding": "gzip",
+                "Cache-Control": "public, max-age=86400",
+            })
+            return
+
+        if path == "/tiles.json":
+            base_url = f"http://{self.headers.get('Host', 'localhost')}"
+            body = json.dumps(tilejson(self.reader.metadata(), base_url)).encode("utf-8")
+            self._send(200, body, "application/json")
+            return
+
+        self._send(404, b'{"error": "Not found"}', "application/json")
+
+    do_HEAD = do_GET
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an MBTiles vector tile archive over HTTP")
+    parser.add_argument("--mbtiles", default=MBTILES_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    try:
+        TileHandler.reader = MBTilesReader(args.mbtiles)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        print("Jalankan dulu: python scripts/generate-village-tiles.py")
+        sys.exit(1)
+
+    server = ThreadingHTTPServer((args.host, args.port), TileHandler)
+    print(f"Serving {args.mbtiles}")
+    print(f"TileJSON: http://{args.host}:{args.port}/tiles.json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
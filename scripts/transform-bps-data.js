@@ -210,11 +210,25 @@ function transformBPSData(inputPath, outputPath) {
     });
 }
 
+/**
+ * Hasil scraping terbaru di data/ (nama file berisi timestamp scraping)
+ */
+function latestScrapingResult(dataDir) {
+    const files = fs.readdirSync(dataDir)
+        .filter(name => /^bps-scraping-results-\d{8}_\d{6}\.json$/.test(name))
+        .sort();
+    if (files.length === 0) {
+        throw new Error(`No bps-scraping-results-*.json found in ${dataDir}`);
+    }
+    return path.join(dataDir, files[files.length - 1]);
+}
+
 // Main execution
-const inputPath = path.join(__dirname, '../data/bps-scraping-results-20260205_083134.json');
+// Input: argumen pertama, atau hasil scrape.ipynb terbaru di data/
 const outputPath = path.join(__dirname, '../frontend/data-produksi-padi-bps.json');
 
 try {
+    const inputPath = process.argv[2] || latestScrapingResult(path.join(__dirname, '../data'));
     transformBPSData(inputPath, outputPath);
 } catch (error) {
     console.error('❌ Error during transformation:', error);
@@ -0,0 +1,138 @@
+"""
+Layer desa transmigrasi
+=======================
+
+Seleksi desa transmigrasi di GeoParquet store (village_store.py)
+berdasarkan kode KDEPUM di data/kawasan-transmigrasi.json, dan properti
+feature yang dipakai frontend.
+
+Kode desa dicari dulu di kolom atribut (tanpa geometri), lalu geometri
+hanya dibaca untuk FID desa yang terpilih, per chunk. Memori dan waktu
+sebanding dengan jumlah desa transmigrasi, bukan jumlah desa se-Indonesia.
+
+Dipakai oleh generate-transmigrasi-geojson.py dan generate-lod-pyramid.py.
+"""
+
+import json
+import math
+import os
+import time
+
+from village_store import SHAPEFILE_PATH, STORE_DIR, ensure_store, load_attributes, load_rows
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+TEMPLATE_PATH = os.path.join(ROOT_DIR, "data", "kawasan-transmigrasi.json")
+
+GEOMETRY_COLUMNS = ['KDEPUM', 'KDEBPS', 'WADMKD', 'NAMOBJ', 'WADMKC', 'WADMKK', 'WADMPR', 'LUAS']
+
+# Jumlah desa yang geometrinya dibaca per batch
+CHUNK_SIZE = 500
+
+
+def load_template(template_path=TEMPLATE_PATH):
+    """Load daftar kode desa transmigrasi dari template JSON."""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    desa_list = data.get('desa_transmigrasi', [])
+    if not desa_list:
+        print("WARNING: Tidak ada desa dalam template kawasan-transmigrasi.json")
+        return [], []
+
+    # Build lookup: kdepum -> desa info
+    kode_list = []
+    desa_info = []
+    for d in desa_list:
+        # New format uses kdepum; fallback to kdebps for backward compat
+        kode = d.get('kdepum', d.get('kdebps', ''))
+        kode = str(kode).replace('.', '').replace(' ', '').strip()
+        if kode and kode != 'nan':
+            kode_list.append(kode)
+            desa_info.append(d)
+
+    print(f"Template: {len(kode_list)} desa transmigrasi")
+    return kode_list, desa_info
+
+
+def normalize_codes(codes):
+    """Normalisasi KDEPUM (hapus titik dan spasi) dalam satu pass regex"""
+    return codes.astype(str).str.replace(r'[.\s]', '', regex=True)
+
+
+def safe_str(val, default=''):
+    """Sanitize NaN/None values for JSON"""
+    if val is None:
+        return default
+    s = str(val)
+    if s in ('nan', 'NaN', 'None', ''):
+        return default
+    return s
+
+
+def safe_float(val, default=0):
+    if val is None:
+        return default
+    try:
+        f = float(val)
+        return default if math.isnan(f) or math.isinf(f) else round(f, 2)
+    except (ValueError, TypeError):
+        return default
+
+
+def village_properties(row):
+    """Properti feature desa untuk frontend dari satu baris shapefile"""
+    return {
+        "kode_desa": safe_str(row.KDEPUM) or safe_str(row.KDEBPS),
+        "nama_desa": safe_str(row.WADMKD) or safe_str(row.NAMOBJ),
+        "kecamatan": safe_str(row.WADMKC),
+        "kabupaten": safe_str(row.WADMKK),
+        "provinsi": safe_str(row.WADMPR),
+        "luas_km2": safe_float(row.LUAS)
+    }
+
+
+def select_villages(kode_desa_list, shp_path=SHAPEFILE_PATH, store_dir=STORE_DIR):
+    """
+    Attribute-first: cari FID desa transmigrasi dari kolom KDEPUM saja
+
+    Returns:
+        (manifest, DataFrame atribut terpilih dengan index FID) atau None
+    """
+    start = time.time()
+    manifest = ensure_store(shp_path, store_dir)
+
+    attrs = load_attributes(['KDEPUM', 'WADMPR'], store_dir=store_dir, manifest=manifest)
+    codes = normalize_codes(attrs['KDEPUM'])
+    selected = attrs[codes.isin(kode_desa_list)].copy()
+    selected['KDEPUM_NORM'] = codes[selected.index]
+    elapsed = time.time() - start
+    print(f"Store scan: {len(attrs)} desa dalam {elapsed:.1f}s")
+
+    print(f"Matched: {len(selected)} dari {len(kode_desa_list)} kode desa")
+
+    if len(selected) == 0:
+        # Report unmatched codes for debugging
+        print("\nKode desa yang tidak ditemukan:")
+        for k in kode_desa_list[:10]:
+            print(f"  - {k}")
+        return None
+
+    # Report unmatched
+    matched_pum = set(selected['KDEPUM_NORM'].tolist())
+    unmatched = set(kode_desa_list) - matched_pum
+    if unmatched:
+        print(f"\nPeringatan: {len(unmatched)} kode desa tidak ditemukan di shapefile:")
+        for k in list(unmatched)[:10]:
+            print(f"  - {k}")
+
+    return manifest, selected
+
+
+def iter_village_chunks(manifest, selected, store_dir=STORE_DIR, chunk_size=CHUNK_SIZE):
+    """Yield GeoDataFrame (atribut + geometri) per chunk FID desa terpilih"""
+    for offset in range(0, len(selected), chunk_size):
+        chunk = selected.iloc[offset:offset + chunk_size]
+        provinces = sorted(chunk['WADMPR'].fillna('UNKNOWN').astype(str).unique())
+        yield load_rows(chunk.index, GEOMETRY_COLUMNS, provinces=provinces,
+                        store_dir=store_dir, manifest=manifest)
@@ -0,0 +1,121 @@
+"""
+Trigram index untuk pencocokan nama desa
+========================================
+
+Index n-gram (trigram) terbalik atas nama desa yang sudah dinormalisasi.
+Kandidat top-k diambil lewat hitungan trigram yang sama (vektor NumPy),
+lalu hanya kandidat itu yang di-rescore dengan similarity berbasis edit
+distance. Dengan begitu pencarian selalu mencakup semua desa di provinsi
+(tanpa sampling) dan tetap cepat.
+
+Dipakai oleh match-transmigrasi-desa.py.
+"""
+
+import re
+from collections import defaultdict
+
+import numpy as np
+
+try:
+    # Implementasi C, jauh lebih cepat dari fallback Python di bawah
+    from rapidfuzz.distance import Indel
+except ImportError:
+    Indel = None
+
+# Pola normalisasi nama desa (urutan penting)
+NORMALIZE_PATTERNS = [
+    (r'\s+SP\.?\s*\d+\w*', ''),  # SP. X
+    (r'\bUPT\b', ''),
+    (r'\bDESA\b', ''),
+    (r'\bKAMPUNG\b', ''),
+    (r'\bGAMPONG\b', ''),
+    (r'[^A-Z\s]', ''),           # karakter khusus
+    (r'\s+', ' '),               # spasi berlebih
+]
+_COMPILED_PATTERNS = [(re.compile(p), r) for p, r in NORMALIZE_PATTERNS]
+
+
+def normalize_name(name):
+    """Normalisasi nama desa untuk perbandingan"""
+    if not name or not isinstance(name, str):
+        return ""
+    name = name.upper().strip()
+    for pattern, replacement in _COMPILED_PATTERNS:
+        name = pattern.sub(replacement, name)
+    return name.strip()
+
+
+def similarity(a, b):
+    """
+    Similarity 0..1 berbasis edit distance (insert/delete):
+    2 * LCS / (len(a) + len(b)), skala yang sama dengan SequenceMatcher.ratio()
+    """
+    if not a and not b:
+        return 1.0
+    if Indel is not None:
+        return Indel.normalized_similarity(a, b)
+
+    # Fallback: LCS dengan DP satu baris
+    if len(a) < len(b):
+        a, b = b, a
+    previous = [0] * (len(b) + 1)
+    for ch in a:
+        current = [0]
+        for j, other in enumerate(b, 1):
+            if ch == other:
+                current.append(previous[j - 1] + 1)
+            else:
+                current.append(max(previous[j], current[j - 1]))
+        previous = current
+    return 2.0 * previous[-1] / (len(a) + len(b))
+
+
+def trigrams(text):
+    """Trigram dengan padding ("  X" di awal, "X " di akhir) agar nama pendek tetap punya trigram"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index trigram -> array posisi nama"""
+
+    def __init__(self, names):
+        self.names = list(names)
+        postings = defaultdict(list)
+        sizes = np.zeros(len(self.names), dtype=np.int32)
+        for i, name in enumerate(self.names):
+            grams = trigrams(name)
+            sizes[i] = len(grams)
+            for gram in grams:
+                postings[gram].append(i)
+        self._postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._sizes = sizes
+
+    def __len__(self):
+        return len(self.names)
+
+    def candidates(self, query, k=20):
+        """Posisi top-k nama dengan koefisien Dice trigram tertinggi"""
+        if not self.names:
+            return np.empty(0, dtype=np.int32)
+        grams = trigrams(query)
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if not hits:
+            return np.empty(0, dtype=np.int32)
+
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        scores = 2.0 * shared / (self._sizes + len(grams))
+        k = min(k, int(np.count_nonzero(shared)))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def search(self, query, k=20):
+        """
+        Top-k kandidat di-rescore dengan similarity()
+
+        Returns:
+            List (similarity, posisi) urut dari yang paling mirip
+        """
+        results = [(similarity(query, self.names[i]), int(i)) for i in self.candidates(query, k)]
+        results.sort(key=lambda x: (-x[0], x[1]))
+        return results
@@ -0,0 +1,506 @@
+"""
+Pencocokan desa transmigrasi dengan shapefile BIG
+=================================================
+
+Library + CLI untuk mencocokkan daftar desa transmigrasi (file JSON/CSV)
+dengan desa di shapefile BIG lewat GeoParquet store (village_store.py).
+
+- Matching per provinsi (shard) di process pool; worker hanya membaca
+  partisi provinsinya, hasil digabung sesuai urutan daftar input.
+- Setiap keputusan match di-cache dengan key (provinsi, nama desa,
+  versi shapefile). Run berikutnya hanya mencocokkan desa yang baru
+  atau berubah; jika shapefile berubah, semua desa dicocokkan ulang.
+
+Format daftar desa:
+    JSON: {"Aceh": ["ALUE KEUMUNENG", ...], ...}
+    CSV:  kolom provinsi,desa
+
+Output (di --output-dir, default data/):
+    transmigrasi-matched.json, transmigrasi-matching-report.json,
+    transmigrasi-no-match.json, kawasan-transmigrasi.json
+
+Usage:
+    python scripts/village_matching.py
+    python scripts/village_matching.py --villages data/desa-transmigrasi.json --workers 1
+    python scripts/village_matching.py --rebuild-cache
+
+    >>> from village_matching import load_village_list, run_matching
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from village_index import normalize_name, similarity
+from village_store import SHAPEFILE_PATH, STORE_DIR, ensure_store, match_provinces
+from village_table import load_village_table
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+VILLAGES_PATH = os.path.join(ROOT_DIR, "data", "desa-transmigrasi.json")
+OUTPUT_DIR = os.path.join(ROOT_DIR, "data")
+MATCH_CACHE_PATH = os.path.join(ROOT_DIR, "data", "cache", "village-match-cache.json")
+
+# Jumlah kandidat trigram yang di-rescore per desa (fuzzy match)
+CANDIDATES_K = 20
+
+# Naikkan jika logika matching berubah (meng-invalidate cache keputusan)
+MATCHER_VERSION = 1
+
+PROVINCE_MAPPING = {
+    "ACEH": "Aceh",
+    "SUMATERA BARAT": "Sumatera Barat",
+    "SUMATRA BARAT": "Sumatera Barat",
+    "RIAU": "Riau",
+    "JAMBI": "Jambi",
+    "SUMATERA SELATAN": "Sumatera Selatan",
+    "SUMATRA SELATAN": "Sumatera Selatan",
+    "BENGKULU": "Bengkulu",
+    "KEPULAUAN BANGKA BELITUNG": "Kepulauan Bangka Belitung",
+    "BANGKA BELITUNG": "Kepulauan Bangka Belitung",
+    "NUSA TENGGARA BARAT": "Nusa Tenggara Barat",
+    "NUSA TENGGARA TIMUR": "Nusa Tenggara Timur",
+    "KALIMANTAN BARAT": "Kalimantan Barat",
+    "KALIMANTAN TENGAH": "Kalimantan Tengah",
+    "KALIMANTAN SELATAN": "Kalimantan Selatan",
+    "KALIMANTAN TIMUR": "Kalimantan Timur",
+    "KALIMANTAN UTARA": "Kalimantan Utara",
+    "SULAWESI UTARA": "Sulawesi Utara",
+    "SULAWESI TENGAH": "Sulawesi Tengah",
+    "SULAWESI SELATAN": "Sulawesi Selatan",
+    "SULAWESI TENGGARA": "Sulawesi Tenggara",
+    "GORONTALO": "Gorontalo",
+    "SULAWESI BARAT": "Sulawesi Barat",
+    "MALUKU": "Maluku",
+    "MALUKU UTARA": "Maluku Utara",
+    "PAPUA": "Papua",
+    "PAPUA BARAT": "Papua Barat",
+    "PAPUA SELATAN": "Papua Selatan",
+}
+
+
+def resolve_partitions(manifest, provinsi):
+    """Partisi store (nilai WADMPR) untuk provinsi di daftar, dengan fallback PROVINCE_MAPPING"""
+    partitions = match_provinces(manifest, [provinsi])
+    if not partitions:
+        # Coba variasi nama
+        for shp_name, list_name in PROVINCE_MAPPING.items():
+            if list_name == provinsi:
+                partitions = match_provinces(manifest, [shp_name])
+                if partitions:
+                    break
+    return partitions
+
+
+def match_village(table, prov_keys, prov_rows, prov_index, provinsi, desa_trans, log):
+    """
+    Cocokkan satu desa transmigrasi dengan desa di provinsinya
+
+    Returns:
+        (kategori report, entry report, entry matched_codes atau None)
+    """
+    villages = table.frame
+    gdf_prov = villages.iloc[prov_rows]
+    desa_norm = normalize_name(desa_trans)
+
+    # Step 1: Exact match (NAMOBJ) lewat hash index
+    exact_pos = table.exact_lookup(prov_keys, desa_trans)
+
+    if exact_pos is not None:
+        row = villages.iloc[exact_pos]
+        log.append(f"  ✅ EXACT: '{desa_trans}' → {row['NAMOBJ']} ({row['KDEPUM']}) [{row['WADMKK']}, {row['WADMKC']}]")
+        return 'exact_match', {
+            'provinsi': provinsi,
+            'desa_trans': desa_trans,
+            'desa_shp': row['NAMOBJ'],
+            'kdepum': row['KDEPUM'],
+            'kabupaten': row['WADMKK'],
+            'kecamatan': row['WADMKC']
+        }, {
+            'kdepum': row['KDEPUM'],
+            'nama_desa': row['NAMOBJ'],
+            'provinsi': provinsi,
+            'kabupaten': str(row.get('WADMKK', '')),
+            'kecamatan': str(row.get('WADMKC', '')),
+            'match_type': 'exact'
+        }
+
+    # Step 2: Contains match
+    contains = gdf_prov[gdf_prov['NAME_UPPER'].str.contains(desa_norm, regex=False)]
+
+    if not contains.empty and len(desa_norm) >= 4:
+        # Jika ada multiple match, ambil yang paling mirip
+        best_sim = 0
+        best_row = None
+        for row in contains.itertuples(index=False):
+            sim = similarity(desa_norm, row.NAME_NORM)
+            if sim > best_sim:
+                best_sim = sim
+                best_row = row._asdict()
+
+        if best_row is not None and best_sim >= 0.5:
+            log.append(f"  🔍 CONTAINS: '{desa_trans}' → {best_row['NAMOBJ']} ({best_row['KDEPUM']}) [{best_row['WADMKK']}, {best_row['WADMKC']}] (sim={best_sim:.2f})")
+            return 'fuzzy_match', {
+                'provinsi': provinsi,
+                'desa_trans': desa_trans,
+                'desa_shp': best_row['NAMOBJ'],
+                'kdepum': best_row['KDEPUM'],
+                'kabupaten': best_row['WADMKK'],
+                'kecamatan': best_row['WADMKC'],
+                'similarity': best_sim
+            }, {
+                'kdepum': best_row['KDEPUM'],
+                'nama_desa': best_row['NAMOBJ'],
+                'provinsi': provinsi,
+                'kabupaten': str(best_row.get('WADMKK', '')),
+                'kecamatan': str(best_row.get('WADMKC', '')),
+                'match_type': 'contains',
+                'similarity': best_sim
+            }
+
+    # Step 3: Fuzzy match (similarity >= 0.7)
+    # Ambil top-k kandidat dari trigram index, rescore dengan edit distance
+    candidates = prov_index.search(desa_norm, k=CANDIDATES_K)
+    best_sim = 0
+    best_row = None
+    if candidates:
+        best_sim, best_pos = candidates[0]
+        best_row = gdf_prov.iloc[best_pos]
+
+    if best_sim >= 0.7 and best_row is not None:
+        log.append(f"  🔶 FUZZY:  '{desa_trans}' → {best_row['NAMOBJ']} ({best_row['KDEPUM']}) [{best_row['WADMKK']}, {best_row['WADMKC']}] (sim={best_sim:.2f})")
+        return 'fuzzy_match', {
+            'provinsi': provinsi,
+            'desa_trans': desa_trans,
+            'desa_shp': best_row['NAMOBJ'],
+            'kdepum': best_row['KDEPUM'],
+            'kabupaten': best_row['WADMKK'],
+            'kecamatan': best_row['WADMKC'],
+            'similarity': best_sim
+        }, {
+            'kdepum': best_row['KDEPUM'],
+            'nama_desa': best_row['NAMOBJ'],
+            'provinsi': provinsi,
+            'kabupaten': str(best_row.get('WADMKK', '')),
+            'kecamatan': str(best_row.get('WADMKC', '')),
+            'match_type': 'fuzzy',
+            'similarity': best_sim
+        }
+
+    # Tampilkan top 3 candidate terdekat (dari kandidat yang sama)
+    top3 = [
+        (sim, str(gdf_prov.iloc[pos]['NAMOBJ']), str(gdf_prov.iloc[pos]['KDEPUM']))
+        for sim, pos in candidates[:3]
+    ]
+
+    log.append(f"  ❌ NO MATCH: '{desa_trans}' (norm: '{desa_norm}')")
+    for sim, name, code in top3:
+        log.append(f"       candidate: {name} ({code}) sim={sim:.2f}")
+
+    return 'no_match', {
+        'provinsi': provinsi,
+        'desa_trans': desa_trans,
+        'desa_norm': desa_norm,
+        'top_candidates': [(name, code, f"{sim:.2f}") for sim, name, code in top3]
+    }, None
+
+
+def match_shard(shard):
+    """
+    Worker: cocokkan desa-desa satu provinsi
+
+    Hanya artifact tabel (village_table.py) partisi provinsi tersebut yang
+    dimuat; normalisasi nama tidak diulang selama store sama.
+
+    Args:
+        shard: (provinsi, desa_list, partitions, store_dir)
+
+    Returns:
+        List (log lines, (kategori, entry report, entry matched_codes)) per desa
+    """
+    provinsi, desa_list, partitions, store_dir = shard
+    table = load_village_table(partitions, store_dir)
+    prov_keys = tuple(sorted(table.provinces))
+    prov_rows = table.province_rows(prov_keys)
+
+    # Trigram index atas SEMUA desa di provinsi (tanpa sampling)
+    prov_index = table.trigram_index(prov_keys, prov_rows)
+
+    decisions = []
+    for desa_trans in desa_list:
+        log = []
+        outcome = match_village(table, prov_keys, prov_rows, prov_index, provinsi, desa_trans, log)
+        decisions.append((log, outcome))
+    return decisions
+
+
+def load_village_list(path):
+    """Daftar desa transmigrasi per provinsi dari JSON ({provinsi: [desa]}) atau CSV (provinsi,desa)"""
+    if path.lower().endswith('.csv'):
+        df = pd.read_csv(path, dtype=str).dropna(subset=['provinsi', 'desa'])
+        villages = OrderedDict()
+        for provinsi, desa in zip(df['provinsi'].str.strip(), df['desa'].str.strip()):
+            villages.setdefault(provinsi, []).append(desa)
+        return villages
+    with open(path, 'r', encoding='utf-8') as f:
+        return OrderedDict(json.load(f))
+
+
+def shapefile_version(manifest):
+    """Versi shapefile untuk key cache: hash dari signature sumber di manifest store"""
+    payload = json.dumps([manifest.get('source'), manifest.get('source_signature')], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def decision_key(provinsi, desa_trans, version):
+    """Key cache keputusan: (provinsi, nama desa seperti yang dilihat matcher, versi shapefile)"""
+    return json.dumps([provinsi, desa_trans.upper().strip(), version], ensure_ascii=False)
+
+
+class MatchCache:
+    """Cache keputusan match di disk (JSON), hanya menyimpan entry versi shapefile saat ini"""
+
+    def __init__(self, path=MATCH_CACHE_PATH, version=None, load=True):
+        self.path = path
+        self.version = version
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        if load and path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('matcher_version') == MATCHER_VERSION:
+                self.entries = {k: v for k, v in cached.get('entries', {}).items()
+                                if json.loads(k)[2] == version}
+
+    def get(self, provinsi, desa_trans):
+        decision = self.entries.get(decision_key(provinsi, desa_trans, self.version))
+        if decision is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        log, (category, entry, matched) = decision
+        # Nama di entry mengikuti penulisan di daftar input saat ini
+        entry = dict(entry, desa_trans=desa_trans)
+        return log, (category, entry, matched)
+
+    def put(self, provinsi, desa_trans, decision):
+        log, (category, entry, matched) = decision
+        self.entries[decision_key(provinsi, desa_trans, self.version)] = [log, [category, entry, matched]]
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'matcher_version': MATCHER_VERSION, 'entries': self.entries},
+                      f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.path)
+
+
+def run_matching(desa_transmigrasi, manifest, store_dir=STORE_DIR, workers=None, cache=None):
+    """
+    Cocokkan semua desa; hanya desa yang belum ada di cache dikirim ke worker
+
+    Provinsi dijalankan di process pool (satu shard per provinsi), hasil
+    digabung sesuai urutan input sehingga output selalu deterministik.
+
+    Returns:
+        (results report, matched_codes)
+    """
+    plan = []
+    shards = []
+    for provinsi, desa_list in desa_transmigrasi.items():
+        partitions = resolve_partitions(manifest, provinsi)
+        cached = {}
+        if cache is not None and partitions:
+            for desa in desa_list:
+                decision = cache.get(provinsi, desa)
+                if decision is not None:
+                    cached[desa] = decision
+        pending = [d for d in dict.fromkeys(desa_list) if d not in cached]
+        if partitions and pending:
+            shards.append((provinsi, pending, partitions, store_dir))
+        plan.append((provinsi, desa_list, partitions, cached))
+
+    fresh = {}
+    if shards:
+        if workers == 1 or len(shards) == 1:
+            shard_results = map(match_shard, shards)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(shards)))
+            # Provinsi terbesar dikirim duluan agar beban worker rata
+            sizes = [sum(manifest['partitions'][p]['rows'] for p in s[2]) for s in shards]
+            order = sorted(range(len(shards)), key=lambda i: -sizes[i])
+            futures = {i: pool.submit(match_shard, shards[i]) for i in order}
+            shard_results = (futures[i].result() for i in range(len(shards)))
+        try:
+            for (provinsi, pending, _, _), decisions in zip(shards, shard_results):
+                for desa, decision in zip(pending, decisions):
+                    fresh[(provinsi, desa)] = decision
+                    if cache is not None:
+                        cache.put(provinsi, desa, decision)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    results = {
+        'exact_match': [],
+        'fuzzy_match': [],
+        'no_match': []
+    }
+    matched_codes = []  # Untuk output JSON
+
+    for provinsi, desa_list, partitions, cached in plan:
+        print(f"\n{'─'*60}")
+        print(f"📍 {provinsi} ({len(desa_list)} desa)")
+        print(f"{'─'*60}")
+
+        if not partitions:
+            print(f"  ⚠ Provinsi '{provinsi}' TIDAK DITEMUKAN di shapefile!")
+            for desa in desa_list:
+                results['no_match'].append({
+                    'provinsi': provinsi,
+                    'desa_trans': desa,
+                    'reason': 'Provinsi tidak ditemukan'
+                })
+            continue
+
+        total = sum(manifest['partitions'][p]['rows'] for p in partitions)
+        print(f"  Total desa di shapefile untuk {provinsi}: {total:,}")
+
+        for desa in desa_list:
+            log, (category, entry, matched) = cached.get(desa) or fresh[(provinsi, desa)]
+            print("\n".join(log))
+            results[category].append(entry)
+            if matched is not None:
+                matched_codes.append(matched)
+
+    return results, matched_codes
+
+
+def write_outputs(results, matched_codes, total_provinces, output_dir=OUTPUT_DIR):
+    """Tulis matched codes, report, no-match list dan kawasan-transmigrasi.json"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Simpan matched codes ke JSON (untuk generate GeoJSON)
+    output_matched = os.path.join(output_dir, "transmigrasi-matched.json")
+    with open(output_matched, 'w', encoding='utf-8') as f:
+        json.dump(matched_codes, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ Matched codes saved: {output_matched} ({len(matched_codes)} desa)")
+
+    # Simpan full report
+    output_report = os.path.join(output_dir, "transmigrasi-matching-report.json")
+    with open(output_report, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2, default=str)
+    print(f"✅ Full report saved: {output_report}")
+
+    # Simpan no-match list untuk review manual
+    output_nomatch = os.path.join(output_dir, "transmigrasi-no-match.json")
+    with open(output_nomatch, 'w', encoding='utf-8') as f:
+        json.dump(results['no_match'], f, ensure_ascii=False, indent=2, default=str)
+    print(f"✅ No-match list saved: {output_nomatch} ({len(results['no_match'])} desa perlu review)")
+
+    # Update kawasan-transmigrasi.json
+    kawasan_output = os.path.join(output_dir, "kawasan-transmigrasi.json")
+    kawasan_data = {
+        "metadata": {
+            "source": "SIBARDUKTRANS Kementerian Transmigrasi RI + Shapefile BIG 2023",
+            "total_matched": len(matched_codes),
+            "total_provinces": total_provinces,
+            "match_stats": {
+                "exact": len(results['exact_match']),
+                "fuzzy": len(results['fuzzy_match']),
+                "unmatched": len(results['no_match'])
+            },
+            "generated": pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+        },
+        "desa_transmigrasi": matched_codes
+    }
+
+    with open(kawasan_output, 'w', encoding='utf-8') as f:
+        json.dump(kawasan_data, f, ensure_ascii=False, indent=2)
+    print(f"✅ Kawasan transmigrasi updated: {kawasan_output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cocokkan desa transmigrasi dengan shapefile BIG")
+    parser.add_argument("--villages", default=VILLAGES_PATH, help="Daftar desa (JSON atau CSV)")
+    parser.add_argument("--shapefile", default=SHAPEFILE_PATH)
+    parser.add_argument("--store", default=STORE_DIR, help="Direktori GeoParquet store")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--cache", default=MATCH_CACHE_PATH, help="File cache keputusan match")
+    parser.add_argument("--rebuild-cache", action="store_true", help="Abaikan cache, cocokkan ulang semua desa")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah core, 1 = serial)")
+    args = parser.parse_args(argv)
+
+    print("="*80)
+    print("MENCOCOKKAN DESA TRANSMIGRASI DENGAN SHAPEFILE BIG")
+    print("="*80)
+
+    # ============================================================
+    # 1. Load Shapefile (GeoParquet store per provinsi)
+    # ============================================================
+    print("\n[1] Loading village store...")
+    print("    (build pertama membaca shapefile ±1.1 GB, run berikutnya pakai cache)")
+    try:
+        manifest = ensure_store(args.shapefile, args.store)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print(f"    Total desa di shapefile: {manifest['rows']:,}")
+    print(f"    Total partisi provinsi: {len(manifest['partitions'])}")
+
+    # ============================================================
+    # 2. Daftar Desa Transmigrasi per Provinsi
+    # ============================================================
+    print("\n[2] Menyiapkan daftar desa transmigrasi...")
+    desa_transmigrasi = load_village_list(args.villages)
+    total_desa = sum(len(v) for v in desa_transmigrasi.values())
+    print(f"    Sumber: {args.villages}")
+    print(f"    Total desa transmigrasi (unik): {total_desa}")
+    print(f"    Total provinsi: {len(desa_transmigrasi)}")
+
+    # ============================================================
+    # 3. Matching desa transmigrasi dengan shapefile
+    # ============================================================
+    print("\n[3] Mencocokkan desa transmigrasi dengan shapefile...")
+    print("="*80)
+    cache = MatchCache(args.cache, shapefile_version(manifest), load=not args.rebuild_cache)
+    results, matched_codes = run_matching(desa_transmigrasi, manifest, args.store, args.workers, cache)
+    cache.save()
+
+    # ============================================================
+    # 4. RINGKASAN
+    # ============================================================
+    print("\n" + "="*80)
+    print("RINGKASAN MATCHING")
+    print("="*80)
+    print(f"  ✅ Exact match:   {len(results['exact_match']):3d} desa")
+    print(f"  🔍 Fuzzy match:   {len(results['fuzzy_match']):3d} desa")
+    print(f"  ❌ No match:      {len(results['no_match']):3d} desa")
+    print(f"  {'─'*40}")
+    print(f"  📊 Total matched: {len(results['exact_match']) + len(results['fuzzy_match'])} / {total_desa} ({(len(results['exact_match']) + len(results['fuzzy_match'])) / total_desa * 100:.1f}%)")
+    print(f"  ♻️  Dari cache: {cache.hits} desa, dicocokkan ulang: {cache.misses} desa")
+
+    # ============================================================
+    # 5. Simpan hasil
+    # ============================================================
+    write_outputs(results, matched_codes, len(desa_transmigrasi), args.output_dir)
+
+    print("\n" + "="*80)
+    print("SELESAI! Jalankan generate-transmigrasi-geojson.py untuk buat GeoJSON layer")
+    print("="*80)
+
+
+if __name__ == '__main__':
+    main()
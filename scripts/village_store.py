@@ -0,0 +1,261 @@
+"""
+GeoParquet cache untuk shapefile desa BIG
+=========================================
+
+Shapefile Batas_Wilayah_KelurahanDesa_10K_AR.shp (~1.1 GB) dikonversi
+sekali menjadi GeoParquet yang dipartisi per provinsi:
+
+    data/cache/desa-geoparquet/
+        manifest.json
+        province=ACEH.parquet
+        province=ACEH.table.pkl      # artifact village_table.py (opsional)
+        province=JAWA_BARAT.parquet
+        ...
+
+Atribut dan geometri (WKB) berada di kolom terpisah, jadi script bisa
+membaca kolom atribut saja lewat Arrow tanpa menyentuh geometri, dan
+hanya partisi provinsi yang dibutuhkan. Store dibangun ulang otomatis
+jika .shp/.dbf sumber berubah (ukuran atau mtime). Kolom SOURCE_FID
+menyimpan nomor baris asli, sehingga loader mengembalikan baris dalam
+urutan shapefile (index = FID). Partisi ditulis dengan row group kecil
+(ROW_GROUP_SIZE) agar load_rows() hanya mendekode row group yang berisi
+FID yang diminta. Shapefile dibaca per chunk (chunked_pipeline.py), tidak
+pernah dimuat utuh ke memori.
+
+Dipakai oleh match-transmigrasi-desa.py (via village_table.py) dan
+generate-transmigrasi-geojson.py.
+
+Usage:
+    python scripts/village_store.py           # build/refresh store
+    python scripts/village_store.py --force   # build ulang paksa
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+SHAPEFILE_PATH = os.path.join(ROOT_DIR, "data", "batas desa", "Batas_Wilayah_KelurahanDesa_10K_AR.shp")
+STORE_DIR = os.path.join(ROOT_DIR, "data", "cache", "desa-geoparquet")
+
+# Naikkan jika layout store berubah
+STORE_VERSION = 2
+
+FID_COLUMN = 'SOURCE_FID'
+
+# Baris per row group Parquet (granularitas pruning untuk load_rows)
+ROW_GROUP_SIZE = 1024
+
+# Awal file pointer Git LFS (shapefile belum di-pull)
+LFS_POINTER_PREFIX = b"version https://git-lfs"
+
+
+def source_signature(shp_path):
+    """Ukuran + mtime .shp dan .dbf; berubah jika shapefile diganti"""
+    signature = []
+    for ext in ('.shp', '.dbf'):
+        path = os.path.splitext(shp_path)[0] + ext
+        if os.path.exists(path):
+            st = os.stat(path)
+            signature.append([ext, st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def shapefile_available(shp_path=SHAPEFILE_PATH):
+    """True jika .shp ada dan bukan pointer Git LFS"""
+    if not os.path.isfile(shp_path):
+        return False
+    with open(shp_path, 'rb') as f:
+        return not f.read(len(LFS_POINTER_PREFIX)).startswith(LFS_POINTER_PREFIX)
+
+
+def _partition_name(province):
+    slug = re.sub(r'[^A-Z0-9]+', '_', str(province).upper()).strip('_') or 'UNKNOWN'
+    return f"province={slug}.parquet"
+
+
+def read_manifest(store_dir=STORE_DIR):
+    path = os.path.join(store_dir, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_store(shp_path=SHAPEFILE_PATH, store_dir=STORE_DIR, chunk_size=None):
+    """
+    Konversi shapefile ke GeoParquet per provinsi (ditulis ke dir sementara lalu di-rename)
+
+    Shapefile dibaca per chunk offset feature (chunked_pipeline.py) dan
+    setiap chunk langsung di-append ke writer partisi provinsinya, jadi
+    memori sebanding dengan chunk_size, bukan ukuran shapefile.
+    """
+    from chunked_pipeline import DEFAULT_CHUNK_SIZE, ParquetChunkWriter, plan_shapefile_chunks, read_chunk
+
+    print(f"Building GeoParquet store dari {shp_path}")
+    print("(File besar ~1.1GB, hanya dilakukan sekali...)")
+    start = time.time()
+
+    tmp_dir = store_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    chunks = plan_shapefile_chunks(shp_path, chunk_size or DEFAULT_CHUNK_SIZE)
+    writers, columns, crs, rows = {}, None, None, 0
+    try:
+        for chunk in chunks:
+            gdf = read_chunk(chunk)
+            if columns is None:
+                columns = [c for c in gdf.columns if c != 'geometry']
+                crs = gdf.crs
+            gdf[FID_COLUMN] = np.arange(chunk["start"], chunk["start"] + len(gdf))
+            for province, part in gdf.groupby(gdf['WADMPR'].fillna('UNKNOWN'), sort=False):
+                province = str(province)
+                if province not in writers:
+                    writers[province] = ParquetChunkWriter(os.path.join(tmp_dir, _partition_name(province)),
+                                                           row_group_size=ROW_GROUP_SIZE)
+                writers[province].write(part)
+            rows += len(gdf)
+            print(f"  {rows:,} desa ({time.time() - start:.1f}s)")
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    partitions = {province: {"file": os.path.basename(writers[province].path), "rows": writers[province].rows}
+                  for province in sorted(writers)}
+    manifest = {
+        "version": STORE_VERSION,
+        "source": os.path.basename(shp_path),
+        "source_signature": source_signature(shp_path),
+        "crs": crs.to_string() if crs else None,
+        "columns": columns or [],
+        "rows": rows,
+        "partitions": partitions,
+        "built_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+    print(f"Store ditulis: {store_dir} ({len(partitions)} provinsi, {time.time() - start:.1f}s)")
+    return manifest
+
+
+def ensure_store(shp_path=SHAPEFILE_PATH, store_dir=STORE_DIR, force=False):
+    """Return manifest store yang valid, build ulang jika shapefile berubah"""
+    manifest = read_manifest(store_dir)
+    if manifest and not force:
+        if not shapefile_available(shp_path):
+            # Shapefile tidak ada (mis. LFS belum di-pull): pakai store yang ada
+            return manifest
+        if (manifest.get("version") == STORE_VERSION
+                and manifest.get("source_signature") == source_signature(shp_path)):
+            return manifest
+        print("Store GeoParquet kedaluwarsa (shapefile berubah), build ulang...")
+    if not shapefile_available(shp_path):
+        raise FileNotFoundError(f"Shapefile tidak ditemukan (atau masih pointer Git LFS): {shp_path}")
+    return build_store(shp_path, store_dir)
+
+
+def match_provinces(manifest, names):
+    """Partisi yang nama provinsinya mengandung salah satu `names` (case-insensitive)"""
+    needles = [n.upper() for n in names]
+    return [p for p in manifest["partitions"] if any(n in p.upper() for n in needles)]
+
+
+def _partition_paths(manifest, store_dir, provinces):
+    selected = manifest["partitions"] if provinces is None else provinces
+    return [os.path.join(store_dir, manifest["partitions"][p]["file"])
+            for p in selected if p in manifest["partitions"]]
+
+
+def _source_order(frame):
+    """Urutkan baris sesuai shapefile, index = FID asli"""
+    frame = frame.set_index(FID_COLUMN).sort_index()
+    frame.index.name = None
+    return frame
+
+
+def load_attributes(columns=None, provinces=None, store_dir=STORE_DIR, manifest=None):
+    """
+    Baca kolom atribut saja (tanpa geometri) sebagai DataFrame pandas
+
+    Args:
+        columns: Kolom atribut (default: semua kecuali geometry)
+        provinces: Nama provinsi (WADMPR) yang dibaca, default semua partisi
+    """
+    manifest = manifest or read_manifest(store_dir)
+    columns = list(columns or manifest["columns"])
+    tables = [pq.read_table(path, columns=columns + [FID_COLUMN])
+              for path in _partition_paths(manifest, store_dir, provinces)]
+    if not tables:
+        return pd.DataFrame(columns=columns)
+    return _source_order(pa.concat_tables(tables).to_pandas())
+
+
+def load_geodataframe(columns=None, provinces=None, store_dir=STORE_DIR, manifest=None):
+    """Baca atribut + geometri untuk partisi/kolom yang diminta sebagai GeoDataFrame"""
+    import geopandas as gpd
+
+    manifest = manifest or read_manifest(store_dir)
+    columns = list(columns or manifest["columns"])
+    frames = [gpd.read_parquet(path, columns=columns + [FID_COLUMN, 'geometry'])
+              for path in _partition_paths(manifest, store_dir, provinces)]
+    if not frames:
+        return gpd.GeoDataFrame(columns=columns + ['geometry'], geometry='geometry',
+                                crs=manifest.get("crs"))
+    frame = _source_order(pd.concat(frames, ignore_index=True))
+    return gpd.GeoDataFrame(frame, geometry='geometry', crs=frames[0].crs)
+
+
+def load_rows(fids, columns=None, provinces=None, store_dir=STORE_DIR, manifest=None):
+    """
+    Baca atribut + geometri hanya untuk baris dengan SOURCE_FID di `fids`
+
+    Filter FID di-push ke reader Parquet: row group yang statistik FID-nya
+    tidak beririsan dilewati, dan hanya baris terpilih yang didekode
+    menjadi geometri. Memori sebanding dengan jumlah baris terpilih.
+    """
+    import geopandas as gpd
+
+    manifest = manifest or read_manifest(store_dir)
+    columns = list(columns or manifest["columns"])
+    fids = sorted(int(f) for f in fids)
+    if not fids:
+        return gpd.GeoDataFrame(columns=columns + ['geometry'], geometry='geometry',
+                                crs=manifest.get("crs"))
+    frames = [gpd.read_parquet(path, columns=columns + [FID_COLUMN, 'geometry'],
+                               filters=[(FID_COLUMN, 'in', fids)])
+              for path in _partition_paths(manifest, store_dir, provinces)]
+    frame = _source_order(pd.concat(frames, ignore_index=True))
+    return gpd.GeoDataFrame(frame, geometry='geometry', crs=frames[0].crs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build GeoParquet cache of the BIG village shapefile")
+    parser.add_argument("--shapefile", default=SHAPEFILE_PATH)
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        manifest = ensure_store(args.shapefile, args.store, force=args.force)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Store OK: {manifest['rows']:,} desa, {len(manifest['partitions'])} provinsi")
+
+
+if __name__ == '__main__':
+    main()
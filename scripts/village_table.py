@@ -0,0 +1,169 @@
+"""
+Tabel desa BIG yang sudah diproses untuk matching
+=================================================
+
+Tahap preprocessing untuk match-transmigrasi-desa.py:
+- nama desa dinormalisasi sekali secara vektor (kolom NAME_NORM),
+  NAMOBJ/WADMPR di-uppercase sekali (NAME_UPPER, PROV_UPPER)
+- baris dikelompokkan per provinsi (dict PROV_UPPER -> array posisi)
+- hash index (PROV_UPPER, NAME_UPPER) -> posisi untuk exact match
+
+Atribut dibaca dari GeoParquet store (village_store.py) tanpa geometri.
+Kolom hasil preprocessing disimpan per provinsi sebagai artifact pickle
+di samping partisinya (province=ACEH.table.pkl) dan dipakai ulang selama
+store tidak dibangun ulang; worker matching hanya memuat artifact
+provinsinya sendiri.
+
+Usage:
+    python scripts/village_table.py      # build/refresh artifact semua provinsi
+"""
+
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from village_index import NORMALIZE_PATTERNS, TrigramIndex
+from village_store import SHAPEFILE_PATH, STORE_DIR, ensure_store, load_attributes, read_manifest
+
+ATTRIBUTE_COLUMNS = ['KDEPUM', 'NAMOBJ', 'WADMPR', 'WADMKK', 'WADMKC']
+
+# Naikkan jika format artifact berubah
+ARTIFACT_VERSION = 2
+
+
+def prepare_frame(frame):
+    """Tambah kolom NAME_UPPER, NAME_NORM, PROV_UPPER (vektor, sekali per baris)"""
+    frame = frame.copy()
+    frame['NAME_UPPER'] = frame['NAMOBJ'].fillna('').astype(str).str.upper().str.strip()
+    frame['NAME_NORM'] = normalize_names(frame['NAMOBJ'])
+    frame['PROV_UPPER'] = frame['WADMPR'].fillna('').astype(str).str.upper()
+    return frame
+
+
+def normalize_names(names):
+    """Versi vektor dari village_index.normalize_name untuk satu kolom"""
+    result = names.fillna('').astype(str).str.upper().str.strip()
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        result = result.str.replace(pattern, replacement, regex=True)
+    return result.str.strip()
+
+
+class VillageTable:
+    """Atribut desa + index provinsi dan exact-match"""
+
+    def __init__(self, frame):
+        if 'NAME_NORM' not in frame.columns:
+            frame = prepare_frame(frame)
+        frame = frame.reset_index(drop=True)
+        self.frame = frame
+
+        # Grup baris per provinsi (posisi urut sesuai shapefile)
+        self.provinces = {
+            prov: np.asarray(positions, dtype=np.int64)
+            for prov, positions in frame.groupby('PROV_UPPER', sort=False).indices.items()
+        }
+
+        # Exact match: posisi pertama untuk setiap (provinsi, nama)
+        keys = list(zip(frame['PROV_UPPER'], frame['NAME_UPPER']))
+        self.exact = {}
+        for position, key in enumerate(keys):
+            self.exact.setdefault(key, position)
+
+        self._indexes = {}
+
+    def province_keys(self, needle):
+        """Nama provinsi shapefile yang mengandung `needle` (seperti str.contains)"""
+        needle = needle.upper()
+        return tuple(sorted(p for p in self.provinces if needle in p))
+
+    def province_rows(self, keys):
+        """Posisi baris untuk gabungan beberapa provinsi, urut sesuai shapefile"""
+        if not keys:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.provinces[k] for k in keys]))
+
+    def exact_lookup(self, keys, name):
+        """Posisi pertama desa bernama `name` di provinsi `keys`, atau None"""
+        name = name.upper().strip()
+        hits = [self.exact[(k, name)] for k in keys if (k, name) in self.exact]
+        return min(hits) if hits else None
+
+    def trigram_index(self, keys, positions):
+        """TrigramIndex atas NAME_NORM baris `positions` (di-cache per set provinsi)"""
+        if keys not in self._indexes:
+            self._indexes[keys] = TrigramIndex(self.frame['NAME_NORM'].to_numpy()[positions])
+        return self._indexes[keys]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_indexes'] = {}
+        return state
+
+
+def _artifact_path(manifest, store_dir, province):
+    """Artifact tabel di samping partisi: province=X.parquet -> province=X.table.pkl"""
+    partition = manifest["partitions"][province]["file"]
+    return os.path.join(store_dir, os.path.splitext(partition)[0] + ".table.pkl")
+
+
+def _artifact_key(manifest):
+    """Artifact valid selama store yang sama (sumber + waktu build)"""
+    return [ARTIFACT_VERSION, manifest.get("source_signature"), manifest.get("built_at")]
+
+
+def load_partition_frame(province, store_dir=STORE_DIR, manifest=None):
+    """Frame atribut yang sudah diproses untuk satu partisi, dari artifact atau dibangun lalu disimpan"""
+    manifest = manifest or read_manifest(store_dir)
+    path = _artifact_path(manifest, store_dir, province)
+    key = _artifact_key(manifest)
+
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('key') == key:
+            return cached['frame']
+
+    frame = prepare_frame(load_attributes(ATTRIBUTE_COLUMNS, provinces=[province],
+                                          store_dir=store_dir, manifest=manifest))
+    # Nama tmp per proses: worker paralel bisa membangun partisi yang sama
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'key': key, 'frame': frame}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return frame
+
+
+def load_village_table(provinces=None, store_dir=STORE_DIR, manifest=None):
+    """
+    VillageTable untuk partisi `provinces` (default semua) dari artifact per provinsi
+
+    Artifact yang belum ada atau kedaluwarsa dibangun ulang dan disimpan.
+    Baris tetap dalam urutan shapefile.
+    """
+    manifest = manifest or read_manifest(store_dir)
+    selected = [p for p in (manifest["partitions"] if provinces is None else provinces)
+                if p in manifest["partitions"]]
+    frames = [load_partition_frame(p, store_dir, manifest) for p in selected]
+    if not frames:
+        return VillageTable(pd.DataFrame(columns=ATTRIBUTE_COLUMNS))
+    return VillageTable(pd.concat(frames).sort_index())
+
+
+def main():
+    start = time.time()
+    manifest = ensure_store(SHAPEFILE_PATH, STORE_DIR)
+    table = load_village_table(store_dir=STORE_DIR, manifest=manifest)
+    print(f"    Village table: {len(table.frame):,} desa, "
+          f"{len(table.provinces)} provinsi ({time.time() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)